@@ -0,0 +1,69 @@
+"""
+Measure the throughput of a reproducible DataLoader (`saatgut.torch.dataloader_kwargs`) with 0 and with N workers,
+against a plain DataLoader, on a dataset with random image augmentations. Also checks that all reproducible loaders
+return the same batches.
+Run with:
+    python -m benchmarks.dataloader_benchmark [--samples 2048] [--workers 4] [--size 128]
+"""
+import argparse
+import os
+import time
+
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from saatgut.torch import dataloader_kwargs
+
+
+class AugmentedImages(Dataset):
+    """ Random crops, flips and noise of synthetic images. """
+    def __init__(self, samples: int, size: int):
+        self.samples = samples
+        self.size = size
+
+    def __len__(self):
+        return self.samples
+
+    def __getitem__(self, index):
+        image = torch.full((3, self.size + 16, self.size + 16), float(index))
+        top, left = torch.randint(0, 17, (2,)).tolist()
+        image = image[:, top:top + self.size, left:left + self.size]
+        if torch.rand(1).item() < 0.5:
+            image = image.flip(-1)
+        return image + 0.1 * torch.randn_like(image)
+
+
+def _measure(loader: DataLoader) -> tuple:
+    start = time.perf_counter()
+    batches = [batch.sum(dim=(1, 2, 3)) for batch in loader]
+    return time.perf_counter() - start, torch.cat(batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=2048)
+    parser.add_argument("--workers", type=int, default=max(2, min(os.cpu_count() or 1, 8)))
+    parser.add_argument("--size", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    dataset = AugmentedImages(args.samples, args.size)
+    print(f"{args.samples} samples of 3x{args.size}x{args.size}, {os.cpu_count()} CPUs")
+    reference = None
+    for name, reproducible, workers in [("plain", False, 0), ("plain", False, args.workers),
+                                        ("saatgut", True, 0), ("saatgut", True, args.workers)]:
+        if reproducible:
+            kwargs = dataloader_kwargs(dataset, seed=42)
+        else:
+            kwargs = {"dataset": dataset, "shuffle": True}
+        loader = DataLoader(**kwargs, batch_size=args.batch_size, num_workers=workers)
+        seconds, sums = _measure(loader)
+        same = ""
+        if reproducible:
+            reference = sums if reference is None else reference
+            same = "same batches" if torch.equal(reference, sums) else "DIFFERENT batches"
+        print(f"{name:>8} {workers:2d} workers: {args.samples / seconds:9.0f} samples/s  {same}")
+
+
+if __name__ == "__main__":
+    main()
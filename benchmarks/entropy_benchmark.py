@@ -0,0 +1,45 @@
+"""
+Measure the throughput of the deterministic replacement for `os.urandom`, against the byte-by-byte replacement that
+`domesticate_random(derandomize_cryptography=True)` used before, and against the real `os.urandom`.
+Run with:
+    python -m benchmarks.entropy_benchmark [--megabytes 4]
+"""
+import argparse
+import os
+import random
+import time
+
+import saatgut
+
+
+class _ByteByByteRandom(random.Random):
+    def randbytes(self, n):
+        return bytes([self.randint(0, 255) for _ in range(n)])
+
+
+def _throughput(function, request_size, total_bytes):
+    requests = max(1, total_bytes // request_size)
+    start = time.perf_counter()
+    for _ in range(requests):
+        function(request_size)
+    return requests * request_size / (time.perf_counter() - start) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=4)
+    args = parser.parse_args()
+    total_bytes = int(args.megabytes * 1e6)
+
+    for name, function, scale in [
+        ("os.urandom", os.urandom, 1),
+        ("byte-by-byte", _ByteByByteRandom(42).randbytes, 0.01),
+        ("DeterministicEntropy", saatgut.DeterministicEntropy(42).randbytes, 1),
+    ]:
+        for request_size in (16, 4096):
+            throughput = _throughput(function, request_size, int(total_bytes * scale))
+            print(f"{name:>20}, {request_size:>5} B requests: {throughput:10.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
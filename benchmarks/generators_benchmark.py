@@ -0,0 +1,39 @@
+"""
+Compare the throughput of bulk draws from the legacy global NumPy state (Mersenne Twister) with the generators of
+`saatgut.numpy_generators` and each modern bit generator.
+Run with:
+    python -m benchmarks.generators_benchmark [--size 1000000] [--repeats 20]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+import saatgut
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    saatgut.seed_numpy(42)
+    registry = saatgut.numpy_generators()
+    candidates = [("legacy np.random", np.random)] + [
+        (bit_generator, registry.get(f"benchmark-{bit_generator}", bit_generator=bit_generator))
+        for bit_generator in ("PCG64", "PCG64DXSM", "SFC64", "Philox", "MT19937")]
+
+    print(f"{'':>16} {'random [M/s]':>13} {'normal [M/s]':>13} {'integers [M/s]':>15}")
+    for name, rng in candidates:
+        integers = rng.randint if rng is np.random else rng.integers
+        rates = []
+        for draw in (lambda: rng.random(args.size), lambda: rng.standard_normal(args.size),
+                     lambda: integers(0, 1000, args.size)):
+            seconds = min(timeit.repeat(draw, number=1, repeat=args.repeats))
+            rates.append(args.size / seconds / 1e6)
+        print(f"{name:>16} {rates[0]:13.1f} {rates[1]:13.1f} {rates[2]:15.1f}")
+
+
+if __name__ == "__main__":
+    main()
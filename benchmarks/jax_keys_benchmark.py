@@ -0,0 +1,47 @@
+"""
+Compare the host-side cost of getting a fresh JAX key: splitting the key on every draw, taking the next key of a
+`saatgut.KeyManager` (split in batches, handed out from the host) and splitting all keys of a batch at once.
+Run with:
+    python -m benchmarks.jax_keys_benchmark [--draws 10000]
+"""
+import argparse
+import time
+
+import jax
+
+import saatgut
+
+
+def _split_per_draw(draws):
+    key = jax.random.PRNGKey(42)
+    for _ in range(draws):
+        key, subkey = jax.random.split(key)
+    subkey.block_until_ready()
+
+
+def _key_manager(draws):
+    keys = saatgut.KeyManager(42)
+    for _ in range(draws):
+        subkey = next(keys)
+
+
+def _split_at_once(draws):
+    saatgut.KeyManager(42).split(draws).block_until_ready()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--draws", type=int, default=10000)
+    args = parser.parse_args()
+
+    for name, function in [("split per draw", _split_per_draw), ("KeyManager", _key_manager),
+                           ("split at once", _split_at_once)]:
+        function(min(args.draws, 100))  # Compile
+        start = time.perf_counter()
+        function(args.draws)
+        seconds = time.perf_counter() - start
+        print(f"{name:>15}: {seconds / args.draws * 1e6:8.2f} µs per key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Measure the cost of repeated reseeding, e.g. once per epoch, request or test.
+Run with:
+    python -m benchmarks.reseed_benchmark [--number 10000]
+"""
+import argparse
+import timeit
+
+import saatgut
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=10000)
+    args = parser.parse_args()
+
+    saatgut.seed_everything(42)  # Warm up: imports all installed libraries once
+    print(f"backends: {saatgut.available_backends()}")
+    for name, statement in [
+        ("available_backends()", lambda: saatgut.available_backends()),
+        ("seed_everything(42)", lambda: saatgut.seed_everything(42)),
+        ("seed_everything(42, lazy=True)", lambda: saatgut.seed_everything(42, lazy=True)),
+    ]:
+        seconds = min(timeit.repeat(statement, number=args.number, repeat=5)) / args.number
+        print(f"{name:>32}: {seconds * 1e6:9.2f} µs per call")
+
+
+if __name__ == "__main__":
+    main()
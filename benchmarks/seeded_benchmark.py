@@ -0,0 +1,32 @@
+"""
+Measure the overhead of entering and leaving a `saatgut.seeded` block, per library.
+Run with:
+    python -m benchmarks.seeded_benchmark [--number 10000]
+"""
+import argparse
+import timeit
+
+import numpy  # noqa: F401, imported so that saatgut.seeded touches it
+import torch  # noqa: F401, imported so that saatgut.seeded touches it
+
+import saatgut
+
+
+def _enter_exit(context):
+    with context:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=10000)
+    args = parser.parse_args()
+
+    for backends in (["random"], ["numpy"], ["torch"], ["random", "torch"], None):
+        context = saatgut.seeded(42, backends=backends)
+        seconds = min(timeit.repeat(lambda: _enter_exit(context), number=args.number, repeat=5)) / args.number
+        print(f"{str(backends or 'all imported'):>20}: {seconds * 1e6:9.2f} µs per enter/exit")
+
+
+if __name__ == "__main__":
+    main()
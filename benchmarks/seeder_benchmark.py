@@ -0,0 +1,45 @@
+"""
+Measure the latency of reseeding `random`, NumPy and PyTorch with a `saatgut.Seeder`, against `seed_everything` and
+the individual seeding functions. The target is below 10 µs per reseed. Most of it is spent in `random.seed`, which
+initializes the Mersenne Twister of `random` from scratch.
+Run with:
+    python -m benchmarks.seeder_benchmark [--number 20000]
+"""
+import argparse
+import random
+import timeit
+
+import numpy  # noqa: F401, imported so that seed_everything seeds it eagerly
+import torch  # noqa: F401, imported so that seed_everything seeds it eagerly
+
+import saatgut
+
+
+def _seed_individually(seed):
+    saatgut.seed_random(seed)
+    saatgut.seed_numpy(seed)
+    saatgut.seed_torch(seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    seeder = saatgut.Seeder(["random", "numpy", "torch"])
+    seeder_without_random = saatgut.Seeder(["numpy", "torch"])
+    saatgut.seed_everything(42)  # Warm up
+    slow = max(1, args.number // 20)
+    for name, statement, number in [
+        ("seed_everything(42)", lambda: saatgut.seed_everything(42), slow),
+        ("seed_random/numpy/torch(42)", lambda: _seed_individually(42), slow),
+        ("Seeder(random, numpy, torch)", lambda: seeder(42), args.number),
+        ("Seeder(numpy, torch)", lambda: seeder_without_random(42), args.number),
+        ("random.seed(42) alone", lambda: random.seed(42), args.number),
+    ]:
+        seconds = min(timeit.repeat(statement, number=number, repeat=5)) / number
+        print(f"{name:>28}: {seconds * 1e6:9.2f} µs per call")
+
+
+if __name__ == "__main__":
+    main()
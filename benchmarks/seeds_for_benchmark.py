@@ -0,0 +1,43 @@
+"""
+Measure the throughput of `saatgut.seeds_for` against hashing keys one by one in Python.
+Run with:
+    python -m benchmarks.seeds_for_benchmark [--samples 10000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+
+import saatgut
+
+
+def _measure(function, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    indices = np.arange(args.samples)
+    keys = np.stack([np.full(args.samples, 3), indices], axis=1)
+    python_samples = min(args.samples, 1_000_000)
+
+    for name, samples, function in [
+        ("hash((seed, epoch, idx))", python_samples, lambda: [hash((42, 3, i)) for i in range(python_samples)]),
+        ("seeds_for numpy", args.samples, lambda: saatgut.seeds_for(42, keys)),
+        ("seeds_for torch", args.samples, lambda: saatgut.seeds_for(42, torch.from_numpy(keys))),
+    ]:
+        seconds = _measure(function)
+        print(f"{name:>25}: {samples / seconds / 1e6:8.1f} M seeds/s")
+
+
+if __name__ == "__main__":
+    main()
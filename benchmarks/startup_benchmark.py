@@ -0,0 +1,45 @@
+"""
+Compare the cold-start time and peak memory (RSS) of eager seeding (sequential and parallel) and lazy seeding.
+
+Each measurement runs in a fresh interpreter that imports NumPy (a "plain NumPy service") and then calls
+`saatgut.seed_everything`. Run with:
+    python -m benchmarks.startup_benchmark [--repeats 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+_CHILD = """
+import resource, time
+start = time.perf_counter()
+import numpy
+import saatgut
+saatgut.seed_everything(42, lazy={lazy}, parallel={parallel})
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure(lazy: bool, parallel: bool, repeats: int):
+    times, rss = [], []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", _CHILD.format(lazy=lazy, parallel=parallel)],
+                             check=True, capture_output=True, text=True).stdout.split()
+        times.append(float(out[-2]))
+        rss.append(int(out[-1]))
+    return statistics.median(times), statistics.median(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, lazy, parallel in (("eager", False, False), ("parallel", False, True), ("lazy", True, True)):
+        seconds, rss_kb = measure(lazy, parallel, args.repeats)
+        print(f"{name:>8}: {seconds * 1000:9.1f} ms   {rss_kb / 1024:8.1f} MB peak RSS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compare concurrent draws from per-request streams with draws from the global NumPy state behind a lock, which is the
+only way to keep the global state reproducible with concurrent requests.
+Run with:
+    python -m benchmarks.streams_benchmark [--threads 8] [--requests 2000]
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import saatgut
+
+_LOCK = threading.Lock()
+
+
+def _locked_global(request_id):
+    with _LOCK:
+        np.random.seed(request_id)
+        return np.random.normal(size=256).sum()
+
+
+def _make_stream_handler(streams):
+    def handle(request_id):
+        with streams.stream(request_id):
+            return streams.numpy.normal(size=256).sum()
+    return handle
+
+
+def _measure(handler, threads, requests):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        list(executor.map(handler, range(requests)))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, handler in [("locked global RNG", _locked_global),
+                          ("saatgut streams", _make_stream_handler(saatgut.StreamManager(42)))]:
+        seconds = min(_measure(handler, args.threads, args.requests) for _ in range(3))
+        print(f"{name:>18}: {args.requests / seconds:10.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
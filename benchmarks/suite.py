@@ -0,0 +1,224 @@
+"""
+Run all benchmarks of what saatgut costs, and append the results to a history file (one JSON object per run), so that
+regressions show up before a release. Covers the cold `import saatgut`, `seed_everything` and `domesticate_everything`
+(cold, warm and in hard mode), the throughput of `DeterministicEntropy`, and NumPy, PyTorch and TensorFlow workloads
+with each domestication setting. Everything runs on the CPU.
+
+Cold measurements and workloads run in fresh interpreters, since domestication changes global settings that can't be
+undone. Benchmarks of libraries that are not installed are skipped. Run with:
+    python -m benchmarks.suite [--repeats 5] [--filter torch] [--history benchmarks/history.jsonl] [--check]
+
+With `--check`, the exit code is 1 if a benchmark got slower than `--threshold` compared to the previous run on the
+same machine. Such a run isn't appended to the history, so that it doesn't become the baseline of the next check.
+The history is machine-specific and ignored by git.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs `statement` once, after `setup`, and prints the seconds it took
+_COLD_CHILD = """
+import time
+{setup}
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+# Runs `statement` `number` times per repeat, after `setup`, and prints the best seconds per run
+_WARM_CHILD = """
+import timeit
+{setup}
+{statement_function}
+for _ in range({warmup}):
+    statement()
+print(min(timeit.repeat(statement, number={number}, repeat={repeats})) / {number})
+"""
+
+# The settings that each workload runs with, applied before the workload is set up
+__SETTINGS__ = {
+    "numpy": {
+        "baseline": "",
+        "seed": "saatgut.seed_numpy(42)",
+        "domesticate": "saatgut.domesticate_numpy(42)",
+        "disable_parallelism": "saatgut.domesticate_numpy(42, disable_parallelism=True)",
+    },
+    "torch": {
+        "baseline": "",
+        "seed": "saatgut.seed_torch(42)",
+        "domesticate": "saatgut.domesticate_torch(42)",
+        "force_matmul_precision": "saatgut.domesticate_torch(42, force_matmul_precision=True)",
+    },
+    "tensorflow": {
+        "baseline": "",
+        "seed": "saatgut.seed_tensorflow(42)",
+        "domesticate": "saatgut.domesticate_tensorflow(42)",
+        "disable_parallelism": "saatgut.domesticate_tensorflow(42, disable_parallelism=True)",
+    },
+}
+
+# Workloads as (library, setup, statement)
+__WORKLOADS__ = {
+    "numpy_matmul": ("numpy", "import numpy as np\n"
+                              "a, b = np.random.rand(512, 512), np.random.rand(512, 512)",
+                     "a @ b"),
+    "torch_conv": ("torch", "import torch\n"
+                            "x = torch.rand(16, 3, 64, 64, requires_grad=True)\n"
+                            "conv = torch.nn.Conv2d(3, 32, 3, padding=1)",
+                   "conv(x).sum().backward()"),
+    "tensorflow_train_step": ("tensorflow", "import tensorflow as tf\n"
+                                            "model = tf.keras.Sequential([tf.keras.Input((64,)),\n"
+                                            "    tf.keras.layers.Dense(256, activation='relu'),\n"
+                                            "    tf.keras.layers.Dropout(0.5), tf.keras.layers.Dense(10)])\n"
+                                            "model.compile('adam', tf.keras.losses.SparseCategoricalCrossentropy("
+                                            "from_logits=True))\n"
+                                            "x, y = tf.random.uniform((256, 64)), tf.zeros((256,), tf.int32)",
+                              "model.train_on_batch(x, y)"),
+}
+
+
+def _cold_benchmarks() -> Dict[str, Tuple[str, str]]:
+    """ Benchmarks that run once in a fresh interpreter, as (setup, statement). """
+    return {
+        "cold/import_saatgut": ("", "import saatgut"),
+        "cold/seed_everything": ("import saatgut", "saatgut.seed_everything(42)"),
+        "cold/seed_everything_lazy": ("import saatgut", "saatgut.seed_everything(42, lazy=True)"),
+        "cold/domesticate_everything": ("import saatgut", "saatgut.domesticate_everything(42)"),
+        "cold/domesticate_everything_hard": ("import saatgut", "saatgut.domesticate_everything(42, hard_mode=True)"),
+    }
+
+
+def _warm_benchmarks() -> Dict[str, Tuple[Optional[str], str, str, int]]:
+    """ Benchmarks that run many times in one interpreter, as (required library, setup, statement, number). """
+    benchmarks = {
+        "warm/seed_everything": (None, "import saatgut", "saatgut.seed_everything(42)", 100),
+        "warm/domesticate_everything": (None, "import saatgut", "saatgut.domesticate_everything(42)", 100),
+        "warm/domesticate_everything_hard": (None, "import saatgut",
+                                             "saatgut.domesticate_everything(42, hard_mode=True)", 100),
+        # Seconds per MB, in requests of 4 KiB like the buffers of most consumers of os.urandom
+        "entropy/DeterministicEntropy_per_MB": (None, "import saatgut\n"
+                                                      "entropy = saatgut.DeterministicEntropy(42)",
+                                                "for _ in range(256): entropy.randbytes(4096)", 10),
+    }
+    for workload, (library, setup, statement) in __WORKLOADS__.items():
+        for setting, code in __SETTINGS__[library].items():
+            benchmarks[f"{workload}/{setting}"] = (library, f"import saatgut\n{code}\n{setup}", statement, 20)
+    return benchmarks
+
+
+def _run(code: str) -> float:
+    result = subprocess.run([sys.executable, "-c", code], cwd=_ROOT, check=True, capture_output=True, text=True)
+    return float(result.stdout.split()[-1])
+
+
+def _installed(library: Optional[str]) -> bool:
+    from saatgut._backends import is_installed
+    return library is None or is_installed(library)
+
+
+def _environment() -> dict:
+    from saatgut import available_backends
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=_ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count(), "backends": available_backends()}
+
+
+def run(pattern: str = "", repeats: int = 5) -> dict:
+    """
+    Run all benchmarks whose name contains `pattern`.
+
+    Returns:
+        dict: The run: the time, the environment, and the seconds of each benchmark (lower is better), or the reason
+            it was skipped.
+    """
+    results, skipped = {}, {}
+    for name, (setup, statement) in _cold_benchmarks().items():
+        if pattern in name:
+            code = _COLD_CHILD.format(setup=setup, statement=statement)
+            results[name] = statistics.median(_run(code) for _ in range(repeats))
+            print(f"{name:<45} {results[name] * 1000:12.3f} ms", flush=True)
+    for name, (library, setup, statement, number) in _warm_benchmarks().items():
+        if pattern not in name:
+            continue
+        if not _installed(library):
+            skipped[name] = f"{library} is not installed"
+            continue
+        statement_function = "def statement():\n" + "".join(f"    {line}\n" for line in statement.splitlines())
+        code = _WARM_CHILD.format(setup=setup, statement_function=statement_function, warmup=min(number, 5),
+                                  number=number, repeats=repeats)
+        results[name] = _run(code)
+        print(f"{name:<45} {results[name] * 1000:12.3f} ms", flush=True)
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "environment": _environment(), "results": results,
+            "skipped": skipped}
+
+
+def _previous_run(history: str, environment: dict) -> Optional[dict]:
+    """ The latest run in the history on the same machine, with the same Python and libraries. """
+    if not os.path.exists(history):
+        return None
+    same = ("python", "platform", "machine", "cpus", "backends")
+    previous = None
+    with open(history) as file:
+        for line in file:
+            entry = json.loads(line)
+            if all(entry["environment"].get(key) == environment[key] for key in same):
+                previous = entry
+    return previous
+
+
+def compare(current: dict, previous: dict, threshold: float) -> list:
+    """
+    Returns:
+        list: The names of all benchmarks that got slower by more than `threshold` (e.g. 0.2 for 20 %).
+    """
+    regressions = []
+    print(f"\nCompared to the run of {previous['time']} (commit {previous['environment'].get('commit')}):")
+    for name, seconds in current["results"].items():
+        before = previous["results"].get(name)
+        if not before:
+            continue
+        change = seconds / before - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<45} {change * 100:+8.1f} %{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text.")
+    parser.add_argument("--history", default=os.path.join(_ROOT, "benchmarks", "history.jsonl"))
+    parser.add_argument("--threshold", type=float, default=0.2, help="The relative slowdown that is a regression.")
+    parser.add_argument("--check", action="store_true", help="Exit with 1 if there are regressions.")
+    args = parser.parse_args()
+
+    current = run(args.filter, args.repeats)
+    for name, reason in current["skipped"].items():
+        print(f"{name:<45} skipped, {reason}")
+
+    previous = _previous_run(args.history, current["environment"])
+    regressions = compare(current, previous, args.threshold) if previous else []
+    if args.check and regressions:
+        print(f"\nFound regressions, the results were not appended to {args.history}")
+        sys.exit(1)
+    with open(args.history, "a") as file:
+        file.write(json.dumps(current) + "\n")
+    print(f"\nAppended the results to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,227 @@
-from saatgut._seed_jax import seed_jax, domesticate_jax
-from saatgut._seed_numpy import seed_numpy, domesticate_numpy
-from saatgut._seed_random import seed_random, domesticate_random
-from saatgut._seed_tensorflow import seed_tensorflow, domesticate_tensorflow
-from saatgut._seed_torch import seed_torch, domesticate_torch
+import importlib
+import sys
+from functools import partial
 
-from saatgut._secure_import import _exception_catcher, _silent_secure_import
+from saatgut._registry import Backend, backends as _registered_backends, register_backend, unregister_backend
 
-
-__ALL_SEEDING_FUNCTIONS__ = {
-    "torch": seed_torch,
-    "tensorflow": seed_tensorflow,
-    "numpy": seed_numpy,
-    "random": seed_random,
-    "jax": seed_jax,
+# The public names and the modules that define them. A module is only imported when one of its names is used first,
+# so that `import saatgut` doesn't load the code of backends and features that the program never uses.
+__LAZY_EXPORTS__ = {
+    **dict.fromkeys(("seed_jax", "domesticate_jax", "jax_keys", "KeyManager", "step_key", "device_key"),
+                    "saatgut._seed_jax"),
+    **dict.fromkeys(("seed_numba", "domesticate_numba"), "saatgut._seed_numba"),
+    **dict.fromkeys(("seed_numpy", "domesticate_numpy"), "saatgut._seed_numpy"),
+    **dict.fromkeys(("seed_random", "domesticate_random"), "saatgut._seed_random"),
+    **dict.fromkeys(("seed_tensorflow", "domesticate_tensorflow", "deterministic_data_options", "replica_generators",
+                     "replica_seed", "find_nondeterministic_ops"), "saatgut._seed_tensorflow"),
+    **dict.fromkeys(("seed_torch", "domesticate_torch", "distributed_seed", "distributed_context"),
+                    "saatgut._seed_torch"),
+    **dict.fromkeys(("derive_seed", "spawn_seeds"), "saatgut._seed_sequence"),
+    **dict.fromkeys(("seeds_for", "seed_for"), "saatgut._bulk"),
+    **dict.fromkeys(("DeterministicEntropy", "derandomized_entropy"), "saatgut._entropy"),
+    "fingerprint": "saatgut._fingerprint",
+    **dict.fromkeys(("numpy_generators", "GeneratorRegistry"), "saatgut._generators"),
+    "profile_determinism": "saatgut._profile",
+    **dict.fromkeys(("report", "add_hook", "remove_hook", "SeedingReport", "BackendReport"), "saatgut._report"),
+    "initialization_timings": "saatgut._scheduler",
+    "seeded": "saatgut._scoped",
+    "Seeder": "saatgut._seeder",
+    **dict.fromkeys(("snapshot", "restore", "Snapshot"), "saatgut._snapshot"),
+    **dict.fromkeys(("StreamManager", "RandomStream"), "saatgut._streams"),
+    **dict.fromkeys(("limit_threads", "threadpool_info"), "saatgut._threadpools"),
+    **dict.fromkeys(("verify_deterministic", "VerificationResult"), "saatgut._verify"),
+    **dict.fromkeys(("trace_torch", "find_divergence"), "saatgut._torch_trace"),
+    "memoize_deterministic": "saatgut._cache",
+    **dict.fromkeys(("seed_worker", "pool_initializer", "seeded_task", "SeededTask", "worker_init_fn",
+                     "torch_generator"), "saatgut._workers"),
+    "available_backends": "saatgut._backends",
 }
 
-__ALL_CULTIVATION_FUNCTIONS__ = {
-    "torch": domesticate_torch,
-    "tensorflow": domesticate_tensorflow,
-    "numpy": domesticate_numpy,
-    "random": domesticate_random,
-    "jax": domesticate_jax,
+__all__ = [*__LAZY_EXPORTS__, "seed_everything", "domesticate_everything", "Backend", "register_backend",
+           "unregister_backend"]
+
+
+# The tables of seeding functions of earlier versions, now read-only views of the registered backends
+__FUNCTION_VIEWS__ = {
+    "__ALL_SEEDING_FUNCTIONS__": "seed",
+    "__ALL_CULTIVATION_FUNCTIONS__": "domesticate",
 }
 
 
-def seed_everything(seed: int = 42):
+def __getattr__(name: str):
+    if name in __FUNCTION_VIEWS__:
+        from saatgut._registry import FunctionsView
+        value = globals()[name] = FunctionsView(__FUNCTION_VIEWS__[name])
+        return value
+    module = __LAZY_EXPORTS__.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(module), name)  # Only looked up once
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__LAZY_EXPORTS__))
+
+
+# Modules that are always available and cheap to import, these are never deferred in lazy mode
+__ALWAYS_IMPORTED__ = {"random"}
+
+
+def _plant_lazily(backend: Backend, tag: str, planter):
+    """
+    Seed the backend right away if its module is already imported, otherwise seed it as soon as it gets imported.
+
+    Args:
+        backend (Backend): The backend to seed.
+        tag (str): The kind of seeding, a newer call with the same tag replaces a pending older one.
+        planter (Callable): Function without arguments that seeds the package, see `SeedingReport.track`.
+    """
+    from saatgut._lazy import defer
+    from saatgut._report import report
+
+    if backend.module in __ALWAYS_IMPORTED__ or backend.module in sys.modules:
+        planter()
+    else:
+        report().defer(backend.name)
+        defer(backend.module, tag, planter)
+
+
+def _cancel_lazy(backends, tag: str):
+    """ Forget the pending planters of an older lazy call with the same tag, an eager call replaces them. """
+    if "saatgut._lazy" in sys.modules:  # Nothing can be pending otherwise
+        from saatgut._lazy import cancel
+        for backend in backends:
+            cancel(backend.module, tag)
+
+
+def _unwrapped(planter):
+    """
+    The seeding function without its `secure_import` check: the library is known to be installed at this point, and
+    errors while importing it should show up as failures in the report.
+    """
+    from saatgut._secure_import import _unchecked
+    return _unchecked(planter)
+
+
+def _settings(planter: partial) -> dict:
+    """ The name and keyword arguments of a seeding function, for the report. """
+    return {"function": getattr(planter.func, '__name__', repr(planter.func)), **planter.keywords}
+
+
+def _installed() -> dict:
+    """ The registered backends whose module is installed, by name. """
+    from saatgut._backends import installed_backends
+    registry = _registered_backends()
+    return {name: registry[name] for name in installed_backends()}
+
+
+def _tracked(seeding_report, planters: dict) -> dict:
+    """ Wrap the planters of all installed libraries with `SeedingReport.track`, and report the others as skipped. """
+    installed = _installed()
+    for package_name in _registered_backends():
+        if package_name not in installed:
+            seeding_report.skip(package_name)
+    return {package_name: seeding_report.track(package_name, planter, _settings(planter))
+            for package_name, planter in planters.items()}
+
+
+def _initialize(planters: dict, seeding_report, prepares: dict = None, parallel: bool = True):
+    """ Import and seed the backends of the planters, see `saatgut._scheduler.initialize`. """
+    from saatgut._scheduler import initialize
+    registry = _registered_backends()
+    initialize(planters, prepares=prepares, parallel=parallel, seeding_report=seeding_report,
+               modules={name: registry[name].module for name in planters},
+               thread_local=[name for name in planters if registry[name].thread_local])
+
+
+def seed_everything(seed: int = 42, lazy: bool = False, parallel: bool = True):
     """
     Set the random seed for all supported libraries to ensure reproducibility.
     This function does not ensure full determinism, but is sufficient for most use cases.
 
+    With `lazy=True`, only libraries that are already imported get seeded right away. All other libraries are seeded
+    the moment they are imported for the first time, so libraries that your program never uses are never imported.
+    A later call without `lazy` replaces the seeding that is still pending.
+
+    What was seeded, and how long it took, is recorded in `saatgut.report()`.
+
     Args:
         seed (int): The seed value to set for random number generation.
+        lazy (bool): If True, defers seeding of libraries that are not imported yet until their first import.
+        parallel (bool): If True, libraries that are not imported yet are imported concurrently, see
+            `saatgut.initialization_timings`. The libraries are then seeded in the threads of a pool, not in the
+            calling thread, except for libraries with a random state per thread (like Numba, see `saatgut.Backend`).
     """
-    for package_name, planter in __ALL_SEEDING_FUNCTIONS__.items():
-        try:
-            _exception_catcher(package_name, _silent_secure_import(package_name, planter))(seed)
-        except Exception as e:
-            print(f"Error while seeding with {planter.__name__}: {e}")
+    from saatgut._report import start_report
 
+    seeding_report = start_report("seed_everything", seed, lazy=lazy, parallel=parallel)
+    installed = _installed()
+    planters = _tracked(seeding_report, {package_name: partial(_unwrapped(backend.function("seed")), seed=seed)
+                                         for package_name, backend in installed.items()})
+    if lazy:
+        for package_name, planter in planters.items():
+            _plant_lazily(installed[package_name], "seed", planter)
+    else:
+        _cancel_lazy(installed.values(), "seed")
+        _initialize(planters, seeding_report, parallel=parallel)
+    seeding_report.finish()
 
-def domesticate_everything(seed: int = 42, hard_mode: bool = False):
+
+def _cultivation_planters(seed: int, hard_mode: bool) -> dict:
+    """
+    One planter per installed library that domesticates it, with the options of hard mode applied in the same call.
+    """
+    return {
+        package_name: partial(_unwrapped(backend.function("domesticate")), seed=seed,
+                              **(backend.hard_mode_options if hard_mode else {}))
+        for package_name, backend in _installed().items()
+    }
+
+
+def _prepare_planters(seed: int, hard_mode: bool) -> dict:
+    """ The functions that set the environment variables of each installed library, see `_cultivation_planters`. """
+    return {
+        package_name: partial(backend.function("prepare"), seed, **(backend.hard_mode_options if hard_mode else {}))
+        for package_name, backend in _installed().items() if backend.has("prepare")
+    }
+
+
+def domesticate_everything(seed: int = 42, hard_mode: bool = False, lazy: bool = False, parallel: bool = True):
     """
     Set up all supported libraries for reproducibility by setting random seeds and configuring options.
     Works like `saatgut.seed_everything`, but tries to ensure reproducibility as much as possible using additional configurations.
     This can make your code a lot more deterministic, but also slow it down significantly.
 
     You can set `hard_mode=True` to enable additional configurations for full determinism, such as setting intra-op
-    and inter-op parallelism threads to 1 in TensorFlow and enabling deterministic algorithms in PyTorch.
+    and inter-op parallelism threads to 1 in TensorFlow and BLAS, and forcing full matmul precision in PyTorch.
     This further reduces non-determinism, but may significantly slow down runtime performance.
 
+    With `lazy=True`, libraries that are not imported yet are domesticated on their first import, see
+    `saatgut.seed_everything`. Their environment variables are set right away.
+
+    What was domesticated with which settings, and how long it took, is recorded in `saatgut.report()`.
+
     Args:
         seed (int): The seed value to set for random number generation.
         hard_mode (bool): If True, sets additional configurations for full determinism.
+        lazy (bool): If True, defers domestication of libraries that are not imported yet until their first import.
+        parallel (bool): If True, libraries that are not imported yet are imported concurrently, after all environment
+            variables are set. See `saatgut.initialization_timings` for the time spent on each library. Like in
+            `saatgut.seed_everything`, only libraries with a random state per thread are domesticated in the calling
+            thread then.
     """
-    # First cultivate all libraries normally:
-    for package_name, planter in __ALL_CULTIVATION_FUNCTIONS__.items():
-        try:
-            _exception_catcher(package_name, _silent_secure_import(package_name, planter))(seed)
-        except Exception as e:
-            print(f"Error while cultivating {planter}: {e}")
-
-    # If hard_mode is enabled, set additional configurations for full determinism by hand:
-    if hard_mode:
-        domesticate_torch(seed=seed, force_matmul_precision=True)
-        domesticate_tensorflow(seed=seed, disable_parallelism=True)
-        domesticate_random(seed=seed, derandomize_cryptography=True)
\ No newline at end of file
+    from saatgut._report import start_report
+
+    seeding_report = start_report("domesticate_everything", seed, hard_mode=hard_mode, lazy=lazy, parallel=parallel)
+    planters = _tracked(seeding_report, _cultivation_planters(seed, hard_mode))
+    if lazy:
+        for prepare in _prepare_planters(seed, hard_mode).values():
+            prepare()
+        registry = _registered_backends()
+        for package_name, planter in planters.items():
+            _plant_lazily(registry[package_name], "domesticate", planter)
+    else:
+        _cancel_lazy(_installed().values(), "domesticate")
+        _initialize(planters, seeding_report, prepares=_prepare_planters(seed, hard_mode), parallel=parallel)
+    seeding_report.finish()
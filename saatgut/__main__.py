@@ -0,0 +1,40 @@
+"""
+Command line interface of saatgut:
+
+    python -m saatgut run --seed 42 --profile domesticate -- script.py [arguments ...]
+"""
+import argparse
+import sys
+
+from saatgut._launcher import __PROFILE_ENVIRONMENTS__, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="saatgut", description="saatgut: seed everything, everywhere, all at once.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser(
+        "run", help="Run a Python script in a reproducible environment.",
+        description="Set PYTHONHASHSEED and the thread and determinism environment variables before the interpreter "
+                    "starts, domesticate the libraries the script uses and run it.")
+    run_parser.add_argument("--seed", type=int, default=42, help="The seed value (default: 42).")
+    run_parser.add_argument("--profile", choices=list(__PROFILE_ENVIRONMENTS__), default="domesticate",
+                            help="'seed' like seed_everything, 'domesticate' like domesticate_everything, 'hard' like "
+                                 "domesticate_everything(hard_mode=True) with single-threaded BLAS and OpenMP "
+                                 "(default: domesticate).")
+    run_parser.add_argument("--manifest", default="saatgut-manifest.json",
+                            help="Where to write the JSON manifest of the applied settings "
+                                 "(default: saatgut-manifest.json).")
+    run_parser.add_argument("--no-manifest", action="store_true", help="Don't write a manifest.")
+    run_parser.add_argument("target", nargs=argparse.REMAINDER,
+                            help="The script and its arguments, or -m and a module, after '--'.")
+
+    args = parser.parse_args(argv)
+    target = args.target[1:] if args.target[:1] == ["--"] else args.target
+    if not target:
+        run_parser.error("no script given, use: python -m saatgut run [options] -- script.py [arguments ...]")
+    run(target, seed=args.seed, profile=args.profile, manifest=None if args.no_manifest else args.manifest)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
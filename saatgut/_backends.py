@@ -0,0 +1,79 @@
+"""
+This module finds out which of the registered backends are installed without importing them.
+The result is cached for the life of the process, so repeated seeding doesn't walk the import machinery again.
+"""
+import importlib.util
+import sys
+from functools import lru_cache
+from typing import Dict, Optional
+
+from saatgut._registry import backends
+
+
+@lru_cache(maxsize=None)
+def is_installed(module_name: str) -> bool:
+    """
+    Check if a top-level module can be imported, without importing it.
+
+    Args:
+        module_name (str): The name of the module.
+
+    Returns:
+        bool: True if the module is already imported or can be found by the import system.
+    """
+    if module_name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _installed_version(module_name: str, distributions: tuple) -> Optional[str]:
+    """
+    Look up the installed version of a module in the distribution metadata, falling back to `__version__` if the
+    module is already imported.
+    """
+    from importlib import metadata  # Slow to import, only needed once
+    for distribution in distributions:
+        try:
+            return metadata.version(distribution)
+        except metadata.PackageNotFoundError:
+            continue
+    return getattr(sys.modules.get(module_name), '__version__', None)
+
+
+@lru_cache(maxsize=None)
+def installed_backends() -> tuple:
+    """ The names of all registered backends whose module is installed. Cached until the registry changes. """
+    return tuple(name for name, backend in backends().items() if is_installed(backend.module))
+
+
+@lru_cache(maxsize=None)
+def _discover_backends() -> Dict[str, Optional[str]]:
+    registry = backends()
+    return {name: _installed_version(registry[name].module, registry[name].distributions)
+            for name in installed_backends()}
+
+
+def available_backends(refresh: bool = False) -> Dict[str, Optional[str]]:
+    """
+    Find all supported libraries that are installed, without importing any of them.
+    The result is cached, set `refresh=True` if packages were installed or removed while the program is running.
+
+    Args:
+        refresh (bool): If True, discards the cached result and searches again.
+
+    Returns:
+        dict: Maps the name of each installed library to its version (None for the standard library or if unknown).
+    """
+    if refresh:
+        is_installed.cache_clear()
+        _clear_caches()
+    return dict(_discover_backends())
+
+
+def _clear_caches():
+    """ Forget which backends are installed, called when the registry changes. """
+    installed_backends.cache_clear()
+    _discover_backends.cache_clear()
@@ -0,0 +1,44 @@
+"""
+Runs a script after domesticating it, started by `python -m saatgut run` (see `saatgut._launcher`):
+
+    python -m saatgut._bootstrap SEED PROFILE BACKENDS script.py [arguments ...]
+    python -m saatgut._bootstrap SEED PROFILE BACKENDS -m module [arguments ...]
+
+The backends (comma separated) are imported and domesticated right away, all others on their first import.
+"""
+import importlib
+import os
+import runpy
+import sys
+
+from saatgut._report import logger
+
+
+def main(arguments):
+    import saatgut
+    from saatgut._registry import backends
+
+    seed, profile, preload, target = int(arguments[0]), arguments[1], arguments[2], arguments[3:]
+    for backend in filter(None, preload.split(",")):
+        try:
+            importlib.import_module(backends()[backend].module)
+        except ImportError as e:
+            logger.warning("Could not preload %s: %s", backend, e)
+
+    if profile == "seed":
+        saatgut.seed_everything(seed, lazy=True)
+    else:
+        saatgut.domesticate_everything(seed, hard_mode=profile == "hard", lazy=True)
+
+    if target[0] == "-m":
+        sys.argv = [target[1]] + target[2:]  # Replaced by the path of the module by runpy
+        sys.path[0] = os.getcwd()
+        runpy.run_module(target[1], run_name="__main__", alter_sys=True)
+    else:
+        sys.argv = target
+        sys.path[0] = os.path.dirname(os.path.abspath(target[0]))
+        runpy.run_path(target[0], run_name="__main__")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
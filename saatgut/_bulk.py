@@ -0,0 +1,140 @@
+"""
+This module derives one seed per sample (or per any other key) in bulk, e.g. for deterministic per-sample augmentation.
+Seeds are computed with the SplitMix64 mixing function, vectorized with NumPy or PyTorch. They only depend on the root
+seed and the key, not on `PYTHONHASHSEED`, the order of the keys, shuffling or sharding.
+"""
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_CHUNK_SIZE = 1 << 16  # Keeps the temporary arrays in the CPU cache
+
+
+def _mix64(z: int) -> int:
+    """ The SplitMix64 finalizer for a single Python integer. """
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _root_state(seed: int) -> int:
+    """ Fold a root seed of any size into 64 bits of state. """
+    if seed < 0:
+        raise ValueError(f"The root seed must be non-negative, got {seed}")
+    state = _mix64(seed & _MASK64)
+    seed >>= 64
+    while seed:
+        state = _mix64((state + _GAMMA * ((seed & _MASK64) + 1)) & _MASK64)
+        seed >>= 64
+    return state
+
+
+def seed_for(root_seed: int, *key: int) -> int:
+    """
+    Derive the seed of a single key, the same as `saatgut.seeds_for` does for a whole array.
+
+    Args:
+        root_seed (int): The root seed.
+        *key (int): The key, e.g. `(epoch, sample_index)`.
+
+    Returns:
+        int: The 64-bit seed of the key.
+    """
+    state = _root_state(root_seed)
+    for part in key:
+        state = _mix64((state + _GAMMA * ((part & _MASK64) + 1)) & _MASK64)
+    return state
+
+
+def _seeds_for_numpy(state: int, keys):
+    import numpy as np
+
+    keys = np.asarray(keys)
+    if keys.ndim == 0 or keys.ndim > 2:
+        raise ValueError(f"Keys must be a 1-D array of keys or a 2-D array with one key per row, got {keys.shape}")
+    columns = keys[:, None] if keys.ndim == 1 else keys
+
+    result = np.empty(len(columns), dtype=np.uint64)
+    gamma, mix1, mix2 = np.uint64(_GAMMA), np.uint64(_MIX1), np.uint64(_MIX2)
+    with np.errstate(over='ignore'):
+        for start in range(0, len(columns), _CHUNK_SIZE):
+            out = result[start:start + _CHUNK_SIZE]
+            temp = np.empty_like(out)
+            out.fill(state)
+            for column in range(columns.shape[1]):
+                np.add(columns[start:start + _CHUNK_SIZE, column], 1, out=temp, casting='unsafe')
+                temp *= gamma
+                out += temp
+                # SplitMix64 finalizer, in place:
+                np.right_shift(out, np.uint64(30), out=temp)
+                out ^= temp
+                out *= mix1
+                np.right_shift(out, np.uint64(27), out=temp)
+                out ^= temp
+                out *= mix2
+                np.right_shift(out, np.uint64(31), out=temp)
+                out ^= temp
+    return result
+
+
+def _to_int64(value: int) -> int:
+    """ Reinterpret an unsigned 64-bit integer as a signed one. """
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _seeds_for_torch(state: int, keys):
+    import torch
+
+    if keys.ndim == 0 or keys.ndim > 2:
+        raise ValueError(f"Keys must be a 1-D tensor of keys or a 2-D tensor with one key per row, got {keys.shape}")
+    columns = (keys[:, None] if keys.ndim == 1 else keys).to(torch.int64)
+
+    # PyTorch has no unsigned 64-bit arithmetic: int64 wraps around the same way, and shifts are made logical by masking
+    def shift_right_into(tensor, bits, out):
+        torch.bitwise_right_shift(tensor, bits, out=out)
+        out &= (1 << (64 - bits)) - 1
+
+    result = torch.empty(len(columns), dtype=torch.int64, device=keys.device)
+    for start in range(0, len(columns), _CHUNK_SIZE):
+        out = result[start:start + _CHUNK_SIZE]
+        temp = torch.empty_like(out)
+        out.fill_(_to_int64(state))
+        for column in range(columns.shape[1]):
+            torch.add(columns[start:start + _CHUNK_SIZE, column], 1, out=temp)
+            temp *= _to_int64(_GAMMA)
+            out += temp
+            # SplitMix64 finalizer, in place:
+            shift_right_into(out, 30, temp)
+            out ^= temp
+            out *= _to_int64(_MIX1)
+            shift_right_into(out, 27, temp)
+            out ^= temp
+            out *= _to_int64(_MIX2)
+            shift_right_into(out, 31, temp)
+            out ^= temp
+    return result
+
+
+def seeds_for(root_seed: int, keys):
+    """
+    Derive one stable 64-bit seed for every key, e.g. one seed per sample of a dataset:
+
+        seeds = saatgut.seeds_for(42, np.stack([np.full(n, epoch), indices], axis=1))
+        rng = np.random.default_rng(int(seeds[i]))
+
+    The seed of a key is the same as `saatgut.seed_for(root_seed, *key)`. Keys are used modulo 2**64.
+    Use `seeds >> 32` if you need seeds that fit into 32 bits, e.g. for `np.random.seed`.
+
+    Args:
+        root_seed (int): The root seed.
+        keys (numpy.ndarray or torch.Tensor): Integer keys, either a 1-D array with one key per element, or a 2-D array
+            with one multi-part key (like epoch and sample index) per row.
+
+    Returns:
+        numpy.ndarray or torch.Tensor: The seeds. NumPy arrays have dtype uint64. PyTorch tensors have dtype int64 with
+            the same bits, on the device of the keys.
+    """
+    state = _root_state(root_seed)
+    if type(keys).__module__.startswith('torch'):
+        return _seeds_for_torch(state, keys)
+    return _seeds_for_numpy(state, keys)
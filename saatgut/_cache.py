@@ -0,0 +1,189 @@
+"""
+This module caches the results of deterministic functions on disk. A result is keyed on everything that can change it:
+the seed, the arguments, the source code of the function, the versions of the installed libraries and the determinism
+settings. NumPy arrays and PyTorch tensors in results are stored as separate files and memory-mapped when loaded, so a
+cache hit doesn't read more data than is actually used.
+"""
+import functools
+import inspect
+import marshal
+import os
+import pickle
+import platform
+import shutil
+import tempfile
+from typing import Callable, Optional
+
+from saatgut._backends import available_backends
+from saatgut._fingerprint import fingerprint
+
+_RESULT_FILE = "result.pkl"
+
+
+def _default_cache_dir() -> str:
+    if "SAATGUT_CACHE_DIR" in os.environ:
+        return os.environ["SAATGUT_CACHE_DIR"]
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "saatgut")
+
+
+def _source_hash(fn: Callable) -> str:
+    """ A fingerprint of the code of a function, from its source if available and its bytecode otherwise. """
+    try:
+        return fingerprint(inspect.getsource(fn))
+    except (OSError, TypeError):
+        return fingerprint(marshal.dumps(fn.__code__))
+
+
+class _PayloadPickler(pickle.Pickler):
+    """ Pickles a result, but writes NumPy arrays and PyTorch tensors into files of their own. """
+    def __init__(self, file, directory: str):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.count = 0
+
+    def persistent_id(self, obj):
+        module = type(obj).__module__
+        if module == "numpy" and type(obj).__name__ == "ndarray" and not obj.dtype.hasobject:
+            import numpy as np
+            name = f"{self.count}.npy"
+            np.save(os.path.join(self.directory, name), obj, allow_pickle=False)
+        elif module.startswith("torch") and type(obj).__name__ in ("Tensor", "Parameter") and not obj.is_sparse:
+            import torch
+            name = f"{self.count}.pt"
+            torch.save(obj.detach().cpu(), os.path.join(self.directory, name))
+        else:
+            return None
+        self.count += 1
+        return name
+
+
+class _PayloadUnpickler(pickle.Unpickler):
+    """ Loads a result, memory-mapping the files of its arrays and tensors. """
+    def __init__(self, file, directory: str):
+        super().__init__(file)
+        self.directory = directory
+
+    def persistent_load(self, name):
+        path = os.path.join(self.directory, name)
+        if name.endswith(".npy"):
+            import numpy as np
+            return np.load(path, mmap_mode='c')  # Copy on write: the result can be modified, the cache can't
+        import torch
+        return torch.load(path, mmap=True, weights_only=True)
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for entry in os.scandir(path):
+        try:
+            total += entry.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def _evict(cache_dir: str, max_size: int):
+    """ Remove the least recently used entries until the cache is at most `max_size` bytes large. """
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_dir() and not entry.name.startswith("."):
+            try:
+                entries.append((os.stat(os.path.join(entry.path, _RESULT_FILE)).st_mtime, entry.path,
+                                _directory_size(entry.path)))
+            except OSError:
+                continue
+    total = sum(size for _, _, size in entries)
+    for _, path, size in sorted(entries):
+        if total <= max_size:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def memoize_deterministic(fn: Optional[Callable] = None, seed: int = 42, hard_mode: bool = False,
+                          cache_dir: Optional[str] = None, max_size: int = 10 * 2 ** 30):
+    """
+    Cache the results of a deterministic function on disk. Before the function is computed, everything is seeded with
+    `saatgut.domesticate_everything(seed, hard_mode)`. Results are keyed on the seed and the determinism settings, the
+    fingerprints of the arguments, the source code of the function and the versions of Python and all installed
+    libraries, so a result is only reused if recomputing it would give the same:
+
+        @saatgut.memoize_deterministic(seed=42)
+        def preprocess(path, size=224):
+            ...
+
+    NumPy arrays and PyTorch tensors in results are memory-mapped when they are loaded from the cache.
+    Only use it for functions without side effects: on a cache hit, the function isn't called and nothing is seeded.
+    The decorated function has a `cache_key(*args, **kwargs)` and a `cache_clear()` method.
+
+    Args:
+        fn (Callable): The function. Can be omitted to pass the other arguments, like `@memoize_deterministic(seed=1)`.
+        seed (int): The seed value to set before the function is computed.
+        hard_mode (bool): Passed on to `saatgut.domesticate_everything`.
+        cache_dir (str): The directory of the cache. Defaults to the environment variable `SAATGUT_CACHE_DIR` or
+            `~/.cache/saatgut`.
+        max_size (int): The maximum size of the cache in bytes, least recently used results are removed beyond it.
+
+    Returns:
+        Callable: The decorated function.
+    """
+    if fn is None:
+        return functools.partial(memoize_deterministic, seed=seed, hard_mode=hard_mode, cache_dir=cache_dir,
+                                 max_size=max_size)
+
+    directory = cache_dir or _default_cache_dir()
+    function_key = (fn.__module__, fn.__qualname__, _source_hash(fn), platform.python_version())
+    # The entries of a function start with a prefix of its own, which stays the same when its code changes
+    prefix = fingerprint((fn.__module__, fn.__qualname__))[:16] + "-"
+
+    def cache_key(*args, **kwargs) -> str:
+        return prefix + fingerprint((function_key, seed, hard_mode, available_backends(), args, kwargs))
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        from saatgut import domesticate_everything
+
+        entry = os.path.join(directory, cache_key(*args, **kwargs))
+        result_file = os.path.join(entry, _RESULT_FILE)
+        try:
+            with open(result_file, 'rb') as file:
+                result = _PayloadUnpickler(file, entry).load()
+        except (OSError, EOFError, ValueError, RuntimeError, pickle.UnpicklingError):
+            # A truncated or corrupt entry is a miss as well, it is removed so that the new result can take its place
+            if os.path.exists(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+        else:
+            try:
+                os.utime(result_file)  # Marks the entry as recently used
+            except OSError:
+                pass
+            return result
+
+        domesticate_everything(seed, hard_mode=hard_mode)
+        result = fn(*args, **kwargs)
+
+        # Write into a temporary directory first, so that other processes never see incomplete entries
+        os.makedirs(directory, exist_ok=True)
+        temporary = tempfile.mkdtemp(prefix=".", dir=directory)
+        try:
+            with open(os.path.join(temporary, _RESULT_FILE), 'wb') as file:
+                _PayloadPickler(file, temporary).dump(result)
+            os.replace(temporary, entry)
+        except OSError:
+            pass  # Another process stored the same result in the meantime
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+        _evict(directory, max_size)
+        return result
+
+    def cache_clear():
+        """ Remove all cached results of this function, from any version of its code. """
+        if not os.path.isdir(directory):
+            return
+        for entry in os.scandir(directory):
+            if entry.name.startswith(prefix) and entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    wrapper.cache_key = cache_key
+    wrapper.cache_clear = cache_clear
+    return wrapper
@@ -0,0 +1,119 @@
+"""
+This module replaces the entropy of the operating system with a deterministic, seeded byte stream, for tests that must
+not depend on real randomness. It covers `os.urandom`, `os.getrandom`, `random.SystemRandom`, `secrets` and
+`uuid.uuid4`.
+NEVER USE IN PRODUCTION, THIS MAKES CRYPTOGRAPHIC FUNCTIONS INSECURE!
+"""
+import os
+import random
+import threading
+from contextlib import contextmanager
+
+
+class DeterministicEntropy:
+    """
+    A deterministic source of random bytes. Bytes are generated in large blocks with `random.Random.getrandbits` and
+    handed out from a buffer, so many small requests (like the 16 bytes of a UUID) are as cheap as a few big ones.
+    The stream of bytes only depends on the seed, not on how it is split into requests or on the block size.
+
+    Use `install()` and `uninstall()` to replace the entropy of the operating system, or `saatgut.derandomized_entropy`
+    for a scoped replacement.
+
+    Args:
+        seed (int): The seed of the byte stream.
+        block_size (int): The number of bytes generated at once, rounded up to whole 32-bit words.
+    """
+    def __init__(self, seed: int = 42, block_size: int = 1 << 16):
+        self.seed = seed
+        # `getrandbits` draws 32-bit words, blocks of whole words continue the stream exactly where the last one ended
+        self.block_size = max(4, -(-block_size // 4) * 4)
+        self._random = random.Random(seed)
+        self._buffer = b''
+        self._position = 0
+        self._lock = threading.Lock()
+        self._originals = []
+
+    def _generate(self, n: int) -> bytes:
+        return self._random.getrandbits(8 * n).to_bytes(n, 'little') if n else b''
+
+    def randbytes(self, n: int) -> bytes:
+        """
+        Args:
+            n (int): The number of bytes.
+
+        Returns:
+            bytes: The next `n` bytes of the stream.
+        """
+        n = int(n)
+        if n < 0:
+            raise ValueError("negative argument not allowed")
+        with self._lock:
+            end = self._position + n
+            if end <= len(self._buffer):
+                result = self._buffer[self._position:end]
+                self._position = end
+                return result
+
+            result = self._buffer[self._position:]
+            missing = n - len(result)
+            blocks = -(-missing // self.block_size)  # Rounded up
+            self._buffer = self._generate(blocks * self.block_size)
+            self._position = missing
+            return result + self._buffer[:missing]
+
+    def urandom(self, size: int) -> bytes:
+        """ Drop-in replacement for `os.urandom`. """
+        return self.randbytes(size)
+
+    def getrandom(self, size: int, flags: int = 0) -> bytes:
+        """ Drop-in replacement for `os.getrandom`, the flags are ignored. """
+        return self.randbytes(size)
+
+    def install(self):
+        """
+        Replace the entropy of the operating system with this stream, until `uninstall` is called.
+        Can be called several times, each call must be matched by a call to `uninstall`.
+        """
+        originals = [(os, 'urandom', os.urandom), (random, '_urandom', getattr(random, '_urandom', None))]
+        if hasattr(os, 'getrandom'):
+            originals.append((os, 'getrandom', os.getrandom))
+        self._originals.append(originals)
+
+        os.urandom = self.urandom  # Also used by uuid.uuid4
+        random._urandom = self.urandom  # Used by random.SystemRandom, and with it by the secrets module
+        if hasattr(os, 'getrandom'):
+            os.getrandom = self.getrandom
+
+    def uninstall(self):
+        """
+        Undo the latest call to `install`.
+        """
+        for module, name, original in reversed(self._originals.pop()):
+            if original is None:
+                delattr(module, name)
+            else:
+                setattr(module, name, original)
+
+
+@contextmanager
+def derandomized_entropy(seed: int = 42):
+    """
+    Replace the entropy of the operating system with a deterministic stream inside a `with` block:
+
+        with saatgut.derandomized_entropy(42):
+            token = secrets.token_hex(16)  # The same in every run
+
+    NEVER USE IN PRODUCTION, THIS MAKES CRYPTOGRAPHIC FUNCTIONS INSECURE!
+
+    Args:
+        seed (int): The seed of the byte stream.
+
+    Yields:
+        DeterministicEntropy: The installed stream.
+    """
+    entropy = DeterministicEntropy(seed)
+    entropy.install()
+    try:
+        yield entropy
+    finally:
+        entropy.uninstall()
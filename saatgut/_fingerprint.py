@@ -0,0 +1,116 @@
+"""
+This module computes fingerprints of arbitrary outputs (nested containers, NumPy arrays, PyTorch and TensorFlow tensors,
+model state dicts) to check whether two runs produced bit-identical results.
+Arrays and tensors are hashed straight from their memory buffers, without converting them to Python objects.
+"""
+import hashlib
+import pickle
+from typing import Iterator, Tuple
+
+try:
+    import xxhash
+
+    def _new_hasher():
+        return xxhash.xxh3_128()
+except ImportError:
+    def _new_hasher():
+        return hashlib.blake2b(digest_size=16)
+
+
+def _array_buffer(obj):
+    """
+    Get a C-contiguous NumPy array (or None) with the data of an array or tensor, without copying it if possible.
+    """
+    module = type(obj).__module__
+    if module.startswith('torch'):
+        import torch
+        if isinstance(obj, torch.Tensor):
+            tensor = obj.detach()
+            if tensor.is_sparse:
+                tensor = tensor.to_dense()
+            tensor = tensor.cpu().contiguous()
+            # View as bytes, NumPy doesn't know every dtype of PyTorch (e.g. bfloat16)
+            return tensor.reshape(-1).view(torch.uint8).numpy()
+    elif module.startswith('tensorflow') and hasattr(obj, 'numpy'):
+        return _array_buffer(obj.numpy())
+    elif hasattr(obj, '__array_interface__') and not isinstance(obj, (bytes, bytearray, memoryview)):
+        import numpy as np
+        array = np.ascontiguousarray(obj)
+        return None if array.dtype.hasobject else array
+    return None
+
+
+def _update(hasher, obj):
+    """ Feed `obj` into `hasher`, with type and shape information so that different structures don't collide. """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode('utf-8'))
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = memoryview(obj).cast('B')
+        hasher.update(f"bytes:{len(data)};".encode('utf-8'))
+        hasher.update(data)
+    elif isinstance(obj, dict):
+        hasher.update(f"dict:{len(obj)};".encode('utf-8'))
+        for key, value in obj.items():
+            _update(hasher, key)
+            _update(hasher, value)
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(f"{type(obj).__name__}:{len(obj)};".encode('utf-8'))
+        for item in obj:
+            _update(hasher, item)
+    elif isinstance(obj, (set, frozenset)):
+        digests = sorted(fingerprint(item) for item in obj)
+        hasher.update(f"set:{len(digests)};{''.join(digests)}".encode('utf-8'))
+    elif hasattr(obj, 'state_dict') and callable(obj.state_dict):
+        _update(hasher, obj.state_dict())  # torch modules and optimizers
+    else:
+        array = _array_buffer(obj)
+        if array is not None:
+            hasher.update(f"array:{getattr(obj, 'dtype', array.dtype)}:{tuple(getattr(obj, 'shape', ()))};"
+                          .encode('utf-8'))
+            hasher.update(memoryview(array).cast('B'))
+        else:
+            hasher.update(f"object:{type(obj).__qualname__};".encode('utf-8'))
+            hasher.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def fingerprint(obj) -> str:
+    """
+    Compute a fingerprint of `obj`. Two objects have the same fingerprint if they have the same structure and
+    bit-identical contents. Uses xxhash if it is installed, and BLAKE2 otherwise.
+
+    Args:
+        obj: Any combination of dicts, lists, tuples, sets, scalars, strings, bytes, NumPy arrays, PyTorch and
+            TensorFlow tensors, and objects with a `state_dict()` method. Other objects are pickled.
+
+    Returns:
+        str: The fingerprint as a hex string.
+    """
+    hasher = _new_hasher()
+    _update(hasher, obj)
+    return hasher.hexdigest()
+
+
+def leaf_fingerprints(obj, path: str = "output") -> Iterator[Tuple[str, str]]:
+    """
+    Walk through nested containers (and `state_dict()`s) and compute a fingerprint for each leaf, e.g. each array or
+    tensor, so that differences between two outputs can be pinpointed.
+
+    Args:
+        obj: The object, see `saatgut.fingerprint`.
+        path (str): The name of the object, used as the prefix of the paths of its leaves.
+
+    Yields:
+        tuple: The path of each leaf (like `output['weights'][0]`) and its fingerprint.
+    """
+    if isinstance(obj, dict):
+        yield path, f"dict:{len(obj)}"
+        for key, value in obj.items():
+            yield from leaf_fingerprints(value, f"{path}[{key!r}]")
+    elif isinstance(obj, (list, tuple)):
+        yield path, f"{type(obj).__name__}:{len(obj)}"
+        for index, item in enumerate(obj):
+            yield from leaf_fingerprints(item, f"{path}[{index}]")
+    elif hasattr(obj, 'state_dict') and callable(obj.state_dict):
+        yield from leaf_fingerprints(obj.state_dict(), f"{path}.state_dict()")
+    else:
+        yield path, fingerprint(obj)
@@ -0,0 +1,176 @@
+"""
+This module manages NumPy `Generator` objects. The legacy `np.random.seed` doesn't affect generators created with
+`np.random.default_rng()`, and its Mersenne Twister is slower than the modern bit generators. A registry hands out named
+generators derived from the root seed with `SeedSequence`, and can reroute `np.random.default_rng()` to it.
+"""
+import itertools
+from typing import Iterator, Optional
+
+from saatgut._secure_import import secure_import
+from saatgut._streams import Key, _key_to_int
+
+__BIT_GENERATORS__ = ("PCG64", "PCG64DXSM", "SFC64", "Philox", "MT19937")
+
+# Named generators and the generators of rerouted `default_rng()` calls are derived from different branches of the seed
+_NAMED_BRANCH = 0
+_DEFAULT_RNG_BRANCH = 1
+
+# The registry seeded by `seed_numpy`
+_REGISTRY = None
+
+
+def _check_bit_generator(name: str):
+    if name not in __BIT_GENERATORS__:
+        raise ValueError(f"Unknown bit generator {name!r}, choose from {__BIT_GENERATORS__}")
+
+
+class GeneratorRegistry:
+    """
+    Named NumPy generators derived from a root seed. The generator of a name only depends on the seed and the name,
+    not on the order in which components ask for their generators:
+
+        generators = saatgut.numpy_generators()
+        augment_rng = generators["augmentation"]
+        noise = generators["noise"].standard_normal(1_000_000)
+
+    Reseeding (e.g. with `saatgut.seed_everything`) resets all generators in place, so components can keep their
+    references. The registry is a mapping from names to generators, so it can be passed to `saatgut.snapshot`.
+
+    Args:
+        seed (int): The root seed.
+        bit_generator (str): The default bit generator, one of "PCG64", "PCG64DXSM", "SFC64", "Philox" or "MT19937".
+    """
+    def __init__(self, seed: int = 42, bit_generator: str = "PCG64"):
+        _check_bit_generator(bit_generator)
+        self.seed = seed
+        self.bit_generator = bit_generator
+        self._generators = {}
+        self._default_rng_calls = itertools.count()
+        self._original_default_rng = None
+
+    def _create(self, spawn_key: tuple, bit_generator: str):
+        import numpy as np
+        sequence = np.random.SeedSequence(self.seed, spawn_key=spawn_key)
+        return np.random.Generator(getattr(np.random, bit_generator)(sequence))
+
+    def get(self, name: Key, bit_generator: Optional[str] = None):
+        """
+        Get the generator of a name, creating it on the first request.
+
+        Args:
+            name (int, str or bytes): The name, e.g. of a component.
+            bit_generator (str): The bit generator of a new generator, defaults to the one of the registry.
+
+        Returns:
+            numpy.random.Generator: The generator.
+        """
+        generator = self._generators.get(name)
+        if generator is None:
+            bit_generator = bit_generator or self.bit_generator
+            _check_bit_generator(bit_generator)
+            generator = self._generators.setdefault(
+                name, self._create((_NAMED_BRANCH, _key_to_int(name)), bit_generator))
+        return generator
+
+    def __getitem__(self, name: Key):
+        return self.get(name)
+
+    def __delitem__(self, name: Key):
+        del self._generators[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._generators
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._generators))
+
+    def __len__(self) -> int:
+        return len(self._generators)
+
+    def items(self):
+        return list(self._generators.items())
+
+    def reseed(self, seed: int):
+        """
+        Reset all generators to the states of a new root seed, in place.
+
+        Args:
+            seed (int): The new root seed.
+        """
+        self.seed = seed
+        self._default_rng_calls = itertools.count()
+        for name, generator in self._generators.items():
+            fresh = self._create((_NAMED_BRANCH, _key_to_int(name)), type(generator.bit_generator).__name__)
+            generator.bit_generator.state = fresh.bit_generator.state
+
+    def default_rng(self, seed=None):
+        """
+        Drop-in replacement for `np.random.default_rng`: without a seed, the n-th call returns a new generator derived
+        from the root seed, instead of one seeded from the operating system.
+        """
+        if seed is not None:
+            import numpy as np
+            return (self._original_default_rng or np.random.default_rng)(seed)
+        return self._create((_DEFAULT_RNG_BRANCH, next(self._default_rng_calls)), self.bit_generator)
+
+    def reroute_default_rng(self):
+        """
+        Replace `np.random.default_rng` with `GeneratorRegistry.default_rng`, so that code which creates its generators
+        with `np.random.default_rng()` becomes reproducible. Code that imported `default_rng` by name before is not
+        affected. Undo it with `restore_default_rng`.
+        """
+        import numpy as np
+        if self._original_default_rng is None:
+            self._original_default_rng = np.random.default_rng
+            np.random.default_rng = self.default_rng
+
+    def restore_default_rng(self):
+        """
+        Undo `reroute_default_rng`.
+        """
+        import numpy as np
+        if self._original_default_rng is not None:
+            np.random.default_rng = self._original_default_rng
+            self._original_default_rng = None
+
+    def __repr__(self):
+        return f"GeneratorRegistry(seed={self.seed}, bit_generator={self.bit_generator!r}, names={list(self)})"
+
+
+def _reseed_registry(seed: int):
+    """ Reseed the registry of `saatgut.numpy_generators`, called by `saatgut.seed_numpy`. """
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = GeneratorRegistry(seed)
+    else:
+        _REGISTRY.reseed(seed)
+
+
+def _registered_generators() -> Optional[GeneratorRegistry]:
+    """ The registry of `saatgut.numpy_generators` if it has any generators, else None. """
+    return _REGISTRY if _REGISTRY is not None and len(_REGISTRY) else None
+
+
+@secure_import('numpy')
+def numpy_generators(bit_generator: Optional[str] = None) -> GeneratorRegistry:
+    """
+    Get the registry of named NumPy generators. It is reseeded by `saatgut.seed_numpy` (and with it by
+    `seed_everything` and `domesticate_everything`), and uses the seed 42 if NumPy was never seeded.
+
+        rng = saatgut.numpy_generators()["augmentation"]
+
+    To make `np.random.default_rng()` reproducible as well, call `saatgut.numpy_generators().reroute_default_rng()`.
+
+    Args:
+        bit_generator (str): Change the bit generator of new generators, e.g. to "SFC64" or "Philox".
+
+    Returns:
+        GeneratorRegistry: The registry.
+    """
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = GeneratorRegistry()
+    if bit_generator is not None:
+        _check_bit_generator(bit_generator)
+        _REGISTRY.bit_generator = bit_generator
+    return _REGISTRY
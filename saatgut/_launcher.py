@@ -0,0 +1,165 @@
+"""
+This module launches Python scripts in a reproducible environment. Some settings, like `PYTHONHASHSEED` and the thread
+counts of OpenMP and MKL, only work if they are set before the interpreter starts. The launcher sets them and replaces
+itself with the target (exactly one `exec`, no re-executing), where the backends the script imports are domesticated
+before it runs. A JSON manifest records the applied settings for later reproduction.
+"""
+import ast
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import time
+from importlib import metadata
+from typing import Dict, List, Optional, Set
+
+from saatgut._backends import available_backends
+
+# The environment variables of each profile, each profile includes the ones before it
+__PROFILE_ENVIRONMENTS__ = {
+    "seed": {},
+    "domesticate": {
+        "TF_DETERMINISTIC_OPS": "1",
+        "TF_CUDNN_DETERMINISTIC": "1",
+        "CUBLAS_WORKSPACE_CONFIG": ":4096:8",  # Needed by deterministic cuBLAS in PyTorch
+    },
+    "hard": {
+        "OMP_NUM_THREADS": "1",
+        "MKL_NUM_THREADS": "1",
+        "OPENBLAS_NUM_THREADS": "1",
+        "NUMEXPR_NUM_THREADS": "1",
+        "TF_NUM_INTRAOP_THREADS": "1",
+        "TF_NUM_INTEROP_THREADS": "1",
+    },
+}
+
+# Imports that mean that a script uses one of the backends
+__IMPORT_ALIASES__ = {
+    "keras": "tensorflow", "tf_keras": "tensorflow",
+    "torchvision": "torch", "torchaudio": "torch", "lightning": "torch", "pytorch_lightning": "torch",
+    "flax": "jax", "optax": "jax", "jaxlib": "jax",
+    "scipy": "numpy", "pandas": "numpy", "sklearn": "numpy",
+}
+
+
+def launch_environment(seed: int, profile: str = "domesticate") -> Dict[str, str]:
+    """
+    The environment variables that the launcher sets for a profile.
+
+    Args:
+        seed (int): The seed value, used as `PYTHONHASHSEED`.
+        profile (str): "seed", "domesticate" or "hard", like `seed_everything`, `domesticate_everything` and
+            `domesticate_everything(hard_mode=True)`.
+
+    Returns:
+        dict: The environment variables by name.
+    """
+    if profile not in __PROFILE_ENVIRONMENTS__:
+        raise ValueError(f"Unknown profile {profile!r}, choose from {list(__PROFILE_ENVIRONMENTS__)}")
+    environment = {"PYTHONHASHSEED": str(seed)}
+    for name, variables in __PROFILE_ENVIRONMENTS__.items():
+        environment.update(variables)
+        if name == profile:
+            break
+    return environment
+
+
+def scan_imports(path: str) -> Set[str]:
+    """
+    Find the supported backends that a script imports, without running it. Only the script itself is scanned.
+
+    Args:
+        path (str): The path of the script.
+
+    Returns:
+        set: The names of the backends, like "numpy" or "torch".
+    """
+    from saatgut._registry import backends
+
+    with open(path, 'rb') as file:
+        tree = ast.parse(file.read(), filename=path)
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.add(node.module.split('.')[0])
+    by_module = {backend.module: name for name, backend in backends().items()}
+    modules = {__IMPORT_ALIASES__.get(module, module) for module in modules}
+    return {by_module[module] for module in modules if module in by_module}
+
+
+def _script_path(target: List[str]) -> Optional[str]:
+    """ The path of the script of a target like `["script.py", ...]` or `["-m", "package.module", ...]`. """
+    if target[0] == "-m":
+        from importlib.util import find_spec
+        try:
+            spec = find_spec(target[1])
+        except (ImportError, ValueError):
+            return None
+        if spec is not None and spec.submodule_search_locations:
+            spec = find_spec(target[1] + ".__main__")
+        return spec.origin if spec is not None and spec.origin and spec.origin.endswith(".py") else None
+    return target[0]
+
+
+def _saatgut_version() -> Optional[str]:
+    try:
+        return metadata.version("saatgut")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def write_manifest(path: str, seed: int, profile: str, environment: Dict[str, str], preload: List[str],
+                   target: List[str]):
+    """
+    Write a JSON manifest of the settings a script was launched with, including the command to reproduce the run.
+    """
+    manifest = {
+        "seed": seed,
+        "profile": profile,
+        "environment": environment,
+        "preloaded_backends": preload,
+        "target": target,
+        "command": " ".join(shlex.quote(part) for part in
+                            ["python", "-m", "saatgut", "run", "--seed", str(seed), "--profile", profile, "--"] +
+                            target),
+        "cwd": os.getcwd(),
+        "python": {"version": platform.python_version(), "implementation": platform.python_implementation(),
+                   "executable": sys.executable},
+        "platform": platform.platform(),
+        "saatgut": _saatgut_version(),
+        "backends": available_backends(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    with open(path, 'w') as file:
+        json.dump(manifest, file, indent=2)
+
+
+def run(target: List[str], seed: int = 42, profile: str = "domesticate", manifest: Optional[str] = None):
+    """
+    Replace the current process with a Python script (or `-m module`) in a reproducible environment. Does not return.
+
+    Args:
+        target (List[str]): The script and its arguments, or "-m", the module and its arguments.
+        seed (int): The seed value.
+        profile (str): "seed", "domesticate" or "hard", see `launch_environment`.
+        manifest (str): The path of the JSON manifest to write, None to not write one.
+    """
+    if not target or (target[0] == "-m" and len(target) < 2):
+        raise ValueError("No script to run")
+    environment = launch_environment(seed, profile)
+    script = _script_path(target)
+    preload = sorted(scan_imports(script)) if script is not None and os.path.isfile(script) else []
+    if manifest:
+        write_manifest(manifest, seed, profile, environment, preload, target)
+
+    arguments = [sys.executable, "-m", "saatgut._bootstrap", str(seed), profile, ",".join(preload)] + target
+    sys.stdout.flush()
+    sys.stderr.flush()
+    if os.name == "nt":
+        # Windows has no real exec, a child process keeps the exit code intact
+        sys.exit(subprocess.call(arguments, env={**os.environ, **environment}))
+    os.execve(sys.executable, arguments, {**os.environ, **environment})
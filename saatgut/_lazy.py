@@ -0,0 +1,127 @@
+"""
+This module provides an import hook that seeds a library the moment it is imported for the first time.
+Used by the lazy mode of `saatgut.seed_everything` and `saatgut.domesticate_everything`, so that frameworks which the
+program never uses are never imported just to be seeded.
+"""
+import importlib.abc
+import sys
+import threading
+from typing import Callable, Dict
+
+_PENDING: Dict[str, Dict[str, Callable[[], None]]] = {}
+_LOCK = threading.RLock()
+
+
+class _SeedingLoader(importlib.abc.Loader):
+    """
+    Wraps the original loader of a module and runs the pending seeding callbacks right after the module was executed.
+    """
+    def __init__(self, loader: importlib.abc.Loader, module_name: str):
+        self._loader = loader
+        self._module_name = module_name
+
+    def __getattr__(self, item):
+        # Delegate everything else (get_resource_reader, is_package, get_code, ...) to the original loader
+        return getattr(self._loader, item)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the original loader back in place, nobody should ever see this wrapper after the import:
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+
+        self._loader.exec_module(module)
+        _run_pending(self._module_name)
+
+
+class _SeedOnImportFinder(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that only reacts to modules with pending seeding callbacks. The module itself is still found by
+    the regular finders, only its loader is wrapped.
+    """
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in _PENDING:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _SeedingLoader(spec.loader, fullname)
+        return spec
+
+
+_FINDER = _SeedOnImportFinder()
+
+
+def _run_pending(module_name: str):
+    """
+    Run (and forget) all callbacks registered for the given module.
+
+    Args:
+        module_name (str): The name of the module that was just imported.
+    """
+    with _LOCK:
+        callbacks = _PENDING.pop(module_name, {})
+        if not _PENDING and _FINDER in sys.meta_path:
+            sys.meta_path.remove(_FINDER)
+
+    for callback in callbacks.values():
+        callback()
+
+
+def defer(module_name: str, tag: str, callback: Callable[[], None]):
+    """
+    Run `callback` as soon as `module_name` is imported. If the module is already imported, the callback runs right away.
+    Registering a new callback with the same tag replaces the old one, so only the most recent seed is applied.
+
+    Args:
+        module_name (str): The name of the top-level module to wait for.
+        tag (str): Identifies the callback, e.g. "seed" or "domesticate".
+        callback (Callable): The function to call after the import. Should not raise.
+    """
+    with _LOCK:
+        if module_name not in sys.modules:
+            callbacks = _PENDING.setdefault(module_name, {})
+            callbacks.pop(tag, None)  # Re-insert to keep the order in which the callbacks were registered
+            callbacks[tag] = callback
+            if _FINDER not in sys.meta_path:
+                sys.meta_path.insert(0, _FINDER)
+            return
+
+    callback()
+
+
+def cancel(module_name: str, tag: str):
+    """
+    Forget a pending callback that was registered with `defer`. Does nothing if there is no such callback.
+
+    Args:
+        module_name (str): The name of the top-level module the callback waits for.
+        tag (str): The tag the callback was registered with.
+    """
+    with _LOCK:
+        callbacks = _PENDING.get(module_name, {})
+        callbacks.pop(tag, None)
+        if not callbacks:
+            _PENDING.pop(module_name, None)
+        if not _PENDING and _FINDER in sys.meta_path:
+            sys.meta_path.remove(_FINDER)
+
+
+def pending_modules() -> tuple:
+    """
+    Returns:
+        tuple: The names of all modules that still wait for their first import to be seeded.
+    """
+    with _LOCK:
+        return tuple(_PENDING)
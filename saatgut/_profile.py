@@ -0,0 +1,260 @@
+"""
+This module measures what each determinism setting of saatgut costs for a given workload, and which of them are
+actually needed to make it reproducible.
+"""
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from saatgut._fingerprint import fingerprint
+from saatgut._threadpools import limit_threads
+
+
+class Knob:
+    """
+    A single determinism setting. `apply` turns it on and returns a function that turns it off again.
+
+    Args:
+        name (str): The name of the setting.
+        library (str): The library the setting belongs to.
+        setting (str): How to apply the setting with saatgut.
+        apply (Callable): Turns the setting on, returns a function without arguments that restores the previous state.
+    """
+    def __init__(self, name: str, library: str, setting: str, apply: Callable[[], Callable[[], None]]):
+        self.name = name
+        self.library = library
+        self.setting = setting
+        self.apply = apply
+
+    def __repr__(self):
+        return f"Knob({self.name!r})"
+
+
+def _cudnn_benchmark_off():
+    import torch
+    previous = torch.backends.cudnn.benchmark
+    torch.backends.cudnn.benchmark = False
+    return lambda: setattr(torch.backends.cudnn, 'benchmark', previous)
+
+
+def _cudnn_deterministic():
+    import torch
+    previous = torch.backends.cudnn.deterministic
+    torch.backends.cudnn.deterministic = True
+    return lambda: setattr(torch.backends.cudnn, 'deterministic', previous)
+
+
+def _torch_deterministic_algorithms():
+    import torch
+    previous = torch.are_deterministic_algorithms_enabled(), torch.is_deterministic_algorithms_warn_only_enabled()
+    torch.use_deterministic_algorithms(True, warn_only=True)
+    return lambda: torch.use_deterministic_algorithms(previous[0], warn_only=previous[1])
+
+
+def _torch_matmul_precision():
+    import torch
+    previous = torch.backends.cuda.matmul.allow_tf32, torch.backends.cudnn.allow_tf32
+    torch.backends.cuda.matmul.allow_tf32 = False
+    torch.backends.cudnn.allow_tf32 = False
+
+    def restore():
+        torch.backends.cuda.matmul.allow_tf32, torch.backends.cudnn.allow_tf32 = previous
+    return restore
+
+
+def _torch_single_thread():
+    import torch
+    previous = torch.get_num_threads()
+    torch.set_num_threads(1)
+    return lambda: torch.set_num_threads(previous)
+
+
+def _blas_single_thread():
+    limit = limit_threads(1)
+    limit.__enter__()
+    return lambda: limit.__exit__(None, None, None)
+
+
+def _tensorflow_op_determinism():
+    # Only enabling op determinism is public API, reading and disabling it are not exported by TensorFlow
+    from tensorflow.python.framework import config
+    previous = config.is_op_determinism_enabled()
+    config.enable_op_determinism()
+
+    def restore():
+        if not previous:
+            config.disable_op_determinism()
+    return restore
+
+
+def _tensorflow_single_thread():
+    # Raises a RuntimeError once the TensorFlow runtime is initialized, the knob is then reported as unavailable
+    import tensorflow as tf
+    previous = (tf.config.threading.get_intra_op_parallelism_threads(),
+                tf.config.threading.get_inter_op_parallelism_threads())
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    def restore():
+        tf.config.threading.set_intra_op_parallelism_threads(previous[0])
+        tf.config.threading.set_inter_op_parallelism_threads(previous[1])
+    return restore
+
+
+__DETERMINISM_KNOBS__ = [
+    Knob("cudnn.benchmark", "torch", "domesticate_torch(seed)", _cudnn_benchmark_off),
+    Knob("cudnn.deterministic", "torch", "domesticate_torch(seed)", _cudnn_deterministic),
+    Knob("use_deterministic_algorithms", "torch", "domesticate_torch(seed)", _torch_deterministic_algorithms),
+    Knob("matmul_precision", "torch", "domesticate_torch(seed, force_matmul_precision=True)", _torch_matmul_precision),
+    Knob("torch_threads", "torch", "torch.set_num_threads(1)", _torch_single_thread),
+    Knob("blas_threads", "numpy", "with saatgut.limit_threads(1): ...", _blas_single_thread),
+    Knob("op_determinism", "tensorflow", "domesticate_tensorflow(seed)", _tensorflow_op_determinism),
+    Knob("tensorflow_threads", "tensorflow", "domesticate_tensorflow(seed, disable_parallelism=True)",
+         _tensorflow_single_thread),
+]
+
+
+class KnobResult:
+    """
+    The outcome of running a workload with a set of determinism settings.
+
+    Attributes:
+        knobs (tuple): The names of the settings that were turned on.
+        reproducible (bool): Whether all repeats produced bit-identical outputs.
+        seconds (float): The median wall time of a single run.
+        error (str): The error if the settings couldn't be applied or the workload failed, else None.
+    """
+    def __init__(self, knobs: tuple, reproducible: bool = False, seconds: float = float('nan'),
+                 error: Optional[str] = None):
+        self.knobs = knobs
+        self.reproducible = reproducible
+        self.seconds = seconds
+        self.error = error
+
+    def __repr__(self):
+        return (f"KnobResult(knobs={self.knobs}, reproducible={self.reproducible}, seconds={self.seconds:.6f}, "
+                f"error={self.error!r})")
+
+
+class DeterminismProfile:
+    """
+    The result of `saatgut.profile_determinism`.
+
+    Attributes:
+        baseline (KnobResult): The workload with `seed_everything` only.
+        knobs (dict): The result for each single setting, by name.
+        combinations (list): Further combinations of settings that were tried to find the recommendation.
+        recommended (tuple): The names of the cheapest found set of settings that makes the workload reproducible.
+        reproducible (bool): Whether the recommended settings make the workload reproducible.
+    """
+    def __init__(self, baseline: KnobResult, knobs: Dict[str, KnobResult], combinations: List[KnobResult],
+                 recommended: tuple, reproducible: bool):
+        self.baseline = baseline
+        self.knobs = knobs
+        self.combinations = combinations
+        self.recommended = recommended
+        self.reproducible = reproducible
+
+    @property
+    def settings(self) -> List[str]:
+        """ How to apply the recommended settings with saatgut. """
+        return list(dict.fromkeys(knob.setting for knob in __DETERMINISM_KNOBS__ if knob.name in self.recommended))
+
+    def slowdown(self, result: KnobResult) -> float:
+        """ The wall time of a result relative to the baseline. """
+        return result.seconds / self.baseline.seconds if self.baseline.seconds else float('nan')
+
+    def __str__(self):
+        lines = [f"{'setting':<30} {'reproducible':>12} {'time [ms]':>10} {'slowdown':>9}"]
+        for name, result in [("baseline", self.baseline)] + list(self.knobs.items()):
+            if result.error:
+                lines.append(f"{name:<30} {'error: ' + result.error}")
+            else:
+                lines.append(f"{name:<30} {str(result.reproducible):>12} {result.seconds * 1000:10.3f} "
+                             f"{self.slowdown(result):8.2f}x")
+        recommendation = ", ".join(self.settings) or "seed_everything(seed) is enough"
+        lines.append(f"recommended: {recommendation}" + ("" if self.reproducible else " (still not reproducible)"))
+        return "\n".join(lines)
+
+
+def _run(fn: Callable, seed: int, knobs: List[Knob], repeats: int) -> KnobResult:
+    """ Run `fn` `repeats` times with the given settings turned on, reseeding before each run. """
+    from saatgut import seed_everything
+
+    names = tuple(knob.name for knob in knobs)
+    restores = []
+    try:
+        for knob in knobs:
+            restores.append(knob.apply())
+
+        fingerprints, durations = set(), []
+        for _ in range(repeats):
+            seed_everything(seed)
+            start = time.perf_counter()
+            output = fn()
+            durations.append(time.perf_counter() - start)
+            fingerprints.add(fingerprint(output))
+        return KnobResult(names, len(fingerprints) == 1, statistics.median(durations))
+    except Exception as e:
+        return KnobResult(names, error=f"{type(e).__name__}: {e}")
+    finally:
+        for restore in reversed(restores):
+            restore()
+
+
+def profile_determinism(fn: Callable, seed: int = 42, repeats: int = 3, knobs: Optional[List[str]] = None):
+    """
+    Find out which determinism settings a workload needs, and what they cost. The workload runs `repeats` times with
+    `seed_everything(seed)` only, and then with each setting of `domesticate_torch` and `domesticate_tensorflow` on
+    its own (like `cudnn.benchmark`, deterministic algorithms, matmul precision, BLAS and framework thread counts and op
+    determinism).
+    Each run is checked for bit-identical outputs and timed. If no single setting is enough, combinations are tried.
+
+        profile = saatgut.profile_determinism(lambda: train_one_epoch(model), seed=42)
+        print(profile)
+        profile.settings  # e.g. ['domesticate_torch(seed)']
+
+    All settings are restored afterwards. Only settings of libraries that are already imported are profiled.
+
+    Args:
+        fn (Callable): The workload, called without arguments. Its return value is compared between runs.
+        seed (int): The seed value to set before each run.
+        repeats (int): How often the workload runs per setting, at least 2.
+        knobs (List[str]): The names of the settings to profile, defaults to all available ones.
+
+    Returns:
+        DeterminismProfile: The results and the recommendation.
+    """
+    if repeats < 2:
+        raise ValueError("At least two repeats are needed to check for reproducibility")
+    candidates = [knob for knob in __DETERMINISM_KNOBS__
+                  if (knobs is None or knob.name in knobs) and knob.library in sys.modules]
+
+    baseline = _run(fn, seed, [], repeats)
+    results = {knob.name: _run(fn, seed, [knob], repeats) for knob in candidates}
+    usable = [knob for knob in candidates if results[knob.name].error is None]
+    combinations = []
+
+    if baseline.reproducible:
+        return DeterminismProfile(baseline, results, combinations, (), True)
+
+    reproducible = [result for result in results.values() if result.reproducible]
+    if reproducible:
+        cheapest = min(reproducible, key=lambda result: result.seconds)
+        return DeterminismProfile(baseline, results, combinations, cheapest.knobs, True)
+
+    # No single setting is enough: start with all of them, then drop the most expensive ones while staying reproducible
+    selected = list(usable)
+    combined = _run(fn, seed, selected, repeats)
+    combinations.append(combined)
+    if not combined.reproducible:
+        return DeterminismProfile(baseline, results, combinations, combined.knobs, False)
+
+    for knob in sorted(usable, key=lambda knob: results[knob.name].seconds, reverse=True):
+        remaining = [other for other in selected if other is not knob]
+        result = _run(fn, seed, remaining, repeats)
+        combinations.append(result)
+        if result.reproducible:
+            selected = remaining
+    return DeterminismProfile(baseline, results, combinations, tuple(knob.name for knob in selected), True)
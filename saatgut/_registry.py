@@ -0,0 +1,228 @@
+"""
+This module keeps the registry of backends, the libraries that saatgut seeds. Each backend names its functions as
+"module:attribute" references, which are only imported when the function is used, so the registry costs nothing at
+import time. Other packages add their own backends with `saatgut.register_backend`, or through an entry point in the
+group "saatgut.backends", which is discovered on the first lookup.
+"""
+import importlib
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple, Union
+
+__ENTRY_POINT_GROUP__ = "saatgut.backends"
+
+Function = Union[Callable, str]
+
+
+class Backend:
+    """
+    A library that saatgut can seed. Functions are given as callables or as "module:attribute" references, which are
+    only imported the first time they are used.
+
+    Args:
+        name (str): The name of the backend, e.g. "torch".
+        seed (Callable or str): Seeds the library, takes the seed as argument `seed`.
+        domesticate (Callable or str): Seeds the library and configures it for reproducibility, like `seed`. Defaults
+            to `seed`.
+        prepare (Callable or str): Sets the environment variables of `domesticate` before the library is imported,
+            takes the seed and the `hard_mode_options`.
+        snapshot (Callable or str): Captures the state of the random number generator of the library, without
+            arguments. The state is passed to `restore`, see `saatgut.snapshot` for the types it may contain.
+        restore (Callable or str): Restores a state returned by `snapshot`.
+        module (str): The top-level module of the library, defaults to `name`.
+        distributions (tuple): The distributions that can provide the module, to look up its version.
+        hard_mode_options (dict): The keyword arguments of `domesticate` (and `prepare`) in hard mode.
+        worker (bool): If True, `saatgut.seed_worker` seeds the library in each worker.
+        thread_local (bool): If True, the library keeps a random state per thread. It is then always seeded in the
+            thread that calls `saatgut.seed_everything`, also when the other libraries are initialized in parallel.
+    """
+    def __init__(self, name: str, seed: Function, domesticate: Optional[Function] = None,
+                 prepare: Optional[Function] = None, snapshot: Optional[Function] = None,
+                 restore: Optional[Function] = None, module: Optional[str] = None, distributions: tuple = (),
+                 hard_mode_options: Optional[dict] = None, worker: bool = True, thread_local: bool = False):
+        if (snapshot is None) != (restore is None):
+            raise ValueError(f"Backend {name!r} needs both a snapshot and a restore function, or neither")
+        self.name = name
+        self.module = module or name
+        self.distributions = tuple(distributions)
+        self.hard_mode_options = hard_mode_options or {}
+        self.worker = worker
+        self.thread_local = thread_local
+        self._functions = {"seed": seed, "domesticate": domesticate or seed, "prepare": prepare,
+                           "snapshot": snapshot, "restore": restore}
+
+    def has(self, kind: str) -> bool:
+        """ Whether the backend has a function of a kind, see `Backend.function`. """
+        return self._functions[kind] is not None
+
+    def function(self, kind: str) -> Optional[Callable]:
+        """
+        Get a function of the backend, importing it on first use.
+
+        Args:
+            kind (str): "seed", "domesticate", "prepare", "snapshot" or "restore".
+
+        Returns:
+            Callable: The function, None if the backend doesn't have one of this kind.
+        """
+        function = self._functions[kind]
+        if isinstance(function, str):
+            module, _, attribute = function.partition(":")
+            function = self._functions[kind] = getattr(importlib.import_module(module), attribute)
+        return function
+
+    def __repr__(self):
+        return f"Backend({self.name!r}, module={self.module!r})"
+
+
+__BUILTIN_BACKENDS__ = (
+    Backend("torch", "saatgut._seed_torch:seed_torch", "saatgut._seed_torch:domesticate_torch",
+            snapshot="saatgut._snapshot:_capture_torch", restore="saatgut._snapshot:_restore_torch",
+            distributions=("torch",), hard_mode_options={"force_matmul_precision": True}),
+    Backend("tensorflow", "saatgut._seed_tensorflow:seed_tensorflow",
+            "saatgut._seed_tensorflow:domesticate_tensorflow",
+            prepare="saatgut._seed_tensorflow:_prepare_tensorflow",
+            snapshot="saatgut._snapshot:_capture_tensorflow", restore="saatgut._snapshot:_restore_tensorflow",
+            distributions=("tensorflow", "tensorflow-cpu", "tensorflow-gpu", "tensorflow-macos", "tensorflow-intel",
+                           "tf-nightly"),
+            hard_mode_options={"disable_parallelism": True}, worker=False),
+    Backend("numpy", "saatgut._seed_numpy:seed_numpy", "saatgut._seed_numpy:domesticate_numpy",
+            prepare="saatgut._seed_numpy:_prepare_numpy",
+            snapshot="saatgut._snapshot:_capture_numpy", restore="saatgut._snapshot:_restore_numpy",
+            distributions=("numpy",), hard_mode_options={"disable_parallelism": True}),
+    Backend("random", "saatgut._seed_random:seed_random", "saatgut._seed_random:domesticate_random",
+            prepare="saatgut._seed_random:_prepare_random", snapshot="random:getstate", restore="random:setstate",
+            hard_mode_options={"derandomize_cryptography": True}),  # Part of the standard library
+    Backend("jax", "saatgut._seed_jax:seed_jax", "saatgut._seed_jax:domesticate_jax", distributions=("jax",),
+            worker=False),
+    Backend("numba", "saatgut._seed_numba:seed_numba", "saatgut._seed_numba:domesticate_numba",
+            distributions=("numba",), thread_local=True),
+)
+
+_REGISTRY: Dict[str, Backend] = {backend.name: backend for backend in __BUILTIN_BACKENDS__}
+
+
+def _entry_points():
+    from importlib import metadata
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=__ENTRY_POINT_GROUP__)
+    return entry_points.get(__ENTRY_POINT_GROUP__, ())  # Python < 3.10
+
+
+@lru_cache(maxsize=None)
+def _load_entry_points() -> Tuple[str, ...]:
+    """
+    Register the backends of all installed entry points, once. An entry point refers to a `Backend`, or to a function
+    that returns one. Entry points that fail to load are logged and skipped.
+
+    Returns:
+        tuple: The names of the registered backends.
+    """
+    names = []
+    for entry_point in _entry_points():
+        try:
+            backend = entry_point.load()
+            if not isinstance(backend, Backend):
+                backend = backend()
+            if backend.name not in _REGISTRY:  # Built-in backends and the ones registered by hand take precedence
+                _add(backend)
+            names.append(backend.name)
+        except Exception as e:
+            from saatgut._report import logger
+            logger.error("Could not load the saatgut backend %r: %s", entry_point.name, e)
+    return tuple(names)
+
+
+def _add(backend: Backend):
+    _REGISTRY[backend.name] = backend
+    from saatgut._backends import _clear_caches
+    _clear_caches()
+
+
+def backends() -> Dict[str, Backend]:
+    """
+    Get all registered backends, including the ones of entry points.
+
+    Returns:
+        dict: The backends by name, in the order in which they were registered. Don't modify it, use
+            `saatgut.register_backend` and `saatgut.unregister_backend`.
+    """
+    _load_entry_points()
+    return _REGISTRY
+
+
+class FunctionsView(Mapping):
+    """
+    A read-only mapping from the names of all registered backends to one kind of their functions. Serves
+    `saatgut.__ALL_SEEDING_FUNCTIONS__` and `saatgut.__ALL_CULTIVATION_FUNCTIONS__`, the tables of earlier versions;
+    add backends with `saatgut.register_backend` instead of changing them.
+
+    Args:
+        kind (str): The kind of the functions, see `Backend.function`.
+    """
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __getitem__(self, name: str) -> Callable:
+        return backends()[name].function(self.kind)
+
+    def __iter__(self):
+        return iter(list(backends()))
+
+    def __len__(self) -> int:
+        return len(backends())
+
+    def __repr__(self):
+        return f"FunctionsView({self.kind!r}, backends={list(self)})"
+
+
+def register_backend(name: str, seed_fn: Function, domesticate_fn: Optional[Function] = None,
+                     snapshot_fn: Optional[Function] = None, restore_fn: Optional[Function] = None,
+                     prepare_fn: Optional[Function] = None, module: Optional[str] = None, distributions: tuple = (),
+                     hard_mode_options: Optional[dict] = None, worker: bool = True,
+                     thread_local: bool = False) -> Backend:
+    """
+    Add a library to the ones seeded by `saatgut.seed_everything`, `saatgut.domesticate_everything`,
+    `saatgut.seed_worker` and `saatgut.snapshot`. A backend with the same name is replaced.
+
+        saatgut.register_backend("simulator", "my_simulator.seeding:seed", snapshot_fn="my_simulator:get_state",
+                                 restore_fn="my_simulator:set_state")
+
+    Functions can be passed as "module:attribute" references, so that registering doesn't import anything. Like all
+    backends, it is only seeded if its module is installed. To register a backend when your package is installed,
+    declare an entry point in the group "saatgut.backends" that refers to a `saatgut.Backend`.
+
+    Args:
+        name (str): The name of the backend.
+        seed_fn (Callable or str): Seeds the library, takes the seed as argument `seed`.
+        domesticate_fn (Callable or str): Seeds and configures the library for reproducibility, defaults to `seed_fn`.
+        snapshot_fn (Callable or str): Captures the state of the random number generator, without arguments.
+        restore_fn (Callable or str): Restores a state returned by `snapshot_fn`.
+        prepare_fn (Callable or str): Sets environment variables before the library is imported.
+        module (str): The top-level module of the library, defaults to `name`.
+        distributions (tuple): The distributions that can provide the module, to look up its version.
+        hard_mode_options (dict): The keyword arguments of `domesticate_fn` in hard mode.
+        worker (bool): If True, `saatgut.seed_worker` seeds the library in each worker.
+        thread_local (bool): If True, the library is always seeded in the calling thread, see `saatgut.Backend`.
+
+    Returns:
+        Backend: The registered backend.
+    """
+    backend = Backend(name, seed_fn, domesticate_fn, prepare=prepare_fn, snapshot=snapshot_fn, restore=restore_fn,
+                      module=module, distributions=distributions, hard_mode_options=hard_mode_options, worker=worker,
+                      thread_local=thread_local)
+    _add(backend)
+    return backend
+
+
+def unregister_backend(name: str):
+    """
+    Stop seeding a library, e.g. one that saatgut supports out of the box. Does nothing if there is no such backend.
+
+    Args:
+        name (str): The name of the backend.
+    """
+    if backends().pop(name, None) is not None:
+        from saatgut._backends import _clear_caches
+        _clear_caches()
@@ -0,0 +1,205 @@
+"""
+This module instruments seeding. Diagnostics go to the `saatgut` logger, every step is passed to the registered hooks as
+an event, and each call of `saatgut.seed_everything` or `saatgut.domesticate_everything` produces a report with the
+time and outcome per backend, which can be exported as JSON (e.g. for telemetry).
+"""
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("saatgut")
+
+_HOOKS: List[Callable[[dict], None]] = []
+
+
+def add_hook(hook: Callable[[dict], None]):
+    """
+    Call a function for every seeding event, e.g. to forward it to telemetry. Each event is a dict with at least the
+    keys "event" ("start", "seeded", "failed", "deferred", "not installed" or "finish") and "time" (a UNIX timestamp),
+    and depending on the event "function", "seed", "backend", "settings", "import_seconds", "seeding_seconds" and
+    "error". Exceptions raised by hooks are logged and otherwise ignored.
+
+    Args:
+        hook (Callable): A function that takes the event.
+    """
+    _HOOKS.append(hook)
+
+
+def remove_hook(hook: Callable[[dict], None]):
+    """
+    Stop calling a function that was added with `saatgut.add_hook`.
+
+    Args:
+        hook (Callable): The function.
+    """
+    _HOOKS.remove(hook)
+
+
+def emit(event: str, **fields):
+    """ Pass an event to all hooks. """
+    if not _HOOKS:
+        return
+    data = {"event": event, "time": time.time(), **fields}
+    for hook in list(_HOOKS):
+        try:
+            hook(data)
+        except Exception:
+            logger.exception("Hook %r failed", hook)
+
+
+class BackendReport:
+    """
+    What happened to a single backend.
+
+    Attributes:
+        backend (str): The name of the backend.
+        status (str): "seeded", "failed", "deferred" (seeded on its first import) or "not installed".
+        settings (dict): The seeding function and the parameters it was called with.
+        import_seconds (float): The time it took to import the backend, None if it wasn't imported by saatgut.
+        seeding_seconds (float): The time the seeding function took, None if it didn't run yet.
+        thread (str): The name of the thread that seeded the backend.
+        error (str): The error if seeding failed, else None.
+    """
+    def __init__(self, backend: str, status: str = "deferred", settings: Optional[dict] = None):
+        self.backend = backend
+        self.status = status
+        self.settings = settings or {}
+        self.import_seconds: Optional[float] = None
+        self.seeding_seconds: Optional[float] = None
+        self.thread: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {"backend": self.backend, "status": self.status, "settings": self.settings,
+                "import_seconds": self.import_seconds, "seeding_seconds": self.seeding_seconds,
+                "thread": self.thread, "error": self.error}
+
+    def __repr__(self):
+        return f"BackendReport({self.backend!r}, status={self.status!r})"
+
+
+class SeedingReport:
+    """
+    The report of a call of `saatgut.seed_everything` or `saatgut.domesticate_everything`, see `saatgut.report`.
+
+    Attributes:
+        function (str): The name of the function that was called.
+        seed (int): The seed value.
+        options (dict): The other parameters of the call, like `hard_mode`.
+        started (float): When the call started, as a UNIX timestamp.
+        seconds (float): The wall time of the call, None while it is running.
+        backends (dict): A `BackendReport` per backend, by name.
+    """
+    def __init__(self, function: Optional[str] = None, seed: Optional[int] = None, **options):
+        self.function = function
+        self.seed = seed
+        self.options = options
+        self.started = time.time()
+        self.seconds: Optional[float] = None
+        self.backends: Dict[str, BackendReport] = {}
+        self._start = time.perf_counter()
+
+    def skip(self, backend: str):
+        """ Record that a backend is not installed. """
+        self.backends[backend] = BackendReport(backend, "not installed")
+        logger.debug("Skipped %s, it is not installed", backend)
+        emit("not installed", function=self.function, seed=self.seed, backend=backend)
+
+    def track(self, backend: str, planter: Callable[[], None], settings: Optional[dict] = None) -> Callable[[], None]:
+        """
+        Wrap the seeding function of a backend, to record its time and outcome when it runs. Errors are logged instead
+        of raised, so that seeding never terminates the program.
+
+        Args:
+            backend (str): The name of the backend.
+            planter (Callable): The seeding function, without arguments.
+            settings (dict): The seeding function and its parameters, for the report.
+
+        Returns:
+            Callable: The wrapped function.
+        """
+        entry = self.backends[backend] = BackendReport(backend, "deferred", settings)
+
+        def run():
+            start = time.perf_counter()
+            try:
+                planter()
+                entry.status = "seeded"
+            except Exception as e:
+                entry.status = "failed"
+                entry.error = f"{type(e).__name__}: {e}"
+                logger.error("An error occurred while seeding %s: %s", backend, e)
+            entry.seeding_seconds = time.perf_counter() - start
+            entry.thread = threading.current_thread().name
+            logger.debug("%s %s in %.2f ms", entry.status.capitalize(), backend, entry.seeding_seconds * 1000)
+            emit(entry.status, function=self.function, seed=self.seed, backend=backend, settings=entry.settings,
+                 import_seconds=entry.import_seconds, seeding_seconds=entry.seeding_seconds, error=entry.error)
+        return run
+
+    def defer(self, backend: str):
+        """ Record that a backend will be seeded on its first import. """
+        logger.debug("Deferred %s until its first import", backend)
+        emit("deferred", function=self.function, seed=self.seed, backend=backend,
+             settings=self.backends[backend].settings)
+
+    def finish(self):
+        """ Record the end of the call. """
+        self.seconds = time.perf_counter() - self._start
+        failed = [backend for backend, entry in self.backends.items() if entry.status == "failed"]
+        logger.info("%s(%s) took %.1f ms%s", self.function, self.seed, self.seconds * 1000,
+                    f", failed: {', '.join(failed)}" if failed else "")
+        emit("finish", function=self.function, seed=self.seed, seconds=self.seconds, failed=failed)
+
+    def to_dict(self) -> dict:
+        return {"function": self.function, "seed": self.seed, "options": self.options, "started": self.started,
+                "seconds": self.seconds, "backends": {name: entry.to_dict() for name, entry in self.backends.items()}}
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Args:
+            **kwargs: Passed on to `json.dumps`, like `indent=2`.
+
+        Returns:
+            str: The report as JSON.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __str__(self):
+        def milliseconds(seconds):
+            return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+        lines = [f"{self.function}(seed={self.seed}) took {milliseconds(self.seconds)} ms",
+                 f"{'backend':<12} {'status':<14} {'import [ms]':>11} {'seeding [ms]':>12}"]
+        for name, entry in self.backends.items():
+            lines.append(f"{name:<12} {entry.status:<14} {milliseconds(entry.import_seconds):>11} "
+                         f"{milliseconds(entry.seeding_seconds):>12}" + (f"  {entry.error}" if entry.error else ""))
+        return "\n".join(lines)
+
+
+_LATEST = SeedingReport()
+
+
+def start_report(function: str, seed: int, **options) -> SeedingReport:
+    """ Start the report of a new call, it becomes the one returned by `saatgut.report`. """
+    global _LATEST
+    _LATEST = SeedingReport(function, seed, **options)
+    emit("start", function=function, seed=seed, options=options)
+    return _LATEST
+
+
+def report() -> SeedingReport:
+    """
+    Get the report of the latest call of `saatgut.seed_everything` or `saatgut.domesticate_everything`: how long each
+    backend took to import and to seed, which settings were applied, which backends were skipped and which failed.
+    Backends that are seeded lazily are updated once they are imported.
+
+        saatgut.domesticate_everything(42)
+        print(saatgut.report())
+        telemetry.send(saatgut.report().to_json())
+
+    Returns:
+        SeedingReport: The report.
+    """
+    return _LATEST
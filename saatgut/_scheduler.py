@@ -0,0 +1,93 @@
+"""
+This module initializes several backends at once. Importing a framework mostly means loading native libraries and
+reading files, which releases the GIL, so the imports of independent backends run concurrently in a thread pool.
+Ordering constraints are kept: environment variables are set before any import, and backends that configure thread
+pools of native libraries wait until the libraries of the other backends are loaded.
+"""
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from saatgut._report import SeedingReport, report
+
+# Backends whose configuration has to wait for the imports of other backends. NumPy limits the threads of all loaded
+# BLAS and OpenMP libraries, including the ones PyTorch, TensorFlow and JAX bring along.
+__CONFIGURE_AFTER__ = {
+    "numpy": ("torch", "tensorflow", "jax"),
+}
+
+
+def initialization_timings() -> Dict[str, dict]:
+    """
+    Show where the time of the latest call to `saatgut.seed_everything` or `saatgut.domesticate_everything` went.
+    See `saatgut.report` for the full report.
+
+    Returns:
+        dict: For each backend, the seconds spent in its "import" and in its "configure" step (seeding and settings),
+            and the "thread" that ran it.
+    """
+    return {backend: {"import": entry.import_seconds, "configure": entry.seeding_seconds, "thread": entry.thread}
+            for backend, entry in report().backends.items() if entry.import_seconds is not None}
+
+
+def initialize(planters: Dict[str, Callable[[], None]], prepares: Optional[Dict[str, Callable[[], None]]] = None,
+               parallel: bool = True, seeding_report: Optional[SeedingReport] = None,
+               modules: Optional[Dict[str, str]] = None, thread_local: Iterable[str] = ()):
+    """
+    Run the planters of several backends. All `prepares` (which only set environment variables) run first. Then each
+    backend is imported and its planter is called. If `parallel` is True and at least two backends still have to be
+    imported, the backends are initialized concurrently in a thread pool. The planters then run in the threads of the
+    pool, except for the `thread_local` backends, whose planters run in the calling thread after the pool finished.
+
+    Args:
+        planters (dict): Functions without arguments that seed or configure each backend, by backend name. They
+            must not raise, see `SeedingReport.track`.
+        prepares (dict): Functions without arguments that have to run before the backends are imported, by name.
+        parallel (bool): If False, all backends are initialized one after the other in the calling thread.
+        seeding_report (SeedingReport): Where to record the import times, defaults to the latest report.
+        modules (dict): The module to import for each backend, if it isn't named like the backend.
+        thread_local (Iterable[str]): The backends with a random state per thread, see `saatgut.Backend`.
+    """
+    for prepare in (prepares or {}).values():
+        prepare()
+
+    seeding_report = seeding_report or report()
+    thread_local = set(thread_local)
+    imported = {backend: threading.Event() for backend in planters}
+    modules = {backend: (modules or {}).get(backend, backend) for backend in planters}
+
+    def initialize_backend(backend: str, plant: bool = True):
+        start = time.perf_counter()
+        try:
+            importlib.import_module(modules[backend])
+        except Exception:
+            pass  # The planter reports the error
+        finally:
+            imported[backend].set()
+        if backend in seeding_report.backends:
+            seeding_report.backends[backend].import_seconds = time.perf_counter() - start
+
+        for dependency in __CONFIGURE_AFTER__.get(backend, ()):
+            if dependency in imported:
+                imported[dependency].wait()
+        if plant:
+            planters[backend]()
+
+    cold = [backend for backend in planters if modules[backend] not in sys.modules]
+    if parallel and len(cold) >= 2:
+        from concurrent.futures import ThreadPoolExecutor
+
+        thread_local = [backend for backend in planters if backend in thread_local]
+        with ThreadPoolExecutor(max_workers=len(planters), thread_name_prefix="saatgut") as pool:
+            # Thread-local backends are only imported in the pool
+            for future in [pool.submit(initialize_backend, backend, backend not in thread_local)
+                           for backend in planters]:
+                future.result()
+        for backend in thread_local:
+            planters[backend]()
+    else:
+        # Backends that configure after others run last, so waiting for them can't block the calling thread
+        for backend in sorted(planters, key=lambda backend: backend in __CONFIGURE_AFTER__):
+            initialize_backend(backend)
@@ -1,14 +1,17 @@
 """
 This module provides a decorator function that securely checks if a certain necessary library is installed before importing it.
 """
-import importlib
 from functools import wraps
 from typing import Callable, TypeVar
+
+from saatgut._backends import is_installed
+from saatgut._report import logger
 T = TypeVar('T', bound=Callable)
 
 def secure_import(module_name: str) -> Callable[[T], T]:
     """
     Decorator to securely import a module, ensuring it is installed before proceeding.
+    The check doesn't import the module, the wrapped function is responsible for that.
 
     Args:
         module_name (str): The name of the module to import.
@@ -20,15 +23,32 @@ def secure_import(module_name: str) -> Callable[[T], T]:
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
-                importlib.import_module(module_name)
+                if not is_installed(module_name):
+                    raise ImportError(module_name)
                 return func(*args, **kwargs)
             except ImportError as e:
-                print(f"Module '{module_name}' is not installed!")
+                logger.warning("Module '%s' is not installed!", module_name)
                 return None
+        wrapper._unchecked = func
         return wrapper
     return decorator
 
 
+def _unchecked(func: T) -> T:
+    """
+    Get a function decorated with `secure_import` without the check. Any other function is returned as it is, also one
+    whose decorator copied the attributes of a `secure_import` wrapper with `functools.wraps`.
+
+    Args:
+        func (Callable): The function.
+
+    Returns:
+        Callable: The function without the check.
+    """
+    unchecked = getattr(func, '_unchecked', None)
+    return unchecked if unchecked is not None and unchecked is getattr(func, '__wrapped__', None) else func
+
+
 def _silent_secure_import(module_name: str, func: T) -> T:
     """
     Decorator to silently import a module, ensuring it is installed before proceeding.
@@ -42,10 +62,8 @@ def _silent_secure_import(module_name: str, func: T) -> T:
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            importlib.import_module(module_name)
-        except ImportError:
-            return lambda seed: None  # Return a no-op function if the module is not available
+        if not is_installed(module_name):
+            return None  # Do nothing if the module is not available
         return func(*args, **kwargs)
     return wrapper
 
@@ -65,6 +83,6 @@ def _exception_catcher(package_name: str, func: T) -> T:
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            print(f"An error occurred while seeding {package_name}: {e}")
+            logger.error("An error occurred while seeding %s: %s", package_name, e)
             return None
     return wrapper
@@ -1,13 +1,190 @@
+"""
+This module seeds JAX. JAX has no global random state: every random function takes an explicit key. `seed_jax` stores a
+root key in a `KeyManager`, which hands out subkeys by name or from a counter (see `saatgut.jax_keys`).
+"""
+from typing import Optional
+
 from saatgut._secure_import import secure_import
+from saatgut._seed_sequence import derive_seed
+from saatgut._streams import Key, _key_to_int
+
+# The key manager of the latest call of `seed_jax`
+_KEY_MANAGER = None
+
+# Named keys and counter keys are folded in below different branches of the root key, so they never collide
+_NAMED_BRANCH = 0
+_COUNTER_BRANCH = 1
+
+
+class KeyManager:
+    """
+    Holds a root key of JAX and hands out subkeys, so that code doesn't have to pass keys around and split them by hand:
+
+        keys = saatgut.jax_keys()
+        params = init(keys.key("init"), x)          # The same key for the same name, independent of the call order
+        noise = jax.random.normal(next(keys), (3,))  # A new key on every call
+
+    Counter keys are split from the root key in batches of `batch_size` with a single `jax.random.split`, and copied to
+    the host once per batch, so handing out a key doesn't dispatch any work to the device.
+
+    Args:
+        seed (int): The seed of the root key.
+        batch_size (int): How many counter keys are split at once.
+    """
+    def __init__(self, seed: int = 42, batch_size: int = 1024):
+        import jax
+
+        self.seed = seed
+        self.batch_size = batch_size
+        self.root = jax.random.PRNGKey(seed)
+        self._named = {}
+        self._batch = None
+        self._position = batch_size
+        self._splits = 0
+
+    def key(self, name: Key):
+        """
+        Args:
+            name (int, str or bytes): The name of the key, e.g. "dropout".
+
+        Returns:
+            jax.Array: The key of this name. Always the same key for the same seed and name.
+        """
+        if name not in self._named:
+            import jax
+            branch = jax.random.fold_in(self.root, _NAMED_BRANCH)
+            self._named[name] = jax.random.fold_in(branch, derive_seed(self.seed, _key_to_int(name)))
+        return self._named[name]
+
+    def _next_batch(self, n: int):
+        """ Split the next `n` counter keys from the root key, on the device. """
+        import jax
+        branch = jax.random.fold_in(jax.random.fold_in(self.root, _COUNTER_BRANCH), self._splits)
+        self._splits += 1
+        return jax.random.split(branch, n)
+
+    def __next__(self):
+        """
+        Returns:
+            numpy.ndarray: The next counter key, as raw key data that all `jax.random` functions accept.
+        """
+        if self._position >= self.batch_size:
+            import numpy as np
+            self._batch = np.asarray(self._next_batch(self.batch_size))  # One transfer per batch
+            self._position = 0
+        key = self._batch[self._position]
+        self._position += 1
+        return key
+
+    def __iter__(self):
+        return self
+
+    def split(self, n: int):
+        """
+        Get `n` new keys at once, e.g. one per example of a batch for `jax.vmap`:
+
+            keys = saatgut.jax_keys().split(len(batch))
+            augmented = jax.vmap(augment)(keys, batch)
+
+        Args:
+            n (int): The number of keys.
+
+        Returns:
+            jax.Array: The keys, stacked along the first axis. They stay on the device.
+        """
+        return self._next_batch(n)
+
+    def step_key(self, step, name: Optional[Key] = None):
+        """
+        The key of a training step, see `saatgut.step_key`. Can be called inside `jax.jit` with a traced step.
+
+        Args:
+            step (int or jax.Array): The step.
+            name (int, str or bytes): Derive the key from the named key instead of the root key.
+
+        Returns:
+            jax.Array: The key.
+        """
+        return step_key(self.root if name is None else self.key(name), step)
+
+    def __repr__(self):
+        return f"KeyManager(seed={self.seed})"
 
 
 @secure_import("jax")
-def seed_jax(seed: int):
+def step_key(key, step):
+    """
+    Derive the key of a step from a base key with `jax.random.fold_in`. Unlike splitting the key in every step on the
+    host, this is a pure function of the step, so it works inside `jax.jit`, `jax.vmap` and `jax.pmap`, and a resumed
+    run gets the same keys:
+
+        @jax.jit
+        def train_step(params, batch, step):
+            dropout_key = saatgut.step_key(base_key, step)
+
+    Args:
+        key (jax.Array): The base key.
+        step (int or jax.Array): The step, a non-negative integer below 2**32.
+
+    Returns:
+        jax.Array: The key of the step.
+    """
+    import jax
+    return jax.random.fold_in(key, step)
+
+
+@secure_import("jax")
+def device_key(key, axis_name: str):
+    """
+    Give each device its own key inside `jax.pmap` (or `shard_map`), by folding in the index along the mapped axis:
+
+        @functools.partial(jax.pmap, axis_name="devices")
+        def train_step(params, batch, key):
+            key = saatgut.device_key(key, "devices")
+
+    Args:
+        key (jax.Array): The key that is the same on all devices.
+        axis_name (str): The name of the mapped axis.
+
+    Returns:
+        jax.Array: A key that is different on every device.
+    """
     import jax
-    return jax.random.PRNGKey(seed)
+    return jax.random.fold_in(key, jax.lax.axis_index(axis_name))
+
+
+@secure_import("jax")
+def seed_jax(seed: int):
+    """
+    Create the root key of JAX from a seed, and store it in the key manager returned by `saatgut.jax_keys`.
+
+    Args:
+        seed (int): The seed value to set.
+
+    Returns:
+        jax.Array: The root key.
+    """
+    global _KEY_MANAGER
+    _KEY_MANAGER = KeyManager(seed)
+    return _KEY_MANAGER.root
 
 
 @secure_import("jax")
 def domesticate_jax(seed: int):
     import jax
     return seed_jax(seed)
+
+
+@secure_import("jax")
+def jax_keys() -> KeyManager:
+    """
+    Get the key manager of JAX, created by the latest call of `saatgut.seed_jax` (or `seed_everything`, etc.), or with
+    the seed 42 if JAX was never seeded.
+
+    Returns:
+        KeyManager: The key manager.
+    """
+    global _KEY_MANAGER
+    if _KEY_MANAGER is None:
+        _KEY_MANAGER = KeyManager()
+    return _KEY_MANAGER
@@ -0,0 +1,101 @@
+"""
+This module seeds Numba. Code compiled with `numba.njit` doesn't use NumPy's random state: every thread has its own
+internal state, which can only be seeded from compiled code running in that thread. saatgut compiles two small
+helpers: one seeds the calling thread, the other runs a `prange` loop that seeds every thread of Numba's thread pool
+with its own seed, so parallel kernels stay reproducible without giving up `parallel=True`.
+"""
+from saatgut._report import logger
+from saatgut._secure_import import secure_import
+from saatgut._seed_sequence import spawn_seeds
+
+# The compiled helpers, compiled on first use since compiling takes a moment
+_SEEDERS = None
+
+# The threading layers don't promise that every thread runs an iteration of a `prange` loop. The loop gets many
+# iterations per thread, and is repeated until every thread has seeded itself.
+_ITERATIONS_PER_THREAD = 64
+_ATTEMPTS = 10
+
+
+def _compile_seeders():
+    global _SEEDERS
+    if _SEEDERS is None:
+        import numba
+        import numpy as np
+
+        @numba.njit
+        def seed_current_thread(seed):
+            np.random.seed(seed)
+
+        @numba.njit(parallel=True)
+        def seed_all_threads(seeds, seeded):
+            # Every thread seeds itself with the seed of its id, no matter which or how many iterations it runs
+            for _ in numba.prange(len(seeds) * _ITERATIONS_PER_THREAD):
+                thread = numba.get_thread_id()
+                np.random.seed(seeds[thread])
+                seeded[thread] = True
+
+        _SEEDERS = seed_current_thread, seed_all_threads
+    return _SEEDERS
+
+
+def _seed_thread_pool(seed: int) -> bool:
+    """
+    Seed every thread of Numba's thread pool with a seed derived from `seed` and its thread id.
+
+    Returns:
+        bool: Whether every thread was seeded.
+    """
+    import numba
+    import numpy as np
+
+    _, seed_all_threads = _compile_seeders()
+    threads = numba.get_num_threads()
+    maximum = numba.config.NUMBA_NUM_THREADS
+    seeds = np.array(spawn_seeds(seed, maximum), dtype=np.uint32)
+    seeded = np.zeros(maximum, dtype=np.bool_)
+    numba.set_num_threads(maximum)  # Seed all threads, also the ones that are only used after set_num_threads
+    try:
+        for _ in range(_ATTEMPTS):
+            seed_all_threads(seeds, seeded)  # Seeding a thread again doesn't change its state
+            if seeded.all():
+                return True
+    finally:
+        numba.set_num_threads(threads)
+    return False
+
+
+@secure_import('numba')
+def seed_numba(seed: int):
+    """
+    Set the random seed of Numba's compiled code: the calling thread gets `seed` (like `np.random.seed` in compiled
+    code), and each thread of Numba's thread pool a seed derived from `seed` and its thread id.
+
+    A parallel kernel is then reproducible as long as it runs with the same number of threads, since `prange` splits
+    the iterations between the threads in a fixed way:
+
+        @numba.njit(parallel=True)
+        def noisy(x):
+            for i in numba.prange(len(x)):
+                x[i] += np.random.normal()
+
+    For results that don't depend on the number of threads either, seed each iteration from `saatgut.seeds_for`.
+
+    Args:
+        seed (int): The seed value to set.
+    """
+    if not _seed_thread_pool(seed):
+        logger.warning("Could not seed every thread of Numba's thread pool, parallel kernels may not be reproducible")
+    seed_current_thread, _ = _compile_seeders()
+    seed_current_thread(seed)
+
+
+@secure_import('numba')
+def domesticate_numba(seed: int):
+    """
+    Like `saatgut.seed_numba`, Numba has no further settings for reproducibility.
+
+    Args:
+        seed (int): The seed value to set.
+    """
+    seed_numba(seed)
@@ -1,39 +1,53 @@
 import os
 
+from saatgut._generators import _reseed_registry
 from saatgut._secure_import import secure_import
+from saatgut._threadpools import set_threads
 
 
 @secure_import('numpy')
 def seed_numpy(seed: int):
     """
-    Set the random seed for NumPy's RNG.
+    Set the random seed for NumPy's RNG, and reseed the named generators of `saatgut.numpy_generators`.
 
     Args:
         seed (int): The seed value to set.
     """
     import numpy as np
     np.random.seed(seed)
+    _reseed_registry(seed)
+
+
+def _prepare_numpy(seed: int, disable_parallelism: bool = False):
+    """
+    Set the environment variables of `saatgut.domesticate_numpy`, without importing NumPy.
+    """
+    os.environ['PYTHONHASHSEED'] = str(seed)  # Sometimes relevant for hashing
+
+    if disable_parallelism:
+        # The environment variables only work if they are set before the libraries are loaded:
+        os.environ['OMP_NUM_THREADS'] = '1'  # OpenMP
+        os.environ['MKL_NUM_THREADS'] = '1'  # Intel MKL
+        os.environ['NUMEXPR_NUM_THREADS'] = '1'  # NumExpr
+        os.environ['OPENBLAS_NUM_THREADS'] = '1'  # OpenBLAS
 
 
 @secure_import('numpy')
-def domesticate_numpy(seed: int):
+def domesticate_numpy(seed: int, disable_parallelism: bool = False):
     """
     Set NumPy's seed and enforce as much determinism as possible.
 
+    Multithreaded BLAS reductions may sum in a different order in every run. `disable_parallelism=True` limits
+    BLAS and OpenMP to a single thread for the rest of the program, which can be a lot slower. To pay for this only
+    where it matters, use `with saatgut.limit_threads(1):` around the sensitive sections instead.
+
     Args:
         seed (int): The seed value to set.
+        disable_parallelism (bool): If True, limits BLAS and OpenMP libraries to a single thread.
     """
-    # Try to minimize sources of nondeterminism from underlying libraries (before importing NumPy)
-    # Set environment variables to control thread usage
-    os.environ['PYTHONHASHSEED'] = str(seed)  # Sometimes relevant for hashing
-    os.environ['OMP_NUM_THREADS'] = '1'  # OpenMP
-    os.environ['MKL_NUM_THREADS'] = '1'  # Intel MKL
-    os.environ['NUMEXPR_NUM_THREADS'] = '1'  # NumExpr
-    os.environ['OPENBLAS_NUM_THREADS'] = '1'  # OpenBLAS
-
-    import numpy as np
+    _prepare_numpy(seed, disable_parallelism)
     seed_numpy(seed)
 
-    if hasattr(np.random, 'set_state'):
-        # If available, set the state of the random number generator
-        np.random.set_state(np.random.get_state())
+    if disable_parallelism:
+        # ... for libraries that are already loaded, set the number of threads at runtime:
+        set_threads(1)
@@ -1,5 +1,11 @@
 import os
 
+from saatgut._entropy import DeterministicEntropy
+from saatgut._report import logger
+
+# The entropy installed by `domesticate_random`, replaced when it is called again
+_domesticated_entropy = None
+
 
 def seed_random(seed: int):
     """
@@ -12,6 +18,18 @@ def seed_random(seed: int):
     random.seed(seed)
 
 
+def _prepare_random(seed: int, derandomize_cryptography: bool = False):
+    """
+    Set the environment variables of `saatgut.domesticate_random`.
+    """
+    # PYTHONHASHSEED affects hash() and related functions, relevant if hash randomization is used
+    os.environ['PYTHONHASHSEED'] = str(seed)
+    # Note: Setting PYTHONHASHSEED has effect only if set before the Python interpreter starts.
+    # Here, we set it for consistency, but to actually affect hashing you must launch Python with:
+    #   PYTHONHASHSEED=42 python myscript.py
+    # or with: python -m saatgut run --seed 42 -- myscript.py
+
+
 def domesticate_random(seed: int, derandomize_cryptography: bool = False):
     """
     Set the seed for Python's random module and enforce maximum determinism.
@@ -19,24 +37,20 @@ def domesticate_random(seed: int, derandomize_cryptography: bool = False):
 
     Args:
         seed (int): The seed value to set.
+        derandomize_cryptography (bool): If True, replaces the entropy of the operating system (`os.urandom`,
+            `random.SystemRandom`, `secrets`, `uuid.uuid4`) with a deterministic stream. Never use in production!
     """
-    # PYTHONHASHSEED affects hash() and related functions, relevant if hash randomization is used
-    os.environ['PYTHONHASHSEED'] = str(seed)
-    # Note: Setting PYTHONHASHSEED has effect only if set before the Python interpreter starts.
-    # Here, we set it for consistency, but to actually affect hashing you must launch Python with:
-    #   PYTHONHASHSEED=42 python myscript.py
+    global _domesticated_entropy
 
-    import random
+    _prepare_random(seed)
     seed_random(seed)
 
     if derandomize_cryptography:
         # Cryptographic functions often relay on random entropy from the OS. We stop this here.
         # NEVER USE IN PRODUCTION, THIS IS FOR TESTING PURPOSES ONLY!
-        print("[saatgut] WARNING: Derandomizing OS entropy! "
-              "This makes cryptographic functions insecure and should only be used for testing purposes.")
-        class FakeRandom(random.Random):
-            def randbytes(self, n):
-                return bytes([self.randint(0, 255) for _ in range(n)])
-
-        fake = FakeRandom(seed)
-        os.urandom = lambda n: fake.randbytes(n)
+        logger.warning("Derandomizing OS entropy! "
+                       "This makes cryptographic functions insecure and should only be used for testing purposes.")
+        if _domesticated_entropy is not None:
+            _domesticated_entropy.uninstall()
+        _domesticated_entropy = DeterministicEntropy(seed)
+        _domesticated_entropy.install()
@@ -0,0 +1,116 @@
+"""
+This module derives child seeds from a root seed, the same way `numpy.random.SeedSequence` spawns children.
+It is implemented in pure Python, so it gives the same seeds whether NumPy is installed or not:
+    derive_seed(seed, 3) == numpy.random.SeedSequence(seed, spawn_key=(3,)).generate_state(1)[0]
+"""
+from itertools import cycle
+from typing import List
+
+_MASK32 = 0xFFFFFFFF
+_POOL_SIZE = 4
+_INIT_A = 0x43b0d7e5
+_MULT_A = 0x931e8875
+_INIT_B = 0x8b51f9dd
+_MULT_B = 0x58f38ded
+_MIX_MULT_L = 0xca01f9dd
+_MIX_MULT_R = 0x4973f715
+_XSHIFT = 16
+
+
+def _to_words(value: int) -> List[int]:
+    """ Split a non-negative integer into 32-bit words, least significant first. """
+    if value < 0:
+        raise ValueError(f"Seeds and keys must be non-negative, got {value}")
+    words = [value & _MASK32]
+    value >>= 32
+    while value:
+        words.append(value & _MASK32)
+        value >>= 32
+    return words
+
+
+def _mix(x: int, y: int) -> int:
+    result = (_MIX_MULT_L * x - _MIX_MULT_R * y) & _MASK32
+    return result ^ (result >> _XSHIFT)
+
+
+def _pool(seed: int, key: tuple) -> List[int]:
+    """ Mix the seed and the spawn key into the entropy pool, like `SeedSequence.mix_entropy`. """
+    entropy = _to_words(seed)
+    spawn_words = [word for part in key for word in _to_words(part)]
+    if spawn_words and len(entropy) < _POOL_SIZE:
+        entropy += [0] * (_POOL_SIZE - len(entropy))  # Avoid collisions between seeds and spawn keys
+    entropy += spawn_words
+
+    hash_const = _INIT_A
+
+    def hashmix(value: int) -> int:
+        nonlocal hash_const
+        value ^= hash_const
+        hash_const = (hash_const * _MULT_A) & _MASK32
+        value = (value * hash_const) & _MASK32
+        return value ^ (value >> _XSHIFT)
+
+    pool = [hashmix(entropy[i] if i < len(entropy) else 0) for i in range(_POOL_SIZE)]
+    for i_src in range(_POOL_SIZE):
+        for i_dst in range(_POOL_SIZE):
+            if i_src != i_dst:
+                pool[i_dst] = _mix(pool[i_dst], hashmix(pool[i_src]))
+    for i_src in range(_POOL_SIZE, len(entropy)):
+        for i_dst in range(_POOL_SIZE):
+            pool[i_dst] = _mix(pool[i_dst], hashmix(entropy[i_src]))
+    return pool
+
+
+def generate_state(seed: int, key: tuple, n_words: int) -> List[int]:
+    """
+    Generate 32-bit words of state for the child `key` of `seed`, like `SeedSequence.generate_state`.
+
+    Args:
+        seed (int): The root seed.
+        key (tuple): The spawn key of the child, a tuple of non-negative integers.
+        n_words (int): The number of 32-bit words to generate.
+
+    Returns:
+        list: The generated words.
+    """
+    hash_const = _INIT_B
+    state = []
+    for value, _ in zip(cycle(_pool(seed, key)), range(n_words)):
+        value ^= hash_const
+        hash_const = (hash_const * _MULT_B) & _MASK32
+        value = (value * hash_const) & _MASK32
+        state.append(value ^ (value >> _XSHIFT))
+    return state
+
+
+def derive_seed(seed: int, *key: int) -> int:
+    """
+    Derive a statistically independent child seed from a root seed and a key, e.g. a worker id or a task index.
+    The same seed and key always give the same child seed, on every machine and in every process.
+    The result fits into 32 bits, so it can be used to seed every supported library.
+
+    Args:
+        seed (int): The root seed.
+        *key (int): Non-negative integers that identify the child, e.g. `derive_seed(42, epoch, worker_id)`.
+
+    Returns:
+        int: The child seed.
+    """
+    return generate_state(seed, key, 1)[0]
+
+
+def spawn_seeds(seed: int, n: int, *key: int) -> List[int]:
+    """
+    Derive `n` independent child seeds, one for each of `n` workers or shards.
+    `spawn_seeds(seed, n)[i] == derive_seed(seed, i)`, so adding more workers doesn't change the seeds of the others.
+
+    Args:
+        seed (int): The root seed.
+        n (int): The number of children.
+        *key (int): Optional key prefix of the children, e.g. the epoch.
+
+    Returns:
+        list: The child seeds.
+    """
+    return [derive_seed(seed, *key, i) for i in range(n)]
@@ -14,6 +14,18 @@ def seed_tensorflow(seed: int):
     tf.random.set_seed(seed)
 
 
+def _prepare_tensorflow(seed: int = 42, disable_parallelism: bool = False):
+    """
+    Set the environment variables of `saatgut.domesticate_tensorflow`, they need to be set before TensorFlow is
+    imported.
+    """
+    # For recent TensorFlow versions (>=2.1), set environmental variables and options
+    import os
+    os.environ['PYTHONHASHSEED'] = str(seed)
+    os.environ['TF_DETERMINISTIC_OPS'] = '1'  # TensorFlow >=2.1
+    os.environ['TF_CUDNN_DETERMINISTIC'] = '1'  # TensorFlow >=2.1
+
+
 @secure_import('tensorflow')
 def domesticate_tensorflow(seed: int = 42, disable_parallelism: bool = False):
     """
@@ -24,19 +36,17 @@ def domesticate_tensorflow(seed: int = 42, disable_parallelism: bool = False):
     Args:
         seed (int): The seed value to set.
         disable_parallelism (bool): If True, sets intra-op and inter-op parallelism threads to 1 for full determinism.
+            Without it, TensorFlow keeps all threads and relies on op determinism, which is a lot faster.
     """
-    # For recent TensorFlow versions (>=2.1), set environmental variables and options
-    import os
-    os.environ['PYTHONHASHSEED'] = str(seed)
-    os.environ['TF_DETERMINISTIC_OPS'] = '1'  # TensorFlow >=2.1
-    os.environ['TF_CUDNN_DETERMINISTIC'] = '1'  # TensorFlow >=2.1
+    _prepare_tensorflow(seed, disable_parallelism)
 
     import tensorflow as tf
-    seed_keras(seed)
+    seed_tensorflow(seed)
 
     if disable_parallelism:
         # Set intra-op and inter-op parallelism threads to 1 for full determinism
-        # Note: This may significantly slow down training
+        # Note: This may significantly slow down training. Op determinism (below) keeps the thread pools and is enough
+        # for most models, use `saatgut.find_nondeterministic_ops` to check yours.
         tf.config.threading.set_intra_op_parallelism_threads(1)
         tf.config.threading.set_inter_op_parallelism_threads(1)
 
@@ -50,5 +60,125 @@ def domesticate_tensorflow(seed: int = 42, disable_parallelism: bool = False):
         pass  # Not available in older TF versions
 
 
-if __name__ == '__main__':
-    seed_keras(1234)
+@secure_import('tensorflow')
+def deterministic_data_options():
+    """
+    Create `tf.data.Options` that make the order of elements deterministic, while parallel `map` calls and prefetching
+    keep running in parallel:
+
+        dataset = dataset.map(augment, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+        dataset = dataset.with_options(saatgut.deterministic_data_options())
+
+    Returns:
+        tf.data.Options: The options.
+    """
+    import tensorflow as tf
+    options = tf.data.Options()
+    if hasattr(options, 'deterministic'):
+        options.deterministic = True  # TensorFlow >= 2.5
+    else:
+        options.experimental_deterministic = True
+    return options
+
+
+@secure_import('tensorflow')
+def replica_generators(seed: int, num_replicas: int):
+    """
+    Create one independent `tf.random.Generator` per replica of a distribution strategy. Unlike the global generator,
+    each replica draws from its own stream, so the results don't depend on the order in which the replicas run.
+
+    Args:
+        seed (int): The root seed.
+        num_replicas (int): The number of replicas, e.g. `strategy.num_replicas_in_sync`.
+
+    Returns:
+        list: The generators, one per replica.
+    """
+    import tensorflow as tf
+    return tf.random.Generator.from_seed(seed).split(num_replicas)
+
+
+@secure_import('tensorflow')
+def replica_seed(seed: int, step=0):
+    """
+    Derive a seed for stateless random ops (`tf.random.stateless_*`) that differs per replica and per step. Call it
+    inside the function that is run by `strategy.run`, it can be traced by `tf.function`:
+
+        def train_step(inputs, step):
+            noise = tf.random.stateless_normal(shape, seed=saatgut.replica_seed(42, step))
+
+    Args:
+        seed (int): The root seed.
+        step (int or tf.Tensor): The current step.
+
+    Returns:
+        tf.Tensor: The seed, a tensor of shape [2] and dtype int64.
+    """
+    import tensorflow as tf
+    key = tf.constant([seed, 0], dtype=tf.int64)
+    key = tf.random.experimental.stateless_fold_in(key, tf.cast(step, tf.int64))
+    replica_context = tf.distribute.get_replica_context()
+    if replica_context is not None:
+        replica_id = tf.cast(replica_context.replica_id_in_sync_group, tf.int64)
+        key = tf.random.experimental.stateless_fold_in(key, replica_id)
+    return key
+
+
+# Ops that may lack a deterministic kernel (mostly on GPU), according to the notes on op determinism of TensorFlow.
+# With op determinism enabled, running them raises an UnimplementedError, or they have to run single-threaded.
+__NONDETERMINISTIC_OPS__ = {
+    "SparseSegmentMeanGrad": "Backprop of tf.sparse.segment_mean on GPU",
+    "SparseSegmentSqrtNGrad": "Backprop of tf.sparse.segment_sqrt_n on GPU",
+    "SparseSegmentSumGrad": "Backprop of tf.sparse.segment_sum on GPU",
+    "SegmentSum": "tf.math.segment_sum on GPU",
+    "SegmentProd": "tf.math.segment_prod on GPU",
+    "SegmentMean": "tf.math.segment_mean on GPU",
+    "UnsortedSegmentSum": "tf.math.unsorted_segment_sum on GPU, also used by the backprop of tf.gather",
+    "UnsortedSegmentProd": "tf.math.unsorted_segment_prod on GPU",
+    "UnsortedSegmentMax": "tf.math.unsorted_segment_max on GPU",
+    "UnsortedSegmentMin": "tf.math.unsorted_segment_min on GPU",
+    "SparseTensorDenseMatMul": "tf.sparse.sparse_dense_matmul on GPU",
+    "CTCLossV2": "tf.nn.ctc_loss on GPU",
+    "CropAndResizeGradBoxes": "Backprop of tf.image.crop_and_resize to the boxes",
+    "CropAndResizeGradImage": "Backprop of tf.image.crop_and_resize to the image",
+    "ResizeNearestNeighborGrad": "Backprop of tf.image.resize with method NEAREST on GPU",
+    "ResizeBilinearGrad": "Backprop of tf.image.resize with method BILINEAR on GPU in older TensorFlow versions",
+    "AdjustContrastv2": "tf.image.adjust_contrast on GPU",
+    "Bincount": "tf.math.bincount on GPU",
+    "DenseBincount": "tf.math.bincount with weights on GPU",
+    "FusedBatchNormGradV3": "Backprop of fused batch normalization to the offset, if not training",
+    "ScatterNd": "tf.scatter_nd on GPU in older TensorFlow versions",
+    "TensorScatterAdd": "tf.tensor_scatter_nd_add on GPU in older TensorFlow versions",
+}
+
+
+@secure_import('tensorflow')
+def find_nondeterministic_ops(function, *example_inputs):
+    """
+    Find the ops of a model or function that may lack a deterministic kernel. Only these ops need single-threading or
+    workarounds; everything else is deterministic with `domesticate_tensorflow` while keeping all threads.
+    To include the gradients, pass a function that runs a complete training step.
+
+    Args:
+        function (Callable): A Keras model, a `tf.function` or a plain function that TensorFlow can trace.
+        *example_inputs: Inputs to trace the function with.
+
+    Returns:
+        dict: Maps the type of each found op to a description (`"reason"`) and the names of its nodes (`"nodes"`).
+    """
+    import tensorflow as tf
+    if not hasattr(function, 'get_concrete_function'):
+        function = tf.function(function)
+    graph_def = function.get_concrete_function(*example_inputs).graph.as_graph_def()
+
+    # Nodes of the graph itself, and of all functions it calls (like the bodies of loops and conditions)
+    nodes = [(node.name, node.op) for node in graph_def.node]
+    for library_function in graph_def.library.function:
+        nodes += [(f"{library_function.signature.name}/{node.name}", node.op) for node in library_function.node_def]
+
+    report = {}
+    for name, op in nodes:
+        if op in __NONDETERMINISTIC_OPS__:
+            entry = report.setdefault(op, {"reason": __NONDETERMINISTIC_OPS__[op], "nodes": []})
+            entry["nodes"].append(name)
+    return report
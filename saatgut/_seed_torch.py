@@ -7,22 +7,106 @@ seed_torch(seed)
 
 domesticate_torch(seed)
     Comprehensive setup for reproducibility in PyTorch, including seeding and other configurations.
-"""
 
+distributed_seed(seed)
+    The seed of the current rank in distributed training.
+"""
+import os
+import sys
+from typing import Tuple
 
 from saatgut._secure_import import secure_import
+from saatgut._seed_sequence import derive_seed
+
+# Environment variables with the rank and the world size, set by torchrun, SLURM, Open MPI and MPICH (in this order)
+__RANK_ENVIRONMENT__ = (
+    ("RANK", "WORLD_SIZE"),
+    ("SLURM_PROCID", "SLURM_NTASKS"),
+    ("OMPI_COMM_WORLD_RANK", "OMPI_COMM_WORLD_SIZE"),
+    ("PMI_RANK", "PMI_SIZE"),
+)
+
+
+def _process_group_initialized() -> bool:
+    """ Whether `torch.distributed` has an initialized process group, without importing torch. """
+    if "torch" not in sys.modules:
+        return False
+    import torch.distributed as dist
+    return dist.is_available() and dist.is_initialized()
+
+
+def distributed_context() -> Tuple[int, int]:
+    """
+    Detect the rank of the current process and the number of processes of a distributed job: from `torch.distributed`
+    if its process group is initialized, else from the environment variables of the launcher (torchrun, SLURM or MPI).
+
+    Returns:
+        tuple: The rank and the world size, `(0, 1)` outside of distributed jobs.
+    """
+    if _process_group_initialized():
+        import torch.distributed as dist
+        return dist.get_rank(), dist.get_world_size()
+    for rank, world_size in __RANK_ENVIRONMENT__:
+        if rank in os.environ and world_size in os.environ:
+            return int(os.environ[rank]), int(os.environ[world_size])
+    return 0, 1
+
+
+def _broadcast_seed(seed: int) -> int:
+    """ Broadcast the seed of rank 0 to all ranks of the initialized process group, with a single broadcast. """
+    import torch
+    import torch.distributed as dist
+
+    device = "cpu"
+    if dist.get_backend() == "nccl":  # NCCL only communicates tensors on the GPU
+        device = torch.device("cuda", torch.cuda.current_device())
+    # Seeds up to 2**64 - 1 are sent as their two's complement in a signed 64 bit integer
+    tensor = torch.tensor([seed - (1 << 64) if seed >= 1 << 63 else seed], dtype=torch.int64, device=device)
+    dist.broadcast(tensor, src=0)
+    return int(tensor.item()) % (1 << 64)
+
+
+def distributed_seed(seed: int = 42, sync: bool = True) -> int:
+    """
+    Derive the seed of the current rank with `derive_seed(seed, rank)`, so that the ranks of a distributed job draw
+    independent random numbers (e.g. dropout masks) instead of identical ones, unlike `seed + rank` offsets whose
+    streams can be correlated. The seed of a rank doesn't depend on the world size, so adding ranks doesn't change the
+    random numbers of the existing ones.
+
+    If `torch.distributed` is initialized and `sync` is True, the seed of rank 0 is broadcast to all ranks first, so
+    all ranks derive their seeds from the same root seed, even if it was e.g. drawn at random on each rank.
+
+    Use the root seed, not the rank seed, for everything that has to be the same on all ranks, like the initial weights
+    or the shuffling of a `DistributedSampler`. For randomness per sample that doesn't depend on the number of ranks at
+    all, derive the seeds from the sample index with `saatgut.seeds_for`.
+
+    Args:
+        seed (int): The root seed.
+        sync (bool): If True, use the seed of rank 0 on all ranks. This is a collective call, all ranks must call it.
+
+    Returns:
+        int: The seed of the current rank.
+    """
+    rank, _ = distributed_context()
+    if sync and _process_group_initialized():
+        seed = _broadcast_seed(seed)
+    return derive_seed(seed, rank)
 
 
 @secure_import('torch')
-def seed_torch(seed: int = 42):
+def seed_torch(seed: int = 42, distributed: bool = False):
     """
     Set the random seed for PyTorch to ensure reproducibility.
 
     Args:
         seed (int): The seed value to set for random number generation.
+        distributed (bool): If True, seed each rank of a distributed job with its own seed, see
+            `saatgut.distributed_seed`. All ranks must call it if `torch.distributed` is initialized.
     """
     import torch
 
+    if distributed:
+        seed = distributed_seed(seed)
     torch.manual_seed(seed)
     if torch.cuda.is_available():
         torch.cuda.manual_seed(seed)
@@ -30,7 +114,7 @@ def seed_torch(seed: int = 42):
 
 
 @secure_import('torch')
-def domesticate_torch(seed: int = 42, force_matmul_precision: bool = False):
+def domesticate_torch(seed: int = 42, force_matmul_precision: bool = False, distributed: bool = False):
     """
     Like `saatgut.seed_torch`, but tries to ensure reproducibility as much as possible.
     Note: Some operations in PyTorch may still be non-deterministic, see:
@@ -38,10 +122,12 @@ def domesticate_torch(seed: int = 42, force_matmul_precision: bool = False):
 
     Args:
         seed (int): The seed value to set for random number generation.
+        force_matmul_precision (bool): If True, disables TF32 and reduced precision in matrix multiplications.
+        distributed (bool): If True, seed each rank with its own seed, see `saatgut.seed_torch`.
     """
     import torch
 
-    seed_torch(seed)
+    seed_torch(seed, distributed=distributed)
     torch.backends.cudnn.deterministic = True
     torch.backends.cudnn.benchmark = False
     if hasattr(torch, 'use_deterministic_algorithms'):
@@ -0,0 +1,103 @@
+"""
+This module provides `saatgut.Seeder`, for reseeding on the hot path, e.g. once per inference request or batch.
+`seed_everything` discovers the installed libraries, builds a report and guards every library against errors on each
+call. A seeder does the discovery and imports once, and binds the seeding function of each library, so a call only
+runs those functions one after the other.
+"""
+import sys
+from typing import Callable, Iterable, Optional, Tuple
+
+from saatgut._backends import is_installed
+from saatgut._registry import backends as registered_backends
+from saatgut._report import logger
+from saatgut._secure_import import _unchecked
+
+
+def _bind_random() -> Tuple[Callable[[int], None], ...]:
+    import random
+    return (random.seed,)
+
+
+def _bind_numpy() -> Tuple[Callable[[int], None], ...]:
+    import numpy as np
+    return (np.random.seed,)
+
+
+def _bind_torch() -> Tuple[Callable[[int], None], ...]:
+    # `torch.manual_seed` walks every device type on each call, which costs over a hundred microseconds. The seeder
+    # checks for CUDA once, and only seeds the generators that exist.
+    import torch
+    if torch.cuda.is_available():
+        return torch.default_generator.manual_seed, torch.cuda.manual_seed_all
+    return (torch.default_generator.manual_seed,)
+
+
+# Faster bindings than the generic seeding function of a backend, all other backends use their seeding function
+__BINDINGS__ = {
+    "random": _bind_random,
+    "numpy": _bind_numpy,
+    "torch": _bind_torch,
+}
+
+
+class Seeder:
+    """
+    Reseed several libraries with as little overhead as possible, e.g. once per request so that stochastic decoding
+    is reproducible:
+
+        seeder = saatgut.Seeder(["random", "numpy", "torch"])  # Once, at startup
+
+        def handle(request):
+            seeder(saatgut.seed_for(42, request.id) >> 32)
+
+    The libraries are imported and their seeding functions are bound when the seeder is created. A call doesn't
+    import, allocate a report or catch errors, and seeds the same way as `saatgut.seed_everything` does. CUDA is only
+    seeded if it was available when the seeder was created.
+
+    Unlike `seed_everything`, the named generators of `saatgut.numpy_generators` are only reseeded with
+    `generators=True`. Reseeding creates a new `SeedSequence` and bit generator state for every registered generator,
+    so its cost grows with the number of generators.
+
+    Args:
+        backends (Iterable[str]): The libraries to seed. Defaults to all installed libraries that are imported already,
+            and `random`. Libraries that are not installed are skipped with a warning.
+        generators (bool): If True, also reseed the named generators of `saatgut.numpy_generators` with NumPy.
+    """
+    def __init__(self, backends: Optional[Iterable[str]] = None, generators: bool = False):
+        registry = registered_backends()
+        if backends is None:
+            backends = [name for name, backend in registry.items()
+                        if backend.module == "random" or backend.module in sys.modules]
+        unknown = [name for name in backends if name not in registry]
+        if unknown:
+            raise ValueError(f"Unknown backends {unknown}, choose from {list(registry)}")
+
+        self.backends = []
+        functions = []
+        for name in backends:
+            backend = registry[name]
+            if not is_installed(backend.module):
+                logger.warning("Module '%s' is not installed!", backend.module)
+                continue
+            if name in __BINDINGS__:
+                functions.extend(__BINDINGS__[name]())
+            else:
+                functions.append(_unchecked(backend.function("seed")))
+            if name == "numpy" and generators:
+                from saatgut._generators import _reseed_registry
+                functions.append(_reseed_registry)
+            self.backends.append(name)
+        self._functions = tuple(functions)
+
+    def __call__(self, seed: int):
+        """
+        Seed all libraries of the seeder.
+
+        Args:
+            seed (int): The seed value to set, below 2**32 (like for `np.random.seed`).
+        """
+        for function in self._functions:
+            function(seed)
+
+    def __repr__(self):
+        return f"Seeder({self.backends})"
@@ -0,0 +1,287 @@
+"""
+This module captures and restores the states of the random number generators of all supported libraries.
+Snapshots serialize to a compact binary format: large states (like the 624 words of a Mersenne Twister) are written
+straight from their buffers and read back as zero-copy views, so checkpointing them is cheap.
+"""
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Optional, Union
+
+from saatgut._generators import _registered_generators
+from saatgut._registry import backends as _backends
+
+_MAGIC = b"SAATGUT\x01"
+
+
+def _pack_random(state):
+    version, internal_state, gauss_next = state
+    return version, array('I', internal_state), gauss_next
+
+
+def _unpack_random(state):
+    version, internal_state, gauss_next = state
+    return version, tuple(internal_state), gauss_next
+
+
+def _capture_numpy():
+    import numpy as np
+    return np.random.get_state(legacy=False)
+
+
+def _restore_numpy(state):
+    import numpy as np
+    np.random.set_state(state)
+
+
+def _capture_torch():
+    import torch
+    return torch.get_rng_state().numpy()
+
+
+def _restore_torch(state):
+    import torch
+    if not state.flags.writeable:
+        state = state.copy()  # Views of immutable bytes, torch needs writable memory
+    torch.set_rng_state(torch.from_numpy(state))
+
+
+def _capture_tensorflow():
+    import tensorflow as tf
+    generator = tf.random.get_global_generator()
+    return generator.algorithm, generator.state.numpy()
+
+
+def _restore_tensorflow(state):
+    import tensorflow as tf
+    algorithm, generator_state = state
+    generator = tf.random.get_global_generator()
+    if generator.algorithm != algorithm:
+        raise ValueError(f"Can't restore state of algorithm {algorithm} into a generator using {generator.algorithm}")
+    generator.reset(generator_state)
+
+
+# States that are kept in memory in a form that is fast to capture, but needs converting for serialization
+__SNAPSHOT_PACKERS__ = {
+    "random": (_pack_random, _unpack_random),
+}
+
+
+def _encode(obj, chunks: list):
+    """
+    Append the binary encoding of `obj` to `chunks`. Buffers of arrays are appended as memoryviews without copying.
+    """
+    if obj is None:
+        chunks.append(b'N')
+    elif obj is True or obj is False:
+        chunks.append(b'T' if obj else b'F')
+    elif isinstance(obj, int):
+        if -2 ** 63 <= obj < 2 ** 63:
+            chunks.append(struct.pack('<cq', b'i', obj))
+        else:
+            data = obj.to_bytes((obj.bit_length() + 8) // 8, 'little', signed=True)
+            chunks.append(struct.pack('<cI', b'I', len(data)))
+            chunks.append(data)
+    elif isinstance(obj, float):
+        chunks.append(struct.pack('<cd', b'f', obj))
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        chunks.append(struct.pack('<cI', b's', len(data)))
+        chunks.append(data)
+    elif isinstance(obj, (tuple, list)):
+        chunks.append(struct.pack('<cI', b't' if isinstance(obj, tuple) else b'l', len(obj)))
+        for item in obj:
+            _encode(item, chunks)
+    elif isinstance(obj, dict):
+        chunks.append(struct.pack('<cI', b'd', len(obj)))
+        for key, value in obj.items():
+            _encode(key, chunks)
+            _encode(value, chunks)
+    elif isinstance(obj, array):
+        data = memoryview(obj).cast('B')
+        chunks.append(struct.pack('<ccQ', b'A', obj.typecode.encode('ascii'), len(data)))
+        chunks.append(data)
+    elif hasattr(obj, '__array_interface__'):
+        import numpy as np
+        obj = np.ascontiguousarray(obj)
+        dtype = obj.dtype.str.encode('ascii')
+        chunks.append(struct.pack(f'<cB{len(dtype)}sB{obj.ndim}QQ', b'a', len(dtype), dtype, obj.ndim, *obj.shape,
+                                  obj.nbytes))
+        chunks.append(memoryview(obj).cast('B'))
+    else:
+        raise TypeError(f"Can't serialize object of type {type(obj).__name__} in a snapshot")
+
+
+def _decode(view: memoryview, offset: int):
+    """
+    Decode the object that starts at `offset`. Arrays are returned as read-only views into `view`.
+
+    Returns:
+        tuple: The decoded object and the offset right after it.
+    """
+    tag = view[offset:offset + 1].tobytes()
+    offset += 1
+    if tag == b'N':
+        return None, offset
+    if tag in (b'T', b'F'):
+        return tag == b'T', offset
+    if tag == b'i':
+        return struct.unpack_from('<q', view, offset)[0], offset + 8
+    if tag == b'f':
+        return struct.unpack_from('<d', view, offset)[0], offset + 8
+    if tag in (b'I', b's'):
+        (length,) = struct.unpack_from('<I', view, offset)
+        offset += 4
+        data = view[offset:offset + length]
+        value = int.from_bytes(data, 'little', signed=True) if tag == b'I' else str(data, 'utf-8')
+        return value, offset + length
+    if tag in (b't', b'l'):
+        (length,) = struct.unpack_from('<I', view, offset)
+        offset += 4
+        items = []
+        for _ in range(length):
+            item, offset = _decode(view, offset)
+            items.append(item)
+        return (tuple(items) if tag == b't' else items), offset
+    if tag == b'd':
+        (length,) = struct.unpack_from('<I', view, offset)
+        offset += 4
+        result = {}
+        for _ in range(length):
+            key, offset = _decode(view, offset)
+            result[key], offset = _decode(view, offset)
+        return result, offset
+    if tag == b'A':
+        typecode, nbytes = struct.unpack_from('<cQ', view, offset)
+        offset += 9
+        data = array(typecode.decode('ascii'))
+        data.frombytes(view[offset:offset + nbytes])
+        return data, offset + nbytes
+    if tag == b'a':
+        import numpy as np
+        (dtype_length,) = struct.unpack_from('<B', view, offset)
+        dtype, ndim = struct.unpack_from(f'<{dtype_length}sB', view, offset + 1)
+        offset += 2 + dtype_length
+        *shape, nbytes = struct.unpack_from(f'<{ndim + 1}Q', view, offset)
+        offset += 8 * (ndim + 1)
+        data = np.frombuffer(view[offset:offset + nbytes], dtype=np.dtype(dtype.decode('ascii'))).reshape(shape)
+        return data, offset + nbytes
+    raise ValueError(f"Invalid snapshot data, unknown tag {tag!r} at offset {offset - 1}")
+
+
+class Snapshot:
+    """
+    The captured states of the random number generators of several libraries. Create it with `saatgut.snapshot()`,
+    and bring the states back with `saatgut.restore(snapshot)`.
+    Use `bytes(snapshot)` to serialize it, and `Snapshot.from_bytes(data)` to load it again.
+    """
+    def __init__(self, states: dict, generators: Optional[dict] = None):
+        self.states = states
+        self.generators = generators or {}
+
+    @property
+    def backends(self) -> tuple:
+        """ The names of all libraries with a captured state. """
+        return tuple(self.states)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the snapshot to its compact binary format.
+
+        Returns:
+            bytes: The serialized snapshot.
+        """
+        chunks = [_MAGIC]
+        states = {name: __SNAPSHOT_PACKERS__[name][0](state) if name in __SNAPSHOT_PACKERS__ else state
+                  for name, state in self.states.items()}
+        _encode(states, chunks)
+        return b''.join(chunks)
+
+    __bytes__ = to_bytes
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> 'Snapshot':
+        """
+        Load a snapshot serialized with `Snapshot.to_bytes`. Arrays in the snapshot are views into `data`.
+
+        Args:
+            data (bytes-like): The serialized snapshot.
+
+        Returns:
+            Snapshot: The loaded snapshot.
+        """
+        view = memoryview(data).cast('B')
+        if view[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("Data is not a saatgut snapshot")
+        states, _ = _decode(view, len(_MAGIC))
+        return cls({name: __SNAPSHOT_PACKERS__[name][1](state) if name in __SNAPSHOT_PACKERS__ else state
+                    for name, state in states.items()})
+
+    def __repr__(self):
+        return f"Snapshot(backends={self.backends})"
+
+
+def _capturable_backends() -> list:
+    """ All backends with snapshot support whose module is imported already, random is always imported. """
+    return [name for name, backend in _backends().items() if backend.has("snapshot") and backend.module in sys.modules]
+
+
+def _check_backends(names: Iterable[str], registry: dict):
+    """ Raise a ValueError if a backend is not registered or can't be captured and restored. """
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        raise ValueError(f"Unknown backends {unknown}, choose from {list(registry)}")
+    unsupported = [name for name in names if not registry[name].has("snapshot")]
+    if unsupported:
+        raise ValueError(f"Backends {unsupported} don't support snapshots, choose from "
+                         f"{[name for name, backend in registry.items() if backend.has('snapshot')]}")
+
+
+def snapshot(backends: Optional[Iterable[str]] = None, generators: Optional[Dict[str, object]] = None) -> Snapshot:
+    """
+    Capture the states of the random number generators of all supported libraries.
+    By default, only libraries that are already imported are captured, saatgut never imports a library for this.
+
+    Args:
+        backends (Iterable[str]): The names of the libraries to capture, defaults to all imported libraries.
+        generators (dict): Optional NumPy `Generator` objects to capture as well, by name. Defaults to the generators
+            of `saatgut.numpy_generators`, if NumPy is captured.
+
+    Returns:
+        Snapshot: The captured states.
+    """
+    backends = _capturable_backends() if backends is None else list(backends)
+    registry = _backends()
+    _check_backends(backends, registry)
+    states = {name: registry[name].function("snapshot")() for name in backends}
+    if generators is None and "numpy" in backends:
+        generators = _registered_generators()
+    if generators:
+        states["numpy.Generator"] = {name: generator.bit_generator.state for name, generator in generators.items()}
+    return Snapshot(states, generators)
+
+
+def restore(snap: Union[Snapshot, bytes, bytearray, memoryview], generators: Optional[Dict[str, object]] = None):
+    """
+    Restore the states of the random number generators captured by `saatgut.snapshot`.
+
+    Args:
+        snap (Snapshot or bytes-like): The snapshot, or its serialized form.
+        generators (dict): The NumPy `Generator` objects to restore, by name. Defaults to the generators that were
+            captured if the snapshot wasn't serialized in between, and to those of `saatgut.numpy_generators`
+            otherwise.
+    """
+    if not isinstance(snap, Snapshot):
+        snap = Snapshot.from_bytes(snap)
+    if generators is None:
+        generators = snap.generators or _registered_generators() or {}
+
+    registry = _backends()
+    _check_backends([name for name in snap.states if name != "numpy.Generator"], registry)
+    for name, state in snap.states.items():
+        if name == "numpy.Generator":
+            for generator_name, generator_state in state.items():
+                if generator_name in generators:
+                    generators[generator_name].bit_generator.state = generator_state
+        else:
+            registry[name].function("restore")(state)
@@ -0,0 +1,149 @@
+"""
+This module gives every thread or asyncio task its own random number generators, derived from a root seed and a key
+(e.g. a request id). Concurrent requests then draw from independent streams and stay reproducible, without locks
+around the global random state.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+from typing import Union
+
+from saatgut._seed_sequence import generate_state
+
+Key = Union[int, str, bytes]
+
+
+# The type of a key is stored in the lowest two bits of its integer, so that keys of different types never collide
+_INT_TAG, _BYTES_TAG, _STR_TAG = 0, 1, 2
+
+
+def _key_to_int(key: Key) -> int:
+    """
+    Turn a key into a non-negative integer, strings and bytes are read as little-endian numbers. The integers of keys
+    with different types differ, e.g. of "a", b"a" and 353.
+    """
+    if isinstance(key, (str, bytes)):
+        tag, data = (_STR_TAG, key.encode('utf-8')) if isinstance(key, str) else (_BYTES_TAG, key)
+        # The length is added so that keys like b"a" and b"a\0" don't collide
+        return int.from_bytes(data + len(data).to_bytes(4, 'little'), 'little') << 2 | tag
+    if isinstance(key, int) and key >= 0:
+        return key << 2 | _INT_TAG
+    raise TypeError(f"Stream keys must be non-negative integers, strings or bytes, got {key!r}")
+
+
+class RandomStream:
+    """
+    The random number generators of a single stream. Each generator is created on first use from 128 bits of entropy
+    derived from the root seed and the key of the stream, like `numpy.random.SeedSequence(seed, spawn_key=key)`.
+    """
+    def __init__(self, seed: int, *key: Key):
+        self.seed = seed
+        self.key = key
+        self._spawn_key = tuple(_key_to_int(part) for part in key)
+        self._words_cache = None
+        self._random = None
+        self._numpy = None
+        self._torch = None
+
+    @property
+    def _words(self) -> list:
+        if self._words_cache is None:
+            self._words_cache = generate_state(self.seed, self._spawn_key, 4)
+        return self._words_cache
+
+    @property
+    def random(self) -> random.Random:
+        """ A `random.Random` instance of this stream. """
+        if self._random is None:
+            self._random = random.Random(sum(word << (32 * i) for i, word in enumerate(self._words)))
+        return self._random
+
+    @property
+    def numpy(self):
+        """ A `numpy.random.Generator` of this stream. """
+        if self._numpy is None:
+            import numpy as np
+            # The same SeedSequence that `self._words` are generated from, but NumPy derives it faster
+            self._numpy = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=self._spawn_key))
+        return self._numpy
+
+    @property
+    def torch(self):
+        """ A `torch.Generator` (on the CPU) of this stream. """
+        if self._torch is None:
+            import torch
+            self._torch = torch.Generator()
+            self._torch.manual_seed(self._words[0] | (self._words[1] << 32))
+        return self._torch
+
+    def __repr__(self):
+        return f"RandomStream(seed={self.seed}, key={self.key})"
+
+
+class StreamManager:
+    """
+    Hands out a separate `RandomStream` to each thread or asyncio task. Open a stream for each unit of work, all code
+    running inside it (in the same thread or task) then draws from the generators of that stream:
+
+        streams = saatgut.StreamManager(42)
+
+        async def handle(request):
+            with streams.stream(request.id):
+                noise = streams.numpy.normal(size=16)
+                dropout = torch.rand(16, generator=streams.torch)
+
+    The stream of a key is the same in every run, no matter how requests interleave. Streams are tracked with
+    `contextvars`, so each thread starts without a stream, and asyncio tasks inherit the stream that was open when they
+    were created; open a new stream in each task that draws concurrently. Outside of any opened stream, each context
+    lazily gets its own stream with an empty key.
+
+    Args:
+        seed (int): The root seed of all streams.
+    """
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self._current = contextvars.ContextVar(f"saatgut_stream_{id(self)}", default=None)
+
+    @contextmanager
+    def stream(self, *key: Key):
+        """
+        Open the stream with the given key for the current thread or task.
+
+        Args:
+            *key (int, str or bytes): Identifies the stream, e.g. a request id, or `(epoch, sample_index)`.
+
+        Yields:
+            RandomStream: The opened stream.
+        """
+        stream = RandomStream(self.seed, *key)
+        token = self._current.set(stream)
+        try:
+            yield stream
+        finally:
+            self._current.reset(token)
+
+    def current(self) -> RandomStream:
+        """
+        Returns:
+            RandomStream: The stream of the current thread or task.
+        """
+        stream = self._current.get()
+        if stream is None:
+            stream = RandomStream(self.seed)
+            self._current.set(stream)
+        return stream
+
+    @property
+    def random(self) -> random.Random:
+        """ The `random.Random` instance of the current stream. """
+        return self.current().random
+
+    @property
+    def numpy(self):
+        """ The `numpy.random.Generator` of the current stream. """
+        return self.current().numpy
+
+    @property
+    def torch(self):
+        """ The `torch.Generator` of the current stream. """
+        return self.current().torch
@@ -0,0 +1,165 @@
+"""
+This module controls the thread pools of BLAS and OpenMP libraries at runtime, like threadpoolctl does: it finds the
+libraries that are loaded into the process and calls their own functions (through `ctypes`) to read and set the number
+of threads. Unlike the `OMP_NUM_THREADS` environment variables, this also works after NumPy was imported, and can be
+undone, so single-threading is only paid for where it is needed.
+Supported on Linux and macOS.
+"""
+import ctypes
+import os
+import sys
+from contextlib import ContextDecorator
+from typing import Dict, List, Optional, Union
+
+# For each library: the API it implements, prefixes of its file names, and the names of its getter and setter.
+# Some builds (like the OpenBLAS in NumPy wheels) add prefixes and suffixes to their symbols.
+__THREADPOOL_LIBRARIES__ = {
+    "openblas": ("blas", ("libopenblas", "libscipy_openblas", "libopenblasp"), (
+        ("openblas_get_num_threads", "openblas_set_num_threads"),
+        ("openblas_get_num_threads64_", "openblas_set_num_threads64_"),
+        ("scipy_openblas_get_num_threads64_", "scipy_openblas_set_num_threads64_"),
+        ("scipy_openblas_get_num_threads", "scipy_openblas_set_num_threads"),
+    )),
+    "mkl": ("blas", ("libmkl_rt",), (("MKL_Get_Max_Threads", "MKL_Set_Num_Threads"),)),
+    "blis": ("blas", ("libblis",), (("bli_thread_get_num_threads", "bli_thread_set_num_threads"),)),
+    "openmp": ("openmp", ("libgomp", "libiomp", "libomp"), (("omp_get_max_threads", "omp_set_num_threads"),)),
+}
+
+_HANDLES: Dict[str, Optional[tuple]] = {}
+_POOLS_CACHE = (-1, [])  # Number of imported modules when the loaded libraries were last searched, and the result
+
+
+class _DlPhdrInfo(ctypes.Structure):
+    _fields_ = [("dlpi_addr", ctypes.c_void_p), ("dlpi_name", ctypes.c_char_p)]
+
+
+def _loaded_library_paths() -> List[str]:
+    """ The paths of all shared libraries loaded into this process. """
+    paths = []
+    if sys.platform.startswith("linux") or "bsd" in sys.platform:
+        libc = ctypes.CDLL(None)
+        callback_type = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(_DlPhdrInfo), ctypes.c_size_t, ctypes.c_void_p)
+
+        def collect(info, size, data):
+            if info.contents.dlpi_name:
+                paths.append(os.fsdecode(info.contents.dlpi_name))
+            return 0
+
+        libc.dl_iterate_phdr(callback_type(collect), None)
+    elif sys.platform == "darwin":
+        libc = ctypes.CDLL(None)
+        libc._dyld_get_image_name.restype = ctypes.c_char_p
+        for index in range(libc._dyld_image_count()):
+            paths.append(os.fsdecode(libc._dyld_get_image_name(index)))
+    return paths
+
+
+def _open(path: str, symbols: tuple) -> Optional[tuple]:
+    """ Open a library and look up the first pair of getter and setter it has. Results are cached per path. """
+    if path not in _HANDLES:
+        _HANDLES[path] = None
+        try:
+            library = ctypes.CDLL(path, mode=getattr(os, 'RTLD_NOLOAD', 0) | ctypes.RTLD_GLOBAL)
+        except OSError:
+            return None
+        for getter_name, setter_name in symbols:
+            getter, setter = getattr(library, getter_name, None), getattr(library, setter_name, None)
+            if getter is not None and setter is not None:
+                getter.restype = ctypes.c_int
+                setter.argtypes = [ctypes.c_int]
+                _HANDLES[path] = (getter, setter)
+                break
+    return _HANDLES[path]
+
+
+def _threadpools() -> List[tuple]:
+    """
+    All loaded libraries with a thread pool, as tuples of (name, api, path, getter, setter).
+    Native libraries are loaded by imports, so the search is only repeated after new modules were imported.
+    """
+    global _POOLS_CACHE
+    if _POOLS_CACHE[0] == len(sys.modules):
+        return _POOLS_CACHE[1]
+
+    pools = []
+    for path in _loaded_library_paths():
+        filename = os.path.basename(path)
+        for name, (api, prefixes, symbols) in __THREADPOOL_LIBRARIES__.items():
+            if filename.startswith(prefixes):
+                handle = _open(path, symbols)
+                if handle is not None:
+                    pools.append((name, api, path) + handle)
+                break
+    _POOLS_CACHE = (len(sys.modules), pools)
+    return pools
+
+
+def threadpool_info() -> List[dict]:
+    """
+    List the BLAS and OpenMP libraries that are loaded into this process, with their current number of threads.
+
+    Returns:
+        list: One dict per library, with the keys "library" (e.g. "openblas"), "api" ("blas" or "openmp"),
+            "path" and "num_threads".
+    """
+    return [{"library": name, "api": api, "path": path, "num_threads": getter()}
+            for name, api, path, getter, _ in _threadpools()]
+
+
+def _matches(name: str, api: str, libraries) -> bool:
+    return libraries is None or name in libraries or api in libraries
+
+
+def set_threads(limit: int, libraries: Optional[Union[str, List[str]]] = None) -> Dict[str, int]:
+    """
+    Set the number of threads of the loaded BLAS and OpenMP libraries, until it is changed again.
+    Prefer the scoped `saatgut.limit_threads`.
+
+    Args:
+        limit (int): The number of threads.
+        libraries (str or List[str]): Only change these libraries or APIs (e.g. "openblas", "blas" or "openmp").
+            Defaults to all of them.
+
+    Returns:
+        dict: The previous number of threads of each changed library, by path.
+    """
+    libraries = [libraries] if isinstance(libraries, str) else libraries
+    previous = {}
+    for name, api, path, getter, setter in _threadpools():
+        if _matches(name, api, libraries):
+            previous[path] = getter()
+            setter(limit)
+    return previous
+
+
+class limit_threads(ContextDecorator):
+    """
+    Limit the number of threads of the loaded BLAS and OpenMP libraries inside a block, and restore them afterwards.
+    Use it to make reductions deterministic just around a sensitive section, while the rest of the program keeps all
+    cores:
+
+        with saatgut.limit_threads(1):
+            loss = features @ weights  # Summed in a fixed order
+
+    Note: OpenMP applies the limit to the calling thread only.
+
+    Args:
+        limit (int): The number of threads inside the block.
+        libraries (str or List[str]): Only limit these libraries or APIs (e.g. "openblas", "blas" or "openmp").
+            Defaults to all of them.
+    """
+    def __init__(self, limit: int = 1, libraries: Optional[Union[str, List[str]]] = None):
+        self.limit = limit
+        self.libraries = libraries
+        self._previous = []
+
+    def __enter__(self):
+        self._previous.append(set_threads(self.limit, self.libraries))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        previous = self._previous.pop()
+        for name, api, path, getter, setter in _threadpools():
+            if path in previous:
+                setter(previous[path])
+        return False
@@ -0,0 +1,253 @@
+"""
+This module localizes nondeterminism in PyTorch models. Hooks record a cheap checksum of the output of every module (and
+of the gradient with respect to it) while a model runs. Two seeded runs are then compared to find the first module
+whose outputs diverge. Warnings about nondeterministic ops are collected into a report per op.
+"""
+import copy
+import re
+import warnings
+from contextlib import ContextDecorator
+from typing import Callable, Dict, List, Optional, Tuple
+
+from saatgut._fingerprint import fingerprint
+from saatgut._secure_import import secure_import
+
+_NONDETERMINISTIC_WARNING = re.compile(r"^(.+?) does not have a deterministic implementation")
+
+# Integer dtypes of the same width, to sum up the bits of a tensor exactly (and thus independent of the order)
+_BIT_DTYPES = {1: 'int8', 2: 'int16', 4: 'int32', 8: 'int64'}
+# Odd 64-bit constant the positions are multiplied with, so that swapping two elements changes the checksum
+_POSITION_WEIGHT = 0x9E3779B97F4A7C15 - (1 << 64)
+
+
+def _checksum(tensor) -> Tuple:
+    """
+    A cheap checksum of a tensor that is computed on its device: the sum of its bit patterns as integers, each weighted
+    by its position, so that reordered elements (e.g. of a nondeterministic scatter) change it. Integer sums wrap around
+    exactly, so it doesn't depend on the order of the summation. Only a single number is copied to the host.
+    """
+    import torch
+
+    tensor = tensor.detach()
+    bits = _BIT_DTYPES.get(tensor.element_size())
+    if bits is None or tensor.is_complex() or tensor.is_sparse:
+        return str(tensor.dtype), tuple(tensor.shape), fingerprint(tensor)
+    integers = tensor.contiguous().view(getattr(torch, bits)).reshape(-1).to(torch.int64)
+    weights = torch.arange(1, integers.numel() + 1, dtype=torch.int64, device=integers.device)
+    weights *= _POSITION_WEIGHT
+    integers *= weights
+    return str(tensor.dtype), tuple(tensor.shape), int(integers.sum())
+
+
+def _tensors(output) -> List:
+    """ All tensors in the output of a module. """
+    import torch
+
+    if isinstance(output, torch.Tensor):
+        return [output]
+    if isinstance(output, dict):
+        output = list(output.values())
+    if isinstance(output, (list, tuple)):
+        return [tensor for item in output for tensor in _tensors(item)]
+    return []
+
+
+class TraceRecord:
+    """
+    The checksum of the output of a module, or of the gradient with respect to it.
+
+    Attributes:
+        step (int): The number of the forward pass of the traced model.
+        module (str): The name of the module, "" for the model itself.
+        kind (str): "forward" or "backward".
+        checksum (tuple): The dtypes, shapes and checksums of all output tensors.
+    """
+    def __init__(self, step: int, module: str, kind: str, checksum: tuple):
+        self.step = step
+        self.module = module
+        self.kind = kind
+        self.checksum = checksum
+
+    def __eq__(self, other):
+        return isinstance(other, TraceRecord) and (self.step, self.module, self.kind, self.checksum) == \
+            (other.step, other.module, other.kind, other.checksum)
+
+    def __repr__(self):
+        return f"TraceRecord(step={self.step}, module={self.module!r}, kind={self.kind!r})"
+
+
+class trace_torch(ContextDecorator):
+    """
+    Record checksums of the activations and gradients of all modules of a model inside a `with` block, and collect the
+    warnings of `torch.use_deterministic_algorithms(True, warn_only=True)` instead of printing them:
+
+        with saatgut.trace_torch(model, sample_every=10) as trace:
+            train(model)
+        print(trace.nondeterministic_ops)
+
+    Use `saatgut.find_divergence` to compare two runs.
+
+    Args:
+        model (torch.nn.Module): The model to trace.
+        sample_every (int): Only record every n-th forward pass of the model (and its backward pass), to bound the
+            overhead.
+        gradients (bool): Whether to also record the gradients with respect to the outputs of the modules.
+    """
+    def __init__(self, model, sample_every: int = 1, gradients: bool = True):
+        self.model = model
+        self.sample_every = sample_every
+        self.gradients = gradients
+        self.records: List[TraceRecord] = []
+        self.nondeterministic_ops: Dict[str, dict] = {}
+        self._step = -1
+        self._stack = []
+        self._handles = []
+        self._catcher = None
+        self._showwarning = warnings.showwarning
+
+    def _sampled(self) -> bool:
+        return self._step % self.sample_every == 0
+
+    def _pre_hook(self, name: str):
+        def hook(module, inputs):
+            if module is self.model:
+                self._step += 1
+            self._stack.append(name)
+        return hook
+
+    def _forward_hook(self, name: str):
+        def hook(module, inputs, output):
+            self._stack.pop()
+            if not self._sampled():
+                return
+            tensors = _tensors(output)
+            self.records.append(TraceRecord(self._step, name, "forward",
+                                            tuple(_checksum(tensor) for tensor in tensors)))
+            if self.gradients:
+                step = self._step
+                for index, tensor in enumerate(tensors):
+                    if tensor.requires_grad:
+                        tensor.register_hook(self._gradient_hook(step, f"{name}[{index}]" if index else name))
+        return hook
+
+    def _gradient_hook(self, step: int, name: str):
+        def hook(gradient):
+            self.records.append(TraceRecord(step, name, "backward", (_checksum(gradient),)))
+        return hook
+
+    def _record_warning(self, message, category, filename, lineno, file=None, line=None):
+        match = _NONDETERMINISTIC_WARNING.match(str(message))
+        if match is None:
+            self._showwarning(message, category, filename, lineno, file, line)
+            return
+        op = self.nondeterministic_ops.setdefault(match.group(1), {"count": 0, "modules": [], "message": str(message)})
+        op["count"] += 1
+        module = (self._stack[-1] or "<model>") if self._stack else "<backward>"
+        if module not in op["modules"]:
+            op["modules"].append(module)
+
+    def __enter__(self):
+        for name, module in self.model.named_modules():
+            self._handles.append(module.register_forward_pre_hook(self._pre_hook(name)))
+            self._handles.append(module.register_forward_hook(self._forward_hook(name)))
+
+        self._catcher = warnings.catch_warnings()
+        self._catcher.__enter__()
+        warnings.simplefilter("always")  # PyTorch warns about an op only once per location otherwise
+        self._showwarning = warnings.showwarning
+        warnings.showwarning = self._record_warning
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for handle in self._handles:
+            handle.remove()
+        self._handles.clear()
+        self._stack.clear()
+        if self._catcher is not None:
+            self._catcher.__exit__(exc_type, exc_value, traceback)  # Also restores warnings.showwarning
+            self._catcher = None
+        return False
+
+
+class DivergenceReport:
+    """
+    The result of `saatgut.find_divergence`. Evaluates to True if both runs matched.
+
+    Attributes:
+        first_divergence (Tuple[TraceRecord, TraceRecord]): The first records of the two runs that differ, None if
+            they all match. One of them is None if a run has fewer records.
+        nondeterministic_ops (dict): The ops that PyTorch warned about, by name, with the number of warnings, the
+            modules in which they occurred and the message.
+        traces (Tuple[trace_torch, trace_torch]): The traces of both runs.
+    """
+    def __init__(self, traces: tuple, first_divergence: Optional[tuple]):
+        self.traces = traces
+        self.first_divergence = first_divergence
+        self.nondeterministic_ops = {}
+        for trace in traces:
+            for op, report in trace.nondeterministic_ops.items():
+                merged = self.nondeterministic_ops.setdefault(
+                    op, {"count": 0, "modules": [], "message": report["message"]})
+                merged["count"] += report["count"]
+                merged["modules"] += [module for module in report["modules"] if module not in merged["modules"]]
+
+    @property
+    def module(self) -> Optional[str]:
+        """ The name of the first module whose outputs diverged, None if both runs matched. """
+        if self.first_divergence is None:
+            return None
+        record = self.first_divergence[0] or self.first_divergence[1]
+        return record.module
+
+    def __bool__(self):
+        return self.first_divergence is None
+
+    def __str__(self):
+        if self.first_divergence is None:
+            lines = ["No divergence found"]
+        else:
+            record = self.first_divergence[0] or self.first_divergence[1]
+            lines = [f"First divergence: {record.kind} of module {record.module or '<model>'!r} in step {record.step}"]
+        for op, report in self.nondeterministic_ops.items():
+            lines.append(f"Nondeterministic op {op!r}: {report['count']}x in {', '.join(report['modules'])}")
+        return "\n".join(lines)
+
+
+@secure_import('torch')
+def find_divergence(fn: Callable, model, seed: int = 42, sample_every: int = 1, gradients: bool = True):
+    """
+    Localize nondeterminism in a PyTorch model: run `fn` twice, each time with the same initial parameters of the model
+    and after `saatgut.domesticate_everything(seed)`, trace both runs with `saatgut.trace_torch` and compare them.
+
+        report = saatgut.find_divergence(lambda: train(model, steps=5), model)
+        print(report)  # e.g. "First divergence: backward of module 'encoder.attention' in step 3"
+
+    Args:
+        fn (Callable): The workload, called without arguments. Create optimizers inside of it, so that both runs start
+            from the same state.
+        model (torch.nn.Module): The model to trace.
+        seed (int): The seed value to set before each run.
+        sample_every (int): Only record every n-th forward pass, see `saatgut.trace_torch`.
+        gradients (bool): Whether to also compare the gradients.
+
+    Returns:
+        DivergenceReport: The first divergence and the nondeterministic ops.
+    """
+    from saatgut import domesticate_everything
+
+    initial_state = copy.deepcopy(model.state_dict())
+    traces = []
+    for _ in range(2):
+        model.load_state_dict(initial_state)
+        domesticate_everything(seed)
+        with trace_torch(model, sample_every=sample_every, gradients=gradients) as trace:
+            fn()
+        traces.append(trace)
+
+    first, second = traces[0].records, traces[1].records
+    for index in range(max(len(first), len(second))):
+        expected = first[index] if index < len(first) else None
+        actual = second[index] if index < len(second) else None
+        if expected != actual:
+            return DivergenceReport(tuple(traces), (expected, actual))
+    return DivergenceReport(tuple(traces), None)
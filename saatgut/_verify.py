@@ -0,0 +1,78 @@
+"""
+This module checks whether a function is deterministic, by running it several times with the same seed and comparing
+the fingerprints of its outputs.
+"""
+from typing import Callable, List, Optional, Tuple
+
+from saatgut._fingerprint import leaf_fingerprints
+
+
+class VerificationResult:
+    """
+    The result of `saatgut.verify_deterministic`. Evaluates to True if all runs produced bit-identical outputs.
+
+    Attributes:
+        deterministic (bool): Whether all runs produced bit-identical outputs.
+        fingerprints (list): For each run, the list of (path, fingerprint) pairs of all leaves of the output.
+        first_divergence (tuple): The index of the first run that differs from the first run, and the path of its
+            first differing leaf. None if the function is deterministic.
+    """
+    def __init__(self, fingerprints: List[List[Tuple[str, str]]], first_divergence: Optional[Tuple[int, str]]):
+        self.fingerprints = fingerprints
+        self.first_divergence = first_divergence
+        self.deterministic = first_divergence is None
+
+    def __bool__(self):
+        return self.deterministic
+
+    def __repr__(self):
+        if self.deterministic:
+            return f"VerificationResult(deterministic=True, runs={len(self.fingerprints)})"
+        run, path = self.first_divergence
+        return f"VerificationResult(deterministic=False, run {run} diverges first at {path})"
+
+
+def _first_difference(expected: List[Tuple[str, str]], actual: List[Tuple[str, str]]) -> Optional[str]:
+    """ The path of the first leaf that differs, or None if both lists are the same. """
+    for (expected_path, expected_digest), (actual_path, actual_digest) in zip(expected, actual):
+        if expected_path != actual_path or expected_digest != actual_digest:
+            return expected_path
+    if len(expected) != len(actual):
+        longer = expected if len(expected) > len(actual) else actual
+        return longer[min(len(expected), len(actual))][0]
+    return None
+
+
+def verify_deterministic(fn: Callable, seed: int = 42, runs: int = 2, hard_mode: bool = False) -> VerificationResult:
+    """
+    Check whether a function is deterministic. Before each run, everything is reseeded with
+    `saatgut.domesticate_everything`. The outputs are compared leaf by leaf with fingerprints of their memory buffers,
+    so large checkpoints are hashed without converting them to Python objects:
+
+        result = saatgut.verify_deterministic(lambda: train(model, steps=10).state_dict(), seed=42, runs=3)
+        assert result, result.first_divergence
+
+    Args:
+        fn (Callable): The function to check, called without arguments. Its output can be any nesting of dicts, lists,
+            tuples, scalars, NumPy arrays, PyTorch and TensorFlow tensors and objects with a `state_dict()` method
+            (like models).
+        seed (int): The seed value to set before each run.
+        runs (int): How often to run the function, at least 2.
+        hard_mode (bool): Passed on to `saatgut.domesticate_everything`.
+
+    Returns:
+        VerificationResult: Evaluates to True if the function is deterministic, else tells where it diverged first.
+    """
+    from saatgut import domesticate_everything
+
+    if runs < 2:
+        raise ValueError("At least two runs are needed to check for determinism")
+
+    fingerprints = []
+    for run in range(runs):
+        domesticate_everything(seed, hard_mode=hard_mode)
+        fingerprints.append(list(leaf_fingerprints(fn())))
+        path = _first_difference(fingerprints[0], fingerprints[-1])
+        if path is not None:
+            return VerificationResult(fingerprints, (run, path))
+    return VerificationResult(fingerprints, None)
@@ -0,0 +1,141 @@
+"""
+This module seeds the workers of process pools, torch DataLoaders and other parallel pipelines.
+Every worker (or task) gets its own child seed derived with `saatgut.derive_seed`, so workers draw independent random
+numbers while all of them keep running in parallel.
+"""
+import multiprocessing
+from functools import partial, wraps
+from typing import Callable
+
+from saatgut._backends import installed_backends
+from saatgut._lazy import defer
+from saatgut._registry import backends
+from saatgut._secure_import import _exception_catcher, secure_import
+from saatgut._seed_sequence import derive_seed
+
+
+def seed_worker(seed: int, *key: int) -> int:
+    """
+    Seed `random`, NumPy, PyTorch and Numba (and all other backends registered with `worker=True`) of the current
+    worker with the child seed `derive_seed(seed, *key)`.
+    Libraries that the worker hasn't imported yet are seeded on their first import, so seeding a worker never imports
+    a library the worker doesn't use.
+
+    Args:
+        seed (int): The root seed, the same for all workers.
+        *key (int): Identifies the worker or task, e.g. the worker id or `(epoch, worker_id)`.
+
+    Returns:
+        int: The child seed of the worker.
+    """
+    child_seed = derive_seed(seed, *key)
+    registry = backends()
+    for package_name in installed_backends():
+        backend = registry[package_name]
+        if backend.worker:
+            defer(backend.module, "worker",
+                  _exception_catcher(package_name, partial(backend.function("seed"), child_seed)))
+    return child_seed
+
+
+def _seed_pool_worker(seed: int, counter, initializer, initargs):
+    with counter.get_lock():
+        worker_index = counter.value
+        counter.value += 1
+    seed_worker(seed, worker_index)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def pool_initializer(seed: int, initializer: Callable = None, initargs: tuple = (), context=None) -> dict:
+    """
+    Build the `initializer` and `initargs` arguments for `multiprocessing.Pool` and
+    `concurrent.futures.ProcessPoolExecutor`, so that the n-th started worker is seeded with `derive_seed(seed, n)`:
+
+        with ProcessPoolExecutor(max_workers=64, **saatgut.pool_initializer(42)) as executor:
+            ...
+
+    Note: Which task runs on which worker is decided by the pool at runtime. If the results must not depend on the
+    number of workers, seed each task with `saatgut.seeded_task` instead.
+
+    Args:
+        seed (int): The root seed.
+        initializer (Callable): Optional initializer of your own, called after seeding.
+        initargs (tuple): Arguments for your own initializer.
+        context: The multiprocessing context of the pool, defaults to the default context.
+
+    Returns:
+        dict: Keyword arguments `initializer` and `initargs` for the pool.
+    """
+    counter = (context or multiprocessing).Value('q', 0)
+    return {"initializer": _seed_pool_worker, "initargs": (seed, counter, initializer, initargs)}
+
+
+class SeededTask:
+    """
+    Wraps a function so that every call is seeded with `derive_seed(seed, task_id)` before it runs. The result of each
+    task then only depends on its task id, not on the worker it runs on or the number of workers. Can be pickled if the
+    wrapped function can be pickled:
+
+        results = executor.map(saatgut.seeded_task(augment, 42), range(len(samples)), samples)
+    """
+    def __init__(self, func: Callable, seed: int):
+        self.func = func
+        self.seed = seed
+        wraps(func)(self)
+
+    def __call__(self, task_id: int, *args, **kwargs):
+        seed_worker(self.seed, task_id)
+        return self.func(*args, **kwargs)
+
+
+def seeded_task(func: Callable, seed: int) -> SeededTask:
+    """
+    Wrap `func` so that it is seeded with the task id passed as its first argument, see `saatgut.SeededTask`.
+
+    Args:
+        func (Callable): The task function.
+        seed (int): The root seed.
+
+    Returns:
+        SeededTask: The wrapped function, called as `task(task_id, *args, **kwargs)`.
+    """
+    return SeededTask(func, seed)
+
+
+def _seed_dataloader_worker(seed: int, worker_id: int):
+    import torch
+    # The seed of the worker is `base_seed + worker_id`, where `base_seed` is drawn from the generator of the
+    # DataLoader once per epoch. Using it as the key gives each worker new, reproducible seeds in every epoch.
+    seed_worker(seed, torch.utils.data.get_worker_info().seed)
+
+
+def worker_init_fn(seed: int) -> Callable[[int], None]:
+    """
+    Build a `worker_init_fn` for `torch.utils.data.DataLoader` that seeds `random`, NumPy and PyTorch in each worker.
+    Combine it with `saatgut.torch_generator(seed)` as the `generator` of the DataLoader to make it reproducible.
+
+    Args:
+        seed (int): The root seed.
+
+    Returns:
+        Callable: The `worker_init_fn`, it can be pickled for the "spawn" start method.
+    """
+    return partial(_seed_dataloader_worker, seed)
+
+
+@secure_import('torch')
+def torch_generator(seed: int):
+    """
+    Create a `torch.Generator` seeded with `seed`, e.g. for the `generator` argument of `torch.utils.data.DataLoader`.
+
+    Args:
+        seed (int): The seed value to set.
+
+    Returns:
+        torch.Generator: The seeded generator.
+    """
+    import torch
+    generator = torch.Generator()
+    generator.manual_seed(seed)
+    return generator
@@ -0,0 +1,187 @@
+"""
+Reproducible input pipelines for PyTorch that keep their worker processes. Every sample is loaded with its own seed,
+derived from the root seed, the epoch and the index of the sample, so augmentations don't depend on which worker loads
+a sample. The order is drawn from the epoch, and the position in an epoch can be checkpointed and resumed:
+
+    from saatgut.torch import dataloader_kwargs
+
+    kwargs = dataloader_kwargs(dataset, seed=42)
+    loader = DataLoader(**kwargs, batch_size=64, num_workers=8)
+    checkpoint["sampler"] = kwargs["sampler"].state_dict(consumed=step_in_epoch * 64)
+
+The batches are the same for any `num_workers`, `prefetch_factor` and `persistent_workers`.
+"""
+import sys
+from typing import Optional, Sized
+
+import torch
+from torch.utils.data import Dataset, Sampler
+
+from saatgut._bulk import seed_for
+from saatgut._scoped import __SCOPED_FUNCTIONS__
+from saatgut._seed_sequence import derive_seed
+from saatgut._workers import torch_generator, worker_init_fn
+
+
+class DeterministicSampler(Sampler):
+    """
+    Draws a new order of the samples in every epoch, derived from the seed and the epoch, like `RandomSampler` with a
+    seeded generator. Unlike `RandomSampler`, its position can be saved with `state_dict` and restored with
+    `load_state_dict`, so a resumed run continues with the same samples in the middle of an epoch.
+
+    The epoch advances when an epoch was iterated to the end, or with `set_epoch` (like `DistributedSampler`).
+
+    Args:
+        data_source (Sized): The dataset, only its length is used.
+        seed (int): The root seed of the orders.
+        shuffle (bool): If False, the samples are returned in their original order.
+        with_epoch (bool): If True, yields `(epoch, index)` instead of `index`, for a `SeededDataset`.
+    """
+    def __init__(self, data_source: Sized, seed: int = 42, shuffle: bool = True, with_epoch: bool = False):
+        self.num_samples = len(data_source)
+        self.seed = seed
+        self.shuffle = shuffle
+        self.with_epoch = with_epoch
+        self.epoch = 0
+        self._start = 0  # The position the iteration of the current epoch starts at
+        self._yielded = 0  # How many indices the latest iterator returned
+        self._exhausted = False
+
+    def order(self, epoch: int) -> torch.Tensor:
+        """
+        Args:
+            epoch (int): The epoch.
+
+        Returns:
+            torch.Tensor: The indices of all samples in the order of the epoch.
+        """
+        if not self.shuffle:
+            return torch.arange(self.num_samples)
+        generator = torch.Generator()
+        generator.manual_seed(derive_seed(self.seed, epoch))
+        return torch.randperm(self.num_samples, generator=generator)
+
+    def __iter__(self):
+        if self._exhausted:
+            self.set_epoch(self.epoch + 1)
+        epoch, self._yielded = self.epoch, 0
+        for index in self.order(epoch)[self._start:].tolist():
+            self._yielded += 1
+            yield (epoch, index) if self.with_epoch else index
+        self._exhausted = True
+
+    def __len__(self) -> int:
+        return self.num_samples - self._start
+
+    def set_epoch(self, epoch: int):
+        """
+        Start an epoch from its beginning. Does nothing if the epoch is already running or was restored with
+        `load_state_dict`, so resumed runs can keep calling `set_epoch` in their loop.
+
+        Args:
+            epoch (int): The epoch.
+        """
+        if epoch != self.epoch or self._exhausted:
+            self.epoch, self._start, self._yielded, self._exhausted = epoch, 0, 0, False
+
+    def state_dict(self, consumed: Optional[int] = None) -> dict:
+        """
+        Save the position of the sampler, e.g. into a checkpoint.
+
+        The DataLoader takes indices from the sampler ahead of time, for the batches that workers prefetch. If it has
+        workers, pass the number of samples of the current epoch that the training loop has actually consumed.
+
+        Args:
+            consumed (int): The number of samples of this iteration consumed so far, defaults to the number of indices
+                the sampler returned.
+
+        Returns:
+            dict: The seed, the epoch, and the position in the epoch.
+        """
+        position = self._start + (self._yielded if consumed is None else consumed)
+        if position >= self.num_samples:
+            return {"seed": self.seed, "epoch": self.epoch + 1, "position": 0}
+        return {"seed": self.seed, "epoch": self.epoch, "position": position}
+
+    def load_state_dict(self, state: dict):
+        """
+        Restore a position saved with `state_dict`. The next iteration continues from there.
+
+        Args:
+            state (dict): The saved state.
+        """
+        self.seed = state["seed"]
+        self.epoch, self._start, self._yielded, self._exhausted = state["epoch"], state["position"], 0, False
+
+
+class SeededDataset(Dataset):
+    """
+    Seeds `random`, NumPy and PyTorch before loading each sample, with the seed `seed_for(seed, epoch, index) >> 32`.
+    The random augmentations of a sample then only depend on the seed, the epoch and the index, and not on the worker
+    that loads it or on the samples that worker loaded before.
+
+    Indices are `(epoch, index)` pairs from a `DeterministicSampler` with `with_epoch=True`, plain indices count as epoch
+    0. In the main process (`num_workers=0`), the global random states are restored after each batch, so the rest of the
+    program draws the same random numbers as with workers.
+
+    Args:
+        dataset (Dataset): The dataset to load the samples from.
+        seed (int): The root seed.
+    """
+    def __init__(self, dataset: Dataset, seed: int = 42):
+        self.dataset = dataset
+        self.seed = seed
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def _load(self, key, functions: list):
+        epoch, index = key if isinstance(key, tuple) else (0, key)
+        sample_seed = seed_for(self.seed, epoch, index) >> 32
+        for _, plant, _ in functions:
+            plant(sample_seed)
+        return self.dataset[index]
+
+    def __getitems__(self, keys: list) -> list:
+        # The DataLoader loads a whole batch with one call, so the global states are saved only once per batch
+        functions = [functions for name, functions in __SCOPED_FUNCTIONS__.items()
+                     if name == "random" or name in sys.modules]
+        if torch.utils.data.get_worker_info() is not None:
+            return [self._load(key, functions) for key in keys]  # Nothing else in a worker uses the global states
+
+        saved = [(restore, save()) for save, _, restore in functions]
+        try:
+            return [self._load(key, functions) for key in keys]
+        finally:
+            for restore, state in saved:
+                restore(state)
+
+    def __getitem__(self, key):
+        return self.__getitems__([key])[0]
+
+
+def dataloader_kwargs(dataset: Dataset, seed: int = 42, shuffle: bool = True) -> dict:
+    """
+    Build the arguments of a reproducible `torch.utils.data.DataLoader`: the dataset wrapped in a `SeededDataset`, a
+    `DeterministicSampler`, a `worker_init_fn` and a seeded `generator`:
+
+        kwargs = dataloader_kwargs(dataset, seed=42)
+        loader = DataLoader(**kwargs, batch_size=64, num_workers=8, persistent_workers=True)
+        kwargs["sampler"].load_state_dict(checkpoint["sampler"])  # When resuming
+
+    Randomness in a custom `collate_fn` is seeded per worker by `worker_init_fn`, so it still depends on `num_workers`.
+
+    Args:
+        dataset (Dataset): A map-style dataset.
+        seed (int): The root seed.
+        shuffle (bool): If False, the samples are loaded in their original order.
+
+    Returns:
+        dict: The keyword arguments "dataset", "sampler", "worker_init_fn" and "generator".
+    """
+    return {
+        "dataset": SeededDataset(dataset, seed),
+        "sampler": DeterministicSampler(dataset, seed, shuffle=shuffle, with_epoch=True),
+        "worker_init_fn": worker_init_fn(seed),
+        "generator": torch_generator(seed),
+    }
@@ -11,6 +11,7 @@ setup(
     author='Tim Wibiral',
     packages=find_packages(),
     install_requires=[],    # Nothing! The package checks and seeds what is available.
+    entry_points={"console_scripts": ["saatgut=saatgut.__main__:main"]},
     long_description=long_description,
     long_description_content_type='text/markdown',
     description="saatgut: seed everything, everywhere, all at once.",
@@ -0,0 +1,35 @@
+import sys
+import unittest
+
+from saatgut import available_backends
+from saatgut._backends import is_installed
+
+
+class TestBackends(unittest.TestCase):
+    def test_available_backends(self):
+        """
+        Test that installed libraries are found and the standard library is always available.
+        """
+        backends = available_backends()
+        self.assertIn("random", backends)
+        self.assertIn("numpy", backends)
+        self.assertIsNone(backends["random"])
+        self.assertIsInstance(backends["numpy"], str)
+
+    def test_available_backends_is_cached(self):
+        """
+        Test that the result is cached, and that the cached result can't be modified by the caller.
+        """
+        backends = available_backends()
+        backends["does_not_exist"] = "1.0"
+        self.assertNotIn("does_not_exist", available_backends())
+        self.assertEqual(available_backends(), available_backends(refresh=True))
+
+    def test_is_installed_does_not_import(self):
+        """
+        Test that checking for a module doesn't import it.
+        """
+        sys.modules.pop("wsgiref", None)
+        self.assertTrue(is_installed("wsgiref"))
+        self.assertNotIn("wsgiref", sys.modules)
+        self.assertFalse(is_installed("saatgut_module_that_does_not_exist"))
@@ -0,0 +1,51 @@
+import unittest
+
+from saatgut import seeds_for, seed_for
+
+
+class TestSeedsFor(unittest.TestCase):
+    def test_seeds_for_matches_seed_for(self):
+        """
+        Test that bulk seeds are the same as seeds derived one by one, for single and multi-part keys.
+        """
+        import numpy as np
+        indices = np.arange(1000)
+        seeds = seeds_for(42, indices)
+        self.assertEqual([int(s) for s in seeds[:5]], [seed_for(42, i) for i in range(5)])
+
+        keys = np.stack([np.full(1000, 3), indices], axis=1)
+        seeds = seeds_for(2 ** 70, keys)
+        self.assertEqual(int(seeds[7]), seed_for(2 ** 70, 3, 7))
+        self.assertEqual(len(set(seeds.tolist())), 1000, "Seeds of different keys collide.")
+
+    def test_seeds_for_is_independent_of_order(self):
+        """
+        Test that the seed of a key doesn't depend on the other keys or their order.
+        """
+        import numpy as np
+        keys = np.random.default_rng(0).permutation(200_000)
+        seeds = seeds_for(42, keys)
+        np.testing.assert_array_equal(seeds[np.argsort(keys)], seeds_for(42, np.arange(200_000)))
+
+    def test_seeds_for_torch(self):
+        """
+        Test that the PyTorch path gives the same bits as the NumPy path.
+        """
+        import numpy as np
+        import torch
+        keys = np.stack([np.full(100_000, 3), np.arange(100_000)], axis=1)
+        expected = seeds_for(42, keys)
+        seeds = seeds_for(42, torch.from_numpy(keys))
+        self.assertEqual(seeds.dtype, torch.int64)
+        np.testing.assert_array_equal(seeds.numpy().view(np.uint64), expected)
+
+    def test_seeds_for_empty(self):
+        """
+        Test that empty keys give empty seeds.
+        """
+        import numpy as np
+        import torch
+        self.assertEqual(seeds_for(42, np.array([], dtype=np.int64)).dtype, np.uint64)
+        self.assertEqual(seeds_for(42, np.empty((0, 2), dtype=np.int64)).shape, (0,))
+        self.assertEqual(seeds_for(42, torch.empty(0, dtype=torch.int64)).shape, (0,))
+        self.assertEqual(seeds_for(42, torch.empty(0, 2, dtype=torch.int64)).shape, (0,))
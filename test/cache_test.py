@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from saatgut import memoize_deterministic
+
+
+class TestMemoizeDeterministic(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cache_hit(self):
+        """
+        Test that a result is computed once per seed and arguments, and loaded from the cache afterwards.
+        """
+        import numpy as np
+        import torch
+        calls = []
+
+        @memoize_deterministic(seed=42, cache_dir=self.cache_dir)
+        def compute(n, scale=1.0):
+            calls.append(n)
+            return {"array": np.random.rand(n) * scale, "tensor": torch.rand(n), "name": "result"}
+
+        first = compute(5)
+        second = compute(5)
+        self.assertEqual(calls, [5])
+        self.assertTrue(np.array_equal(first["array"], second["array"]))
+        self.assertTrue(torch.equal(first["tensor"], second["tensor"]))
+        self.assertEqual(second["name"], "result")
+
+        compute(5, scale=2.0)
+        self.assertEqual(calls, [5, 5])
+
+    def test_result_is_seeded(self):
+        """
+        Test that the function is computed with the given seed, and that different seeds are cached separately.
+        """
+        import numpy as np
+        first = memoize_deterministic(lambda: np.random.rand(3), seed=1, cache_dir=self.cache_dir)
+        second = memoize_deterministic(lambda: np.random.rand(3), seed=2, cache_dir=self.cache_dir)
+        np.random.seed(1)
+        expected = np.random.rand(3)
+        self.assertTrue(np.array_equal(first(), expected))
+        self.assertFalse(np.array_equal(first(), second()))
+
+    def test_cached_arrays_are_copy_on_write(self):
+        """
+        Test that modifying a cached array doesn't modify the cache.
+        """
+        import numpy as np
+        compute = memoize_deterministic(lambda: np.zeros(4), cache_dir=self.cache_dir)
+        compute()
+        cached = compute()
+        cached[0] = 1
+        self.assertEqual(compute()[0], 0)
+
+    def test_corrupt_entry_is_recomputed(self):
+        """
+        Test that a truncated or corrupt entry is computed again and replaced, instead of raising.
+        """
+        import numpy as np
+        calls = []
+
+        @memoize_deterministic(cache_dir=self.cache_dir)
+        def compute(n):
+            calls.append(n)
+            return {"array": np.arange(n)}
+
+        compute(10)
+        entry = os.path.join(self.cache_dir, compute.cache_key(10))
+        for corrupt in ("result.pkl", "0.npy"):
+            with open(os.path.join(entry, corrupt), "r+b") as file:
+                file.truncate(10)
+            self.assertEqual(compute(10)["array"].tolist(), list(range(10)))
+        self.assertEqual(compute(10)["array"].tolist(), list(range(10)))
+        self.assertEqual(calls, [10, 10, 10])
+
+    def test_eviction(self):
+        """
+        Test that the least recently used results are removed once the cache is too large.
+        """
+        import numpy as np
+        compute = memoize_deterministic(lambda n: np.zeros(n), cache_dir=self.cache_dir, max_size=5000)
+        compute(200)
+        compute(201)
+        compute(200)  # Now more recently used than 201
+        compute(202)
+        entries = set(os.listdir(self.cache_dir))
+        self.assertIn(compute.cache_key(200), entries)
+        self.assertNotIn(compute.cache_key(201), entries)
+        self.assertIn(compute.cache_key(202), entries)
+
+    def test_cache_clear(self):
+        """
+        Test that clearing the cache of a function keeps the results of other functions and unrelated files.
+        """
+        @memoize_deterministic(cache_dir=self.cache_dir)
+        def first(n):
+            return n
+
+        @memoize_deterministic(cache_dir=self.cache_dir)
+        def second(n):
+            return -n
+
+        first(1)
+        second(1)
+        with open(os.path.join(self.cache_dir, "notes.txt"), "w") as file:
+            file.write("Not a cached result")
+
+        first.cache_clear()
+        self.assertEqual(set(os.listdir(self.cache_dir)), {second.cache_key(1), "notes.txt"})
+
+
+if __name__ == '__main__':
+    unittest.main()
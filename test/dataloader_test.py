@@ -0,0 +1,91 @@
+import random
+import unittest
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from saatgut import numpy_generators
+from saatgut.torch import DeterministicSampler, SeededDataset, dataloader_kwargs
+
+
+class AugmentedDataset(Dataset):
+    """ Draws from random, NumPy and PyTorch for every sample, like random augmentations. """
+    def __len__(self):
+        return 20
+
+    def __getitem__(self, index):
+        return torch.tensor([index, random.random(), np.random.rand(), torch.rand(1).item()], dtype=torch.float64)
+
+
+def _load(num_workers: int, epochs: int = 2, **loader_options) -> list:
+    kwargs = dataloader_kwargs(AugmentedDataset(), seed=42)
+    loader = DataLoader(**kwargs, batch_size=4, num_workers=num_workers, **loader_options)
+    return [torch.cat(list(loader)) for _ in range(epochs)]
+
+
+class TestDataLoader(unittest.TestCase):
+    def test_independent_of_workers(self):
+        """
+        Test that the order and the augmentations are the same for any number of workers and prefetch factor.
+        """
+        expected = _load(num_workers=0)
+        self.assertFalse(torch.equal(expected[0], expected[1]), "All epochs have the same samples.")
+        for options in [dict(num_workers=1), dict(num_workers=3, prefetch_factor=1),
+                        dict(num_workers=2, persistent_workers=True)]:
+            for epoch, batches in enumerate(_load(**options)):
+                self.assertTrue(torch.equal(expected[epoch], batches), f"Different samples with {options}.")
+
+    def test_main_process_state_is_restored(self):
+        """
+        Test that loading in the main process doesn't change the global random streams.
+        """
+        torch.manual_seed(0)
+        expected = torch.rand(3)
+        torch.manual_seed(0)
+        _load(num_workers=0, epochs=1)
+        self.assertTrue(torch.equal(expected, torch.rand(3)))
+
+    def test_named_generators_are_untouched(self):
+        """
+        Test that loading in the main process doesn't reseed the named NumPy generators.
+        """
+        generator = numpy_generators()["dataloader-test"]
+        self.addCleanup(numpy_generators().__delitem__, "dataloader-test")
+        state = generator.bit_generator.state
+        SeededDataset(AugmentedDataset(), seed=42).__getitems__([3, (1, 5)])
+        self.assertEqual(generator.bit_generator.state, state)
+
+    def test_resume(self):
+        """
+        Test that a sampler restored from a checkpoint continues in the middle of the epoch.
+        """
+        sampler = DeterministicSampler(range(10), seed=7)
+        full_epochs = [list(sampler), list(sampler)]
+        self.assertNotEqual(full_epochs[0], full_epochs[1])
+        self.assertEqual(sorted(full_epochs[0]), list(range(10)))
+
+        sampler = DeterministicSampler(range(10), seed=7)
+        iterator = iter(sampler)
+        first = [next(iterator) for _ in range(6)]
+        state = sampler.state_dict(consumed=4)  # Two indices were only prefetched
+        self.assertEqual(state, {"seed": 7, "epoch": 0, "position": 4})
+
+        resumed = DeterministicSampler(range(10), seed=0)
+        resumed.load_state_dict(state)
+        resumed.set_epoch(0)  # Doesn't restart the restored epoch
+        self.assertEqual(len(resumed), 6)
+        self.assertEqual(first[:4] + list(resumed), full_epochs[0])
+        self.assertEqual(list(resumed), full_epochs[1])
+
+    def test_seeded_dataset_plain_indices(self):
+        """
+        Test that plain indices load the same samples as epoch 0.
+        """
+        dataset = SeededDataset(AugmentedDataset(), seed=42)
+        self.assertTrue(torch.equal(dataset[3], dataset[(0, 3)]))
+        self.assertFalse(torch.equal(dataset[3], dataset[(1, 3)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import random
+import secrets
+import unittest
+import uuid
+
+from saatgut import DeterministicEntropy, derandomized_entropy
+
+
+class TestEntropy(unittest.TestCase):
+    def test_stream_does_not_depend_on_request_sizes(self):
+        """
+        Test that the byte stream is the same no matter how it is split into requests.
+        """
+        entropy1 = DeterministicEntropy(42, block_size=64)
+        entropy2 = DeterministicEntropy(42, block_size=1000)
+        data1 = b''.join(entropy1.randbytes(n) for n in (0, 1, 16, 100, 3, 500))
+        data2 = entropy2.randbytes(len(data1))
+        self.assertEqual(data1, data2, "Byte stream depends on the sizes of the requests.")
+
+    def test_stream_does_not_depend_on_block_size(self):
+        """
+        Test that the byte stream is the same for block sizes that are not multiples of 32-bit words.
+        """
+        expected = DeterministicEntropy(42, block_size=1 << 16).randbytes(1000)
+        for block_size in (1, 3, 5, 30, 123):
+            entropy = DeterministicEntropy(42, block_size=block_size)
+            data = b''.join(entropy.randbytes(n) for n in (7, 1, 92, 900))
+            self.assertEqual(data, expected, f"Byte stream changes with block size {block_size}.")
+
+    def test_derandomized_entropy(self):
+        """
+        Test that os.urandom, secrets, uuid4 and SystemRandom are deterministic inside the block, and restored after.
+        """
+        original_urandom = os.urandom
+
+        def draw():
+            return (os.urandom(8), secrets.token_hex(8), uuid.uuid4(), random.SystemRandom().random())
+
+        with derandomized_entropy(42):
+            draws1 = draw()
+        with derandomized_entropy(42):
+            draws2 = draw()
+
+        self.assertEqual(draws1, draws2, "Entropy was not derandomized.")
+        self.assertIs(os.urandom, original_urandom, "os.urandom was not restored.")
+        self.assertNotEqual(draw(), draw(), "Entropy of the operating system was not restored.")
@@ -0,0 +1,61 @@
+import unittest
+
+from saatgut import GeneratorRegistry, numpy_generators, restore, seed_everything, snapshot
+
+
+class TestGenerators(unittest.TestCase):
+    def test_named_generators(self):
+        """
+        Test that the generator of a name only depends on the seed and the name, and that bit generators can be chosen.
+        """
+        first, second = GeneratorRegistry(42), GeneratorRegistry(42, bit_generator="SFC64")
+        first.get("noise")
+        self.assertEqual(first["augmentation"].random(), GeneratorRegistry(42)["augmentation"].random())
+        self.assertNotEqual(first["augmentation"].random(), first["noise"].random())
+        self.assertEqual(type(second["noise"].bit_generator).__name__, "SFC64")
+        self.assertEqual(type(second.get("noise2", bit_generator="Philox").bit_generator).__name__, "Philox")
+        with self.assertRaises(ValueError):
+            GeneratorRegistry(42, bit_generator="Xorshift")
+
+    def test_seed_everything_reseeds_in_place(self):
+        """
+        Test that seeding resets the registered generators, without replacing them.
+        """
+        generator = numpy_generators()["component"]
+        seed_everything(42)
+        first = generator.random(3).tolist()
+        seed_everything(42)
+        self.assertIs(numpy_generators()["component"], generator)
+        self.assertEqual(generator.random(3).tolist(), first)
+
+    def test_reroute_default_rng(self):
+        """
+        Test that rerouted default_rng() calls are reproducible, and that explicit seeds are kept.
+        """
+        import numpy as np
+        registry = numpy_generators()
+        registry.reroute_default_rng()
+        try:
+            seed_everything(7)
+            first = [np.random.default_rng().random() for _ in range(2)]
+            seed_everything(7)
+            self.assertEqual([np.random.default_rng().random() for _ in range(2)], first)
+            self.assertNotEqual(first[0], first[1])
+            self.assertEqual(np.random.default_rng(5).random(), np.random.Generator(np.random.PCG64(5)).random())
+        finally:
+            registry.restore_default_rng()
+        self.assertIsNot(np.random.default_rng, registry.default_rng)
+
+    def test_snapshot(self):
+        """
+        Test that snapshots capture and restore the registered generators, also after serialization.
+        """
+        generator = numpy_generators()["snapshot"]
+        data = bytes(snapshot())
+        expected = generator.random(3).tolist()
+        restore(data)
+        self.assertEqual(generator.random(3).tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
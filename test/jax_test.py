@@ -0,0 +1,62 @@
+import unittest
+
+
+class TestJax(unittest.TestCase):
+    def test_seed_jax_stores_root_key(self):
+        """
+        Test that seed_jax stores its root key in the key manager.
+        """
+        import jax.numpy as jnp
+        from saatgut import seed_jax, jax_keys
+        root = seed_jax(42)
+        self.assertTrue(jnp.array_equal(root, jax_keys().root))
+        self.assertEqual(jax_keys().seed, 42)
+
+    def test_named_keys(self):
+        """
+        Test that named keys only depend on the seed and the name, not on the order of the calls.
+        """
+        import jax.numpy as jnp
+        from saatgut import KeyManager
+        first, second = KeyManager(42), KeyManager(42)
+        first.key("dropout")
+        self.assertTrue(jnp.array_equal(first.key("init"), second.key("init")))
+        self.assertFalse(jnp.array_equal(first.key("init"), first.key("dropout")))
+
+    def test_counter_keys(self):
+        """
+        Test that counter keys are reproducible across batches and all different.
+        """
+        import numpy as np
+        from saatgut import KeyManager
+        first, second = KeyManager(42, batch_size=4), KeyManager(42, batch_size=4)
+        keys = [next(first) for _ in range(10)]
+        self.assertTrue(all(np.array_equal(key, next(second)) for key in keys))
+        self.assertEqual(len({tuple(np.asarray(key)) for key in keys}), 10)
+        self.assertEqual(first.split(3).shape[0], 3)
+
+    def test_step_key_in_jit(self):
+        """
+        Test that step keys can be derived inside jax.jit, and match the ones derived outside.
+        """
+        import jax
+        import jax.numpy as jnp
+        from saatgut import KeyManager, step_key
+        keys = KeyManager(42)
+        traced = jax.jit(lambda step: step_key(keys.root, step))(jnp.uint32(5))
+        self.assertTrue(jnp.array_equal(traced, keys.step_key(5)))
+        self.assertFalse(jnp.array_equal(keys.step_key(5), keys.step_key(6)))
+
+    def test_device_key(self):
+        """
+        Test that every mapped device (here: every vmapped entry) gets its own key.
+        """
+        import jax
+        from saatgut import KeyManager, device_key
+        key = KeyManager(42).root
+        keys = jax.vmap(lambda _: device_key(key, "devices"), axis_name="devices")(jax.numpy.arange(2))
+        self.assertFalse(jax.numpy.array_equal(keys[0], keys[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
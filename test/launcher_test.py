@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from saatgut._launcher import launch_environment, scan_imports
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SCRIPT = """
+import os
+import random
+import sys
+import numpy as np
+print(hash("saatgut"), random.random(), np.random.rand(), os.environ["OMP_NUM_THREADS"], sys.argv[1:])
+"""
+
+
+class TestLauncher(unittest.TestCase):
+    def test_launch_environment(self):
+        """
+        Test that each profile includes the variables of the profiles before it.
+        """
+        self.assertEqual(launch_environment(7, "seed"), {"PYTHONHASHSEED": "7"})
+        self.assertEqual(launch_environment(7)["TF_DETERMINISTIC_OPS"], "1")
+        self.assertNotIn("OMP_NUM_THREADS", launch_environment(7))
+        self.assertEqual(launch_environment(7, "hard")["OMP_NUM_THREADS"], "1")
+        with self.assertRaises(ValueError):
+            launch_environment(7, "soft")
+
+    def test_scan_imports(self):
+        """
+        Test that the backends a script imports are found, including through aliases like keras.
+        """
+        with tempfile.NamedTemporaryFile('w', suffix=".py", delete=False) as file:
+            file.write("import os\nimport numpy as np\nfrom keras import layers\n"
+                       "def f():\n    import torch.nn\nfrom . import sibling\n")
+        try:
+            self.assertEqual(scan_imports(file.name), {"numpy", "tensorflow", "torch"})
+        finally:
+            os.remove(file.name)
+
+    def test_run_is_reproducible(self):
+        """
+        Test that scripts launched with the same seed produce the same hashes and random numbers, and that the manifest
+        records the settings.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            script, manifest = os.path.join(directory, "script.py"), os.path.join(directory, "manifest.json")
+            with open(script, 'w') as file:
+                file.write(_SCRIPT)
+            environment = {**os.environ, "PYTHONPATH": _ROOT}
+            command = [sys.executable, "-m", "saatgut", "run", "--seed", "7", "--profile", "hard",
+                       "--manifest", manifest, "--", script, "argument"]
+            outputs = [subprocess.run(command, env=environment, capture_output=True, text=True, check=True).stdout
+                       for _ in range(2)]
+
+            self.assertEqual(outputs[0], outputs[1])
+            self.assertTrue(outputs[0].strip().endswith("1 ['argument']"))
+            with open(manifest) as file:
+                settings = json.load(file)
+            self.assertEqual(settings["seed"], 7)
+            self.assertEqual(settings["environment"]["PYTHONHASHSEED"], "7")
+            self.assertIn("numpy", settings["preloaded_backends"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import saatgut
+from saatgut import seed_everything
+from saatgut._lazy import defer, pending_modules
+
+
+class TestLazy(unittest.TestCase):
+    def test_lazy_seed_everything_reproducibility(self):
+        """
+        Test that lazy seeding seeds modules that are already imported right away.
+        """
+        import random
+        import numpy as np
+
+        seed_everything(42, lazy=True)
+        rand_num1, np_rand_num1 = random.random(), np.random.rand()
+
+        seed_everything(42, lazy=True)
+        rand_num2, np_rand_num2 = random.random(), np.random.rand()
+
+        self.assertEqual(rand_num1, rand_num2, "Random numbers are not equal, lazy seeding failed.")
+        self.assertEqual(np_rand_num1, np_rand_num2, "NumPy random numbers are not equal, lazy seeding failed.")
+
+    def test_defer_runs_on_first_import(self):
+        """
+        Test that deferred callbacks run once the module is imported, and only the latest callback per tag is kept.
+        """
+        calls = []
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "saatgut_lazy_dummy.py"), "w") as f:
+                f.write("VALUE = 1\n")
+            sys.path.insert(0, directory)
+            try:
+                defer("saatgut_lazy_dummy", "seed", lambda: calls.append(1))
+                defer("saatgut_lazy_dummy", "seed", lambda: calls.append(2))
+                self.assertEqual(calls, [], "Callback ran before the module was imported.")
+
+                import saatgut_lazy_dummy
+                self.assertEqual(saatgut_lazy_dummy.VALUE, 1)
+                self.assertNotIn("saatgut_lazy_dummy", pending_modules())
+                self.assertEqual(calls, [2], "Deferred callback was not applied exactly once.")
+                self.assertNotIsInstance(saatgut_lazy_dummy.__loader__, type(sys.meta_path[0]))
+            finally:
+                sys.path.remove(directory)
+                sys.modules.pop("saatgut_lazy_dummy", None)
+
+    def test_eager_call_replaces_pending(self):
+        """
+        Test that an eager call cancels the pending planters of an older lazy call, instead of running them first.
+        """
+        seeds = []
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "saatgut_lazy_dummy.py"), "w") as f:
+                f.write("VALUE = 1\n")
+            sys.path.insert(0, directory)
+            saatgut.register_backend("dummy", lambda seed: seeds.append(seed), module="saatgut_lazy_dummy")
+            try:
+                seed_everything(1, lazy=True)
+                self.assertIn("saatgut_lazy_dummy", pending_modules())
+                seed_everything(2)
+                self.assertNotIn("saatgut_lazy_dummy", pending_modules())
+                self.assertEqual(seeds, [2])
+            finally:
+                saatgut.unregister_backend("dummy")
+                sys.path.remove(directory)
+                sys.modules.pop("saatgut_lazy_dummy", None)
+
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from saatgut._seed_numba import _seed_thread_pool, seed_numba
+
+
+class TestNumba(unittest.TestCase):
+    def test_seed_numba_reproducibility(self):
+        """
+        Test that seed_numba makes random numbers in compiled code reproducible.
+        """
+        import numba
+        import numpy as np
+
+        @numba.njit
+        def draw():
+            return np.random.random()
+
+        seed_numba(42)
+        first = draw()
+        seed_numba(42)
+        self.assertEqual(first, draw())
+
+    def test_seed_numba_parallel_reproducibility(self):
+        """
+        Test that seed_numba makes parallel kernels reproducible, with different streams in different threads.
+        """
+        import numba
+        import numpy as np
+
+        @numba.njit(parallel=True)
+        def noise(n):
+            result = np.empty(n)
+            for i in numba.prange(n):
+                result[i] = np.random.random()
+            return result
+
+        self.assertTrue(_seed_thread_pool(42), "Not every thread of the pool was seeded.")
+        seed_numba(42)
+        first = noise(10_000)
+        seed_numba(42)
+        self.assertTrue(np.array_equal(first, noise(10_000)))
+        self.assertEqual(len(np.unique(first)), len(first))
+
+    def test_seed_everything_seeds_calling_thread(self):
+        """
+        Test that seed_everything seeds Numba in the calling thread, also when it initializes cold backends in parallel.
+        """
+        code = ("import sys, saatgut\n"
+                "assert 'numba' not in sys.modules and 'numpy' not in sys.modules\n"
+                "saatgut.seed_everything(42)\n"
+                "assert saatgut.report().backends['numba'].status == 'seeded'\n"
+                "import numba, numpy as np\n"
+                "draw = numba.njit(lambda: np.random.random())\n"
+                "first = draw()\n"
+                "saatgut.seed_numba(42)\n"
+                "assert draw() == first, 'The calling thread was not seeded'\n")
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+
+if __name__ == '__main__':
+    unittest.main()
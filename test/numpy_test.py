@@ -1,4 +1,6 @@
+import os
 import unittest
+from unittest import mock
 
 from saatgut import seed_numpy
 
@@ -27,3 +29,32 @@ class TestNumpy(unittest.TestCase):
 
         # Check if both arrays are equal
         np.testing.assert_array_equal(array1, array2, "Arrays are not equal, seeding failed.")
+
+    @mock.patch.dict(os.environ)  # Restores the environment variables that domesticate_numpy sets
+    def test_domesticate_numpy_reproducibility(self):
+        """
+        Test that domesticate_numpy with disabled parallelism is reproducible and limits BLAS to one thread.
+        """
+        import numpy as np
+        from saatgut import domesticate_numpy, threadpool_info, limit_threads
+
+        with limit_threads(2):  # Restores the previous number of threads afterwards
+            domesticate_numpy(42, disable_parallelism=True)
+            array1 = np.random.rand(3, 3)
+            self.assertTrue(all(info["num_threads"] == 1 for info in threadpool_info() if info["api"] == "blas"))
+
+        domesticate_numpy(42)
+        array2 = np.random.rand(3, 3)
+        np.testing.assert_array_equal(array1, array2, "Arrays are not equal, domestication failed.")
+
+    def test_limit_threads_restores(self):
+        """
+        Test that limit_threads restores the previous number of threads of each library.
+        """
+        import numpy as np  # noqa: F401, loads BLAS
+        from saatgut import limit_threads, threadpool_info
+
+        before = [info["num_threads"] for info in threadpool_info()]
+        with limit_threads(1):
+            self.assertTrue(all(info["num_threads"] == 1 for info in threadpool_info()))
+        self.assertEqual([info["num_threads"] for info in threadpool_info()], before)
@@ -0,0 +1,46 @@
+import time
+import unittest
+
+from saatgut import profile_determinism, fingerprint
+
+
+class TestProfileDeterminism(unittest.TestCase):
+    def test_fingerprint(self):
+        """
+        Test that fingerprints only match for identical structures and contents.
+        """
+        import numpy as np
+        import torch
+        output = {"array": np.arange(4), "tensor": torch.ones(2, dtype=torch.bfloat16), "values": [1, 2.5, "a"]}
+        same = {"array": np.arange(4), "tensor": torch.ones(2, dtype=torch.bfloat16), "values": [1, 2.5, "a"]}
+        self.assertEqual(fingerprint(output), fingerprint(same))
+        self.assertNotEqual(fingerprint(np.arange(4)), fingerprint(np.arange(4.0)))
+        self.assertNotEqual(fingerprint([1, 2]), fingerprint((1, 2)))
+
+    def test_reproducible_workload(self):
+        """
+        Test that no settings are recommended for a workload that is reproducible with seeding alone.
+        """
+        import torch
+        profile = profile_determinism(lambda: torch.rand(8) @ torch.rand(8, 8), seed=42)
+        self.assertTrue(profile.baseline.reproducible)
+        self.assertEqual(profile.recommended, ())
+        self.assertIn("matmul_precision", profile.knobs)
+
+    def test_recommends_needed_setting(self):
+        """
+        Test that the setting that makes a workload reproducible is recommended, and restored afterwards.
+        """
+        import torch
+        previous = torch.backends.cudnn.deterministic
+        torch.backends.cudnn.deterministic = False
+
+        def workload():
+            return 0.0 if torch.backends.cudnn.deterministic else time.perf_counter()
+
+        profile = profile_determinism(workload, seed=42)
+        self.assertFalse(profile.baseline.reproducible)
+        self.assertEqual(profile.recommended, ("cudnn.deterministic",))
+        self.assertEqual(profile.settings, ["domesticate_torch(seed)"])
+        self.assertFalse(torch.backends.cudnn.deterministic, "Setting was not restored.")
+        torch.backends.cudnn.deterministic = previous
@@ -0,0 +1,144 @@
+import functools
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import saatgut
+from saatgut import _registry
+from saatgut._registry import Backend
+from saatgut._secure_import import secure_import
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.directory.name)
+        with open(os.path.join(self.directory.name, "saatgut_simulator.py"), "w") as f:
+            f.write("STATE = {'seed': None}\n"
+                    "def seed(seed):\n    STATE['seed'] = seed\n"
+                    "def get_state():\n    return STATE['seed']\n"
+                    "def set_state(state):\n    STATE['seed'] = state\n")
+
+    def tearDown(self):
+        saatgut.unregister_backend("simulator")
+        sys.path.remove(self.directory.name)
+        sys.modules.pop("saatgut_simulator", None)
+        self.directory.cleanup()
+
+    def test_register_backend(self):
+        """
+        Test that a registered backend is seeded by seed_everything and captured by snapshots, and that its functions
+        are only imported when they are used.
+        """
+        saatgut.register_backend("simulator", "saatgut_simulator:seed", snapshot_fn="saatgut_simulator:get_state",
+                                 restore_fn="saatgut_simulator:set_state", module="saatgut_simulator")
+        self.assertNotIn("saatgut_simulator", sys.modules)
+
+        saatgut.seed_everything(42)
+        simulator = sys.modules["saatgut_simulator"]
+        self.assertEqual(simulator.STATE["seed"], 42)
+        self.assertEqual(saatgut.report().backends["simulator"].status, "seeded")
+
+        snap = saatgut.snapshot()
+        simulator.STATE["seed"] = 7
+        saatgut.restore(bytes(snap))
+        self.assertEqual(simulator.STATE["seed"], 42)
+
+        saatgut.unregister_backend("simulator")
+        saatgut.seed_everything(1)
+        self.assertEqual(simulator.STATE["seed"], 42)
+        self.assertNotIn("simulator", saatgut.report().backends)
+
+    def test_decorated_seed_function(self):
+        """
+        Test that the decorators of a seed function run, also around a function decorated with `secure_import`.
+        """
+        calls, seeds = [], []
+
+        def logged(func):
+            @functools.wraps(func)
+            def wrapper(seed):
+                calls.append(seed)
+                return func(seed=seed)
+            return wrapper
+
+        @logged
+        @secure_import("saatgut_simulator")
+        def seed(seed):
+            seeds.append(seed)
+
+        saatgut.register_backend("simulator", seed, module="saatgut_simulator")
+        saatgut.seed_everything(42)
+        saatgut.Seeder(["simulator"])(7)
+        self.assertEqual(calls, [42, 7])
+        self.assertEqual(seeds, [42, 7])
+
+    def test_missing_module_is_skipped(self):
+        """
+        Test that a backend whose module is not installed is reported as skipped.
+        """
+        saatgut.register_backend("simulator", "saatgut_simulator:seed", module="saatgut_module_that_does_not_exist")
+        saatgut.seed_everything(42)
+        self.assertEqual(saatgut.report().backends["simulator"].status, "not installed")
+
+    def test_entry_points(self):
+        """
+        Test that backends are discovered from entry points once, and that broken entry points are skipped.
+        """
+        def broken():
+            raise RuntimeError("broken")
+
+        entry_points = [mock.Mock(load=lambda: Backend("simulator", "saatgut_simulator:seed",
+                                                       module="saatgut_simulator")),
+                        mock.Mock(load=lambda: broken)]
+        entry_points[0].name, entry_points[1].name = "simulator", "broken"
+        _registry._load_entry_points.cache_clear()
+        try:
+            with mock.patch.object(_registry, "_entry_points", return_value=entry_points) as found:
+                with self.assertLogs("saatgut", level="ERROR"):
+                    self.assertIn("simulator", _registry.backends())
+                _registry.backends()
+            self.assertEqual(found.call_count, 1)
+        finally:
+            _registry._load_entry_points.cache_clear()
+
+    def test_import_is_lazy(self):
+        """
+        Test that importing saatgut doesn't import any backend module, and that public names are loaded on first use.
+        """
+        code = ("import sys, saatgut\n"
+                "assert not [m for m in sys.modules if m.startswith('saatgut._seed')], sys.modules\n"
+                "assert 'importlib.metadata' not in sys.modules\n"
+                "from saatgut import seed_numpy\n"
+                "assert 'saatgut._seed_numpy' in sys.modules\n")
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+    def test_function_views(self):
+        """
+        Test that the tables of seeding functions of earlier versions are read-only views of the registry.
+        """
+        self.assertIs(saatgut.__ALL_SEEDING_FUNCTIONS__["numpy"], saatgut.seed_numpy)
+        self.assertIs(saatgut.__ALL_CULTIVATION_FUNCTIONS__["torch"], saatgut.domesticate_torch)
+        saatgut.register_backend("simulator", "saatgut_simulator:seed", module="saatgut_simulator")
+        self.assertEqual(list(saatgut.__ALL_SEEDING_FUNCTIONS__), list(_registry.backends()))
+        self.assertIs(saatgut.__ALL_CULTIVATION_FUNCTIONS__["simulator"], sys.modules["saatgut_simulator"].seed)
+        with self.assertRaises(TypeError):
+            saatgut.__ALL_SEEDING_FUNCTIONS__["other"] = lambda seed: None
+
+    def test_star_import(self):
+        """
+        Test that a star import provides all public names, also the ones that are loaded lazily.
+        """
+        namespace = {}
+        exec("from saatgut import *", namespace)
+        for name in ("seed_everything", "domesticate_everything", "seed_numpy", "seed_torch", "seed_random",
+                     "domesticate_numpy", "domesticate_torch", "seeded", "register_backend", "Seeder"):
+            self.assertIn(name, namespace)
+        self.assertFalse([name for name in namespace if name.startswith("_") and name != "__builtins__"])
+
+
+if __name__ == '__main__':
+    unittest.main()
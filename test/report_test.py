@@ -0,0 +1,65 @@
+import json
+import unittest
+
+import saatgut
+from saatgut import add_hook, remove_hook, report, seed_everything
+
+
+class TestReport(unittest.TestCase):
+    def test_report(self):
+        """
+        Test that the report records every backend with its status, settings and times, and exports to JSON.
+        """
+        saatgut.domesticate_everything(42)
+        seeding_report = report()
+        self.assertEqual(seeding_report.function, "domesticate_everything")
+        self.assertEqual(seeding_report.seed, 42)
+        self.assertGreaterEqual(seeding_report.seconds, 0)
+
+        numpy_report = seeding_report.backends["numpy"]
+        self.assertEqual(numpy_report.status, "seeded")
+        self.assertEqual(numpy_report.settings, {"function": "domesticate_numpy", "seed": 42})
+        self.assertGreaterEqual(numpy_report.seeding_seconds, 0)
+        self.assertIsNotNone(numpy_report.import_seconds)
+
+        exported = json.loads(seeding_report.to_json())
+        self.assertEqual(set(exported["backends"]), set(saatgut._registry.backends()))
+        self.assertIn("domesticate_everything", str(seeding_report))
+
+    def test_failure_is_reported(self):
+        """
+        Test that an error while seeding a backend is recorded and logged instead of raised.
+        """
+        def fail(seed):
+            raise RuntimeError("broken")
+
+        saatgut.register_backend("broken", fail, module="json")
+        self.addCleanup(saatgut.unregister_backend, "broken")
+        with self.assertLogs("saatgut", level="ERROR") as logs:
+            seed_everything(42)
+        self.assertEqual(report().backends["broken"].status, "failed")
+        self.assertEqual(report().backends["broken"].error, "RuntimeError: broken")
+        self.assertIn("broken", logs.output[0])
+        self.assertEqual(report().backends["random"].status, "seeded")
+
+    def test_hooks(self):
+        """
+        Test that hooks receive an event for the start, every backend and the end of a call.
+        """
+        events = []
+        add_hook(events.append)
+        try:
+            seed_everything(42)
+        finally:
+            remove_hook(events.append)
+        self.assertEqual(events[0]["event"], "start")
+        self.assertEqual(events[-1]["event"], "finish")
+        self.assertIn(("seeded", "random"), [(event["event"], event.get("backend")) for event in events])
+
+        seed_everything(42)
+        self.assertEqual(events[-1]["event"], "finish")
+        self.assertEqual(len([event for event in events if event["event"] == "start"]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from saatgut import initialization_timings
+from saatgut import _scheduler
+from saatgut._report import start_report
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.directory.name)
+        for name, source in [("saatgut_slow_dummy", "import time\ntime.sleep(0.2)\nDONE = True\n"),
+                             ("saatgut_env_dummy", "import os\nHASH_SEED = os.environ.get('PYTHONHASHSEED')\n")]:
+            with open(os.path.join(self.directory.name, name + ".py"), "w") as f:
+                f.write(source)
+
+    def tearDown(self):
+        sys.path.remove(self.directory.name)
+        for name in ("saatgut_slow_dummy", "saatgut_env_dummy"):
+            sys.modules.pop(name, None)
+        self.directory.cleanup()
+
+    def test_prepares_run_before_imports(self):
+        """
+        Test that environment variables are set before any backend is imported, and that timings are recorded.
+        """
+        report = start_report("test", 7)
+        planters = {name: report.track(name, lambda: None) for name in ("saatgut_slow_dummy", "saatgut_env_dummy")}
+        with mock.patch.dict(os.environ, {"PYTHONHASHSEED": "0"}):
+            prepares = {"saatgut_env_dummy": lambda: os.environ.update(PYTHONHASHSEED="7")}
+            _scheduler.initialize(planters, prepares=prepares, parallel=True)
+        self.assertEqual(sys.modules["saatgut_env_dummy"].HASH_SEED, "7")
+
+        timings = initialization_timings()
+        self.assertEqual(set(timings), {"saatgut_slow_dummy", "saatgut_env_dummy"})
+        self.assertGreaterEqual(timings["saatgut_slow_dummy"]["import"], 0.2)
+        self.assertTrue(timings["saatgut_env_dummy"]["thread"].startswith("saatgut"))
+
+    def test_configure_after(self):
+        """
+        Test that a backend is only configured once the backends it depends on are imported, in both modes.
+        """
+        for parallel in (True, False):
+            sys.modules.pop("saatgut_slow_dummy", None)
+            sys.modules.pop("saatgut_env_dummy", None)
+            seen = []
+            with mock.patch.dict(_scheduler.__CONFIGURE_AFTER__, {"saatgut_env_dummy": ("saatgut_slow_dummy",)}):
+                _scheduler.initialize({
+                    "saatgut_env_dummy":
+                        lambda: seen.append(hasattr(sys.modules.get("saatgut_slow_dummy"), "DONE")),
+                    "saatgut_slow_dummy": lambda: None,
+                }, parallel=parallel)
+            self.assertEqual(seen, [True])
+
+    def test_thread_local_backends_run_in_calling_thread(self):
+        """
+        Test that the planters of thread-local backends run in the calling thread, also when the others run in the pool.
+        """
+        threads = {}
+        _scheduler.initialize({name: (lambda name=name: threads.update({name: threading.current_thread()}))
+                               for name in ("saatgut_slow_dummy", "saatgut_env_dummy")},
+                              parallel=True, thread_local=["saatgut_env_dummy"])
+        self.assertIs(threads["saatgut_env_dummy"], threading.current_thread())
+        self.assertIsNot(threads["saatgut_slow_dummy"], threading.current_thread())
+        self.assertIn("saatgut_env_dummy", sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import threading
+import unittest
+
+from saatgut import numpy_generators, seeded, seed_everything
+
+
+class TestSeeded(unittest.TestCase):
+    @staticmethod
+    def _draw():
+        import numpy as np
+        import torch
+        return random.random(), np.random.rand(), torch.rand(1).item()
+
+    def test_seeded_is_reproducible(self):
+        """
+        Test that blocks with the same seed draw the same numbers.
+        """
+        with seeded(7):
+            draws1 = self._draw()
+        with seeded(7):
+            draws2 = self._draw()
+        self.assertEqual(draws1, draws2, "Seeded blocks are not reproducible.")
+
+    def test_seeded_restores_global_state(self):
+        """
+        Test that the global random streams continue as if the block never ran.
+        """
+        seed_everything(42)
+        expected = [self._draw() for _ in range(2)]
+
+        seed_everything(42)
+        first = self._draw()
+        with seeded(7):
+            self._draw()
+            with seeded(8):
+                self._draw()
+            self._draw()
+        second = self._draw()
+
+        self.assertEqual([first, second], expected, "Global states were not restored.")
+
+    def test_seeded_keeps_named_generators(self):
+        """
+        Test that the named NumPy generators continue their streams across a block.
+        """
+        generator = numpy_generators()["scoped-test"]
+        self.addCleanup(numpy_generators().__delitem__, "scoped-test")
+        seed_everything(42)
+        expected = generator.random(2).tolist()
+
+        seed_everything(42)
+        first = generator.random()
+        with seeded(7):
+            pass
+        self.assertEqual([first, generator.random()], expected, "A named generator was reseeded.")
+
+    def test_seeded_decorator_is_reentrant(self):
+        """
+        Test that a decorated function can call itself.
+        """
+        @seeded(7, backends=["random"])
+        def draw(depth):
+            value = random.random()
+            return [value] + (draw(depth - 1) if depth else [])
+
+        seed_everything(42)
+        expected = random.random()
+        seed_everything(42)
+        draws = draw(2)
+
+        self.assertEqual(len(set(draws)), 1, "Nested calls were not seeded.")
+        self.assertEqual(random.random(), expected, "Global state was not restored.")
+
+    def test_seeded_stacks_are_per_thread(self):
+        """
+        Test that a thread leaving a block restores the state it saved, even if another thread entered the same
+        decorated function in the meantime.
+        """
+        entered, other_entered, left = threading.Event(), threading.Event(), threading.Event()
+
+        @seeded(7, backends=["random"])
+        def wait(own: threading.Event, other: threading.Event):
+            own.set()
+            other.wait()
+
+        random.seed(42)
+        expected = random.getstate()
+        first = threading.Thread(target=wait, args=(entered, other_entered))
+        second = threading.Thread(target=wait, args=(other_entered, left))
+        first.start()
+        entered.wait()
+        second.start()
+        first.join()
+        restored = random.getstate()
+        left.set()
+        second.join()
+        self.assertEqual(restored, expected, "A thread restored the state saved by another thread.")
+
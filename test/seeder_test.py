@@ -0,0 +1,56 @@
+import random
+import unittest
+
+import numpy as np
+import torch
+
+import saatgut
+from saatgut import Seeder
+
+
+class TestSeeder(unittest.TestCase):
+    def test_same_as_seed_everything(self):
+        """
+        Test that a seeder draws the same random numbers as seed_everything with the same seed.
+        """
+        saatgut.seed_everything(123)
+        expected = (random.random(), np.random.rand(), torch.rand(1).item())
+
+        seeder = Seeder(["random", "numpy", "torch"])
+        self.assertEqual(seeder.backends, ["random", "numpy", "torch"])
+        seeder(123)
+        self.assertEqual((random.random(), np.random.rand(), torch.rand(1).item()), expected)
+
+    def test_reseeds_numpy_generators(self):
+        """
+        Test that a seeder only reseeds the named generators of numpy_generators with `generators=True`.
+        """
+        generator = saatgut.numpy_generators()["seeder-test"]
+        self.addCleanup(saatgut.numpy_generators().__delitem__, "seeder-test")
+        state = generator.bit_generator.state
+        Seeder(["numpy"])(5)
+        self.assertEqual(generator.bit_generator.state, state)
+
+        seeder = Seeder(["numpy"], generators=True)
+        seeder(5)
+        first = generator.random()
+        seeder(5)
+        self.assertEqual(generator.random(), first)
+
+    def test_backends(self):
+        """
+        Test that unknown backends are rejected, and that libraries which are not installed are skipped.
+        """
+        with self.assertRaises(ValueError):
+            Seeder(["does_not_exist"])
+        saatgut.register_backend("missing", lambda seed: None, module="saatgut_module_that_does_not_exist")
+        try:
+            with self.assertLogs("saatgut", level="WARNING"):
+                self.assertEqual(Seeder(["random", "missing"]).backends, ["random"])
+        finally:
+            saatgut.unregister_backend("missing")
+        self.assertIn("random", Seeder().backends)
+
+
+if __name__ == '__main__':
+    unittest.main()
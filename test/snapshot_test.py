@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from saatgut import snapshot, restore, Snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    @staticmethod
+    def _draw(generator):
+        import numpy as np
+        import torch
+        return random.random(), np.random.rand(), torch.rand(1).item(), generator.random()
+
+    def test_snapshot_restore(self):
+        """
+        Test that restoring a snapshot brings back the states of all random number generators.
+        """
+        import numpy as np
+        import torch  # noqa: F401, captured because it is imported
+        generator = np.random.default_rng(42)
+
+        snap = snapshot(generators={"generator": generator})
+        draws1 = self._draw(generator)
+        restore(snap)
+        draws2 = self._draw(generator)
+
+        self.assertEqual(draws1, draws2, "Restored states differ from the captured states.")
+
+    def test_serialized_snapshot(self):
+        """
+        Test that a serialized snapshot is compact and can be restored.
+        """
+        import numpy as np
+        import torch  # noqa: F401, captured because it is imported
+        generator = np.random.default_rng(42)
+
+        data = bytes(snapshot(generators={"generator": generator}))
+        draws1 = self._draw(generator)
+        restore(Snapshot.from_bytes(data), generators={"generator": generator})
+        draws2 = self._draw(generator)
+
+        self.assertEqual(draws1, draws2, "Restored states differ from the captured states.")
+        self.assertLess(len(data), 16 * 1024, "Serialized snapshot is too large.")
+
+    def test_snapshot_selected_backends(self):
+        """
+        Test that only the requested libraries are captured.
+        """
+        snap = snapshot(backends=["random"])
+        self.assertEqual(snap.backends, ("random",))
+        self.assertEqual(Snapshot.from_bytes(bytes(snap)).states, snap.states)
+
+    def test_unsupported_backends(self):
+        """
+        Test that unknown backends and backends without snapshot support are rejected with their names.
+        """
+        import saatgut
+        saatgut.register_backend("no_snapshot", lambda seed: None, module="random")
+        self.addCleanup(saatgut.unregister_backend, "no_snapshot")
+        with self.assertRaisesRegex(ValueError, "does_not_exist"):
+            snapshot(backends=["does_not_exist"])
+        with self.assertRaisesRegex(ValueError, "no_snapshot"):
+            snapshot(backends=["random", "no_snapshot"])
+
+        snap = snapshot(backends=["random"])
+        snap.states["does_not_exist"] = None
+        with self.assertRaisesRegex(ValueError, "does_not_exist"):
+            restore(snap)
+        with self.assertRaisesRegex(ValueError, "does_not_exist"):
+            restore(bytes(snap))
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from saatgut import StreamManager
+
+
+class TestStreams(unittest.TestCase):
+    def test_streams_are_reproducible(self):
+        """
+        Test that a stream draws the same numbers in every run, and different keys give different streams.
+        """
+        streams = StreamManager(42)
+        with streams.stream("request-1"):
+            draws1 = (streams.random.random(), streams.numpy.random(), streams.torch.initial_seed())
+        with streams.stream("request-1"):
+            draws2 = (streams.random.random(), streams.numpy.random(), streams.torch.initial_seed())
+        with streams.stream("request-2"):
+            draws3 = (streams.random.random(), streams.numpy.random(), streams.torch.initial_seed())
+
+        self.assertEqual(draws1, draws2, "Streams with the same key are not reproducible.")
+        self.assertNotEqual(draws1, draws3, "Streams with different keys draw the same numbers.")
+
+    def test_keys_of_different_types(self):
+        """
+        Test that keys with the same bytes but different types give different streams and generators.
+        """
+        from saatgut import GeneratorRegistry
+        streams = StreamManager(42)
+        draws = []
+        for key in ("a", b"a", 353):
+            with streams.stream(key):
+                draws.append(streams.numpy.random())
+        self.assertEqual(len(set(draws)), 3, "Keys of different types share a stream.")
+
+        registry = GeneratorRegistry(42)
+        self.assertEqual(len({registry[key].random() for key in ("a", b"a", 353)}), 3)
+
+    def test_streams_in_threads(self):
+        """
+        Test that concurrent threads draw the same numbers as sequential ones.
+        """
+        streams = StreamManager(42)
+
+        def handle(request_id):
+            with streams.stream(request_id):
+                return [streams.numpy.random() for _ in range(1000)]
+
+        sequential = [handle(i) for i in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent = list(executor.map(handle, range(8)))
+
+        self.assertEqual(sequential, concurrent, "Concurrent streams are not reproducible.")
+
+    def test_streams_in_asyncio_tasks(self):
+        """
+        Test that interleaving asyncio tasks draw the same numbers as sequential ones.
+        """
+        streams = StreamManager(42)
+
+        async def handle(request_id):
+            with streams.stream(request_id):
+                draws = []
+                for _ in range(10):
+                    draws.append(streams.random.random())
+                    await asyncio.sleep(0)
+                return draws
+
+        async def run_concurrently():
+            return await asyncio.gather(*(handle(i) for i in range(4)))
+
+        async def run_sequentially():
+            return [await handle(i) for i in range(4)]
+
+        self.assertEqual(asyncio.run(run_concurrently()), asyncio.run(run_sequentially()),
+                         "Interleaving tasks are not reproducible.")
@@ -110,3 +110,31 @@ class TestTensorflow(unittest.TestCase):
         # Check if both results are equal
         self.assertTrue(tf.reduce_all(tf.equal(tensor3, tensor6)),
                         "Results of operations are not equal, seeding failed.")
+
+    def test_deterministic_data_options(self):
+        """
+        Test that a parallel tf.data pipeline with the deterministic options is reproducible.
+        """
+        from saatgut import deterministic_data_options
+        import tensorflow as tf
+
+        def load():
+            dataset = tf.data.Dataset.range(64).map(lambda x: x * 2, num_parallel_calls=tf.data.AUTOTUNE)
+            dataset = dataset.prefetch(tf.data.AUTOTUNE).with_options(deterministic_data_options())
+            return [int(x) for x in dataset]
+
+        self.assertEqual(load(), load(), "Parallel pipeline is not deterministic.")
+
+    def test_find_nondeterministic_ops(self):
+        """
+        Test that nondeterministic ops of a function are reported, and deterministic ones are not.
+        """
+        from saatgut import find_nondeterministic_ops
+        import tensorflow as tf
+
+        def segments(data):
+            return tf.math.unsorted_segment_sum(data, tf.constant([0, 1, 0]), num_segments=2)
+
+        report = find_nondeterministic_ops(segments, tf.ones((3, 4)))
+        self.assertIn("UnsortedSegmentSum", report)
+        self.assertEqual(find_nondeterministic_ops(lambda x: x * 2, tf.ones((3, 4))), {})
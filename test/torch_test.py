@@ -1,3 +1,4 @@
+import os
 import unittest
 
 from saatgut._seed_torch import seed_torch
@@ -108,3 +109,76 @@ class TestTorch(unittest.TestCase):
         self.assertTrue(torch.equal(tensor3, tensor6), "Results of operations are not equal, domestication failed.")
 
 
+def _distributed_rank(rank: int, world_size: int, init_file: str, seeds: list, results):
+    """ One rank of the distributed test: every rank passes a different seed, rank 0's seed has to win. """
+    import torch
+    import torch.distributed as dist
+    from saatgut._seed_torch import distributed_context, seed_torch
+
+    dist.init_process_group("gloo", init_method=f"file://{init_file}", rank=rank, world_size=world_size)
+    try:
+        seed_torch(seeds[rank], distributed=True)
+        results[rank] = (distributed_context(), torch.rand(4).tolist())
+    finally:
+        dist.destroy_process_group()
+
+
+class TestTorchDistributed(unittest.TestCase):
+    def test_distributed_context_environment(self):
+        """
+        Test that the rank and world size are read from the environment variables of torchrun and SLURM.
+        """
+        from unittest import mock
+        from saatgut._seed_torch import distributed_context
+
+        with mock.patch.dict(os.environ, {"RANK": "3", "WORLD_SIZE": "8"}):
+            self.assertEqual(distributed_context(), (3, 8))
+        with mock.patch.dict(os.environ, {"SLURM_PROCID": "1", "SLURM_NTASKS": "2"}, clear=True):
+            self.assertEqual(distributed_context(), (1, 2))
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(distributed_context(), (0, 1))
+
+    def test_distributed_seed(self):
+        """
+        Test that the seed of a rank is derived from the root seed and the rank, independent of the world size.
+        """
+        from unittest import mock
+        from saatgut._seed_sequence import derive_seed
+        from saatgut._seed_torch import distributed_seed
+
+        with mock.patch.dict(os.environ, {"RANK": "1", "WORLD_SIZE": "2"}):
+            seed_of_two = distributed_seed(42)
+        with mock.patch.dict(os.environ, {"RANK": "1", "WORLD_SIZE": "16"}):
+            seed_of_sixteen = distributed_seed(42)
+        self.assertEqual(seed_of_two, derive_seed(42, 1))
+        self.assertEqual(seed_of_two, seed_of_sixteen)
+
+    def test_seed_torch_distributed_gloo(self):
+        """
+        Test distributed seeding with two processes and the gloo backend: the ranks use the seed of rank 0 and draw
+        different, reproducible random numbers.
+        """
+        import tempfile
+        import torch
+        import torch.multiprocessing as mp
+        from saatgut._seed_sequence import derive_seed
+
+        if not torch.distributed.is_available():
+            self.skipTest("torch.distributed is not available")
+
+        with tempfile.TemporaryDirectory() as directory:
+            manager = mp.Manager()
+            results = manager.dict()
+            mp.spawn(_distributed_rank, args=(2, os.path.join(directory, "init"), [42, 7], results), nprocs=2)
+            results = dict(results)
+
+        self.assertEqual(results[0][0], (0, 2))
+        self.assertEqual(results[1][0], (1, 2))
+        self.assertNotEqual(results[0][1], results[1][1])
+        for rank in range(2):
+            torch.manual_seed(derive_seed(42, rank))
+            self.assertEqual(results[rank][1], torch.rand(4).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+from saatgut import find_divergence, trace_torch
+
+
+class TestTorchTrace(unittest.TestCase):
+    def _model(self):
+        import torch
+
+        class Drift(torch.nn.Module):
+            """ Adds the number of calls, which is not reset between runs. """
+            def __init__(self):
+                super().__init__()
+                self.calls = 0
+
+            def forward(self, x):
+                self.calls += 1
+                return x + self.calls
+
+        return torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.ReLU(), Drift(), torch.nn.Linear(4, 1))
+
+    def _train(self, model, steps=3):
+        import torch
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+        for _ in range(steps):
+            loss = model(torch.rand(8, 4)).sum()
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+
+    def test_no_divergence(self):
+        """
+        Test that two runs of a deterministic model match.
+        """
+        import torch
+        model = torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.ReLU(), torch.nn.Linear(4, 1))
+        report = find_divergence(lambda: self._train(model), model)
+        self.assertTrue(report)
+        self.assertIsNone(report.module)
+        self.assertGreater(len(report.traces[0].records), 0)
+
+    def test_first_divergence(self):
+        """
+        Test that the first module whose outputs diverge is reported.
+        """
+        model = self._model()
+        report = find_divergence(lambda: self._train(model), model)
+        self.assertFalse(report)
+        self.assertEqual(report.module, "2")
+        self.assertEqual(report.first_divergence[0].kind, "forward")
+
+    def test_reordered_outputs(self):
+        """
+        Test that outputs with the same elements in a different order are reported, like a nondeterministic scatter.
+        """
+        import torch
+
+        class Reorder(torch.nn.Module):
+            """ Reverses the batch in the second run. """
+            def __init__(self):
+                super().__init__()
+                self.calls = 0
+
+            def forward(self, x):
+                self.calls += 1
+                return x.flip(0) if self.calls > 3 else x
+
+        model = torch.nn.Sequential(torch.nn.Linear(4, 4), Reorder(), torch.nn.Linear(4, 1))
+        report = find_divergence(lambda: self._train(model), model)
+        self.assertFalse(report)
+        self.assertEqual(report.module, "1")
+
+    def test_sampling(self):
+        """
+        Test that only every n-th forward pass is recorded.
+        """
+        model = self._model()
+        with trace_torch(model, sample_every=2, gradients=False) as trace:
+            self._train(model, steps=4)
+        self.assertEqual(sorted({record.step for record in trace.records}), [0, 2])
+
+    def test_nondeterministic_ops(self):
+        """
+        Test that warnings about nondeterministic ops are collected per op and module.
+        """
+        import torch
+
+        class Put(torch.nn.Module):
+            def forward(self, x):
+                torch.zeros(3).put_(torch.tensor([1, 1]), torch.tensor([1.0, 2.0]))
+                return x
+
+        previous = torch.are_deterministic_algorithms_enabled(), torch.is_deterministic_algorithms_warn_only_enabled()
+        torch.use_deterministic_algorithms(True, warn_only=True)
+        try:
+            model = torch.nn.Sequential(torch.nn.Linear(4, 4), Put())
+            with trace_torch(model) as trace:
+                model(torch.rand(2, 4))
+                model(torch.rand(2, 4))
+        finally:
+            torch.use_deterministic_algorithms(previous[0], warn_only=previous[1])
+        self.assertEqual(trace.nondeterministic_ops["put_"]["count"], 2)
+        self.assertEqual(trace.nondeterministic_ops["put_"]["modules"], ["1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
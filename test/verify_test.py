@@ -0,0 +1,45 @@
+import time
+import unittest
+
+from saatgut import verify_deterministic
+from saatgut._fingerprint import leaf_fingerprints
+
+
+class TestVerifyDeterministic(unittest.TestCase):
+    def test_deterministic_function(self):
+        """
+        Test that a function that only uses seeded randomness is verified as deterministic.
+        """
+        import numpy as np
+        import torch
+        model = torch.nn.Linear(4, 2)
+
+        def function():
+            torch.nn.init.normal_(model.weight)
+            return {"model": model, "array": np.random.rand(3), "values": [1, "a"]}
+
+        result = verify_deterministic(function, seed=42, runs=3)
+        self.assertTrue(result)
+        self.assertIsNone(result.first_divergence)
+        self.assertEqual(len(result.fingerprints), 3)
+
+    def test_first_divergence(self):
+        """
+        Test that the first leaf that differs between runs is reported.
+        """
+        import numpy as np
+        result = verify_deterministic(lambda: {"array": np.random.rand(3), "times": [0, time.perf_counter()]})
+        self.assertFalse(result)
+        self.assertEqual(result.first_divergence, (1, "output['times'][1]"))
+
+    def test_leaf_paths(self):
+        """
+        Test that the leaves of state dicts are named by their path.
+        """
+        import torch
+        paths = [path for path, _ in leaf_fingerprints([torch.nn.Linear(2, 2)])]
+        self.assertIn("output[0].state_dict()['bias']", paths)
+
+
+if __name__ == '__main__':
+    unittest.main()
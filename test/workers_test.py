@@ -0,0 +1,86 @@
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from saatgut import derive_seed, spawn_seeds, seeded_task, pool_initializer, worker_init_fn, torch_generator
+
+
+_FIRST_DRAW = None
+
+
+def _remember_first_draw():
+    global _FIRST_DRAW
+    _FIRST_DRAW = random.random()
+
+
+def _first_draw(_):
+    return _FIRST_DRAW
+
+
+def _draw(_):
+    import numpy as np
+    return random.random(), float(np.random.rand())
+
+
+class TestWorkers(unittest.TestCase):
+    def test_derive_seed_matches_numpy(self):
+        """
+        Test that derived seeds are the same as the ones of numpy.random.SeedSequence.
+        """
+        import numpy as np
+        for seed in (0, 42, 2 ** 40):
+            for key in ((0,), (7,), (1, 2)):
+                expected = np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0]
+                self.assertEqual(derive_seed(seed, *key), expected, f"Wrong child seed for {seed}, {key}.")
+
+    def test_spawn_seeds(self):
+        """
+        Test that spawned seeds are distinct and don't depend on the number of children.
+        """
+        seeds = spawn_seeds(42, 8)
+        self.assertEqual(len(set(seeds)), 8)
+        self.assertEqual(spawn_seeds(42, 4), seeds[:4])
+
+    def test_seeded_task_independent_of_worker_count(self):
+        """
+        Test that seeded tasks give the same results for any number of workers.
+        """
+        task = seeded_task(_draw, 42)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results1 = list(executor.map(task, range(6), range(6)))
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            results2 = list(executor.map(task, range(6), range(6)))
+
+        self.assertEqual(results1, results2, "Results depend on the number of workers.")
+        self.assertEqual(len(set(results1)), 6, "Tasks drew the same random numbers.")
+
+    def test_pool_initializer(self):
+        """
+        Test that each worker of a pool gets its own seed.
+        """
+        initializer = pool_initializer(42, initializer=_remember_first_draw)
+        with ProcessPoolExecutor(max_workers=2, **initializer) as executor:
+            results = set(executor.map(_first_draw, range(4)))
+        expected = {random.Random(derive_seed(42, i)).random() for i in range(2)}
+        self.assertTrue(results <= expected, "Workers were not seeded with the derived seeds.")
+
+    def test_dataloader_workers(self):
+        """
+        Test that a DataLoader with seeded workers is reproducible.
+        """
+        import torch
+        from torch.utils.data import DataLoader
+
+        class RandomDataset(torch.utils.data.Dataset):
+            def __len__(self):
+                return 8
+
+            def __getitem__(self, index):
+                return torch.rand(1)
+
+        def load():
+            loader = DataLoader(RandomDataset(), batch_size=2, num_workers=2,
+                                worker_init_fn=worker_init_fn(42), generator=torch_generator(42))
+            return torch.cat(list(loader))
+
+        self.assertTrue(torch.equal(load(), load()), "DataLoader with seeded workers is not reproducible.")